@@ -1,7 +1,13 @@
-import sys
-import math
-import random
-import operator
-from time import time
+"""
+Core of the battleship game: boards, fields, ships, users, timer, engine and scoring, AIs
 
-from PySide import QtGui, QtCore
+Nothing here imports PySide, widgets live in `battleship.ui`. For compatibility
+`battleship.classes.DialogWindow` still works, it loads the UI layer when first used.
+"""
+
+
+def __getattr__(name):
+    if name == "DialogWindow":
+        from battleship.ui.dialog_window import DialogWindow
+        return DialogWindow
+    raise AttributeError("module %r has no attribute %r" % (__name__, name))
@@ -0,0 +1,58 @@
+import threading
+from time import monotonic
+
+
+class AiCancelled(Exception):
+    """Raised inside AI computation when its task was cancelled"""
+    pass
+
+
+class AiTask:
+    """
+    Handle of one AI computation running in a worker thread
+
+    The computation calls `check` from time to time (it raises `AiCancelled` once the task was
+    cancelled) and may use `time_left` to finish with the best answer found so far.
+    """
+
+    def __init__(self, budget=None):
+        """
+        :param budget: seconds the computation may take, None for no limit
+        """
+        self.deadline = None if budget is None else monotonic() + budget
+        self.cancelled = threading.Event()
+        self.stopped = threading.Event()
+
+    def cancel(self):
+        """Asks the computation to stop, its result will be ignored"""
+        self.cancelled.set()
+
+    def stop(self):
+        """Called by the worker thread once the computation returned or raised"""
+        self.stopped.set()
+
+    def wait_stopped(self, timeout=None):
+        """
+        Waits until the computation stops running
+
+        :param timeout: seconds to wait at most, None for no limit
+        :return: True if the computation stopped, False if it still runs
+        """
+        return self.stopped.wait(timeout)
+
+    def is_cancelled(self):
+        """Tells whether the task was cancelled"""
+        return self.cancelled.is_set()
+
+    def time_left(self):
+        """Returns seconds left until the deadline (None if there is no deadline)"""
+        return None if self.deadline is None else self.deadline - monotonic()
+
+    def is_expired(self):
+        """Tells whether the deadline has passed"""
+        return self.deadline is not None and monotonic() >= self.deadline
+
+    def check(self):
+        """Raises `AiCancelled` if the task was cancelled"""
+        if self.cancelled.is_set():
+            raise AiCancelled()
@@ -0,0 +1,116 @@
+from array import array
+
+
+def analyse(games, aggregators):
+    """
+    Feeds every game to every aggregator in a single pass
+
+    :param games: iterable of `ArchivedGame` (e.g. `ReplayArchive`)
+    :param aggregators: list of aggregators (objects with method add(game))
+    :return: the aggregators
+    """
+    for game in games:
+        for aggregator in aggregators:
+            aggregator.add(game)
+    return aggregators
+
+
+class ShotHeatmap:
+    """
+    Counts shots at every field, separately for every AI level
+    """
+
+    def __init__(self, width, length):
+        self.width = width
+        self.length = length
+        self.counts = {}
+
+    def add(self, game):
+        """Adds shots of both players of given game"""
+        levels = game.get_levels()
+        counts = [self._counts(levels[0]), self._counts(levels[1])]
+        for code in game.get_moves():
+            counts[code & 1][code >> 1] += 1
+
+    def _counts(self, level):
+        if level not in self.counts:
+            self.counts[level] = array('Q', [0]) * (self.width * self.length)
+        return self.counts[level]
+
+    def get_levels(self):
+        """Returns levels present in analysed games"""
+        return sorted(self.counts)
+
+    def get_heatmap(self, level):
+        """
+        Returns amount of shots of given level at every field
+
+        :param level: difficulty level
+        :return: list of rows (heatmap[y][x])
+        """
+        counts = self._counts(level)
+        return [list(counts[y * self.width:(y + 1) * self.width]) for y in range(self.length)]
+
+
+class PlacementHeatmap(ShotHeatmap):
+    """
+    Counts how often every field is covered by a ship placed by player of given AI level
+    """
+
+    def add(self, game):
+        """Adds ships placed by both players of given game"""
+        levels = game.get_levels()
+        for player in (1, 2):
+            counts = self._counts(levels[player - 1])
+            for (length, x, y, orientation) in game.get_placements(player):
+                for i in range(length):
+                    if orientation == "vertical":
+                        counts[(y - i) * self.width + x] += 1
+                    else:
+                        counts[y * self.width + x + i] += 1
+
+
+class HitRatioDistribution:
+    """
+    Histogram of hit ratio (ship fields hit / shots, the accuracy term of the scores) for every AI level
+    """
+
+    def __init__(self, bins=20):
+        self.bins = bins
+        self.histograms = {}
+
+    def add(self, game):
+        """Adds hit ratios of both players of given game"""
+        levels = game.get_levels()
+        ships = [set(), set()]
+        for player in (1, 2):
+            for (length, x, y, orientation) in game.get_placements(player):
+                for i in range(length):
+                    ships[player - 1].add((x, y - i) if orientation == "vertical" else (x + i, y))
+        width = game.archive.width
+        shots = [0, 0]
+        hits = [0, 0]
+        for code in game.get_moves():
+            shooter = code & 1
+            cell = code >> 1
+            shots[shooter] += 1
+            if (cell % width, cell // width) in ships[1 - shooter]:
+                hits[shooter] += 1
+        for i in (0, 1):
+            if shots[i] > 0:
+                histogram = self.histograms.setdefault(levels[i], [0] * self.bins)
+                histogram[min(self.bins - 1, hits[i] * self.bins // shots[i])] += 1
+
+    def get_levels(self):
+        """Returns levels present in analysed games"""
+        return sorted(self.histograms)
+
+    def get_histogram(self, level):
+        """
+        Returns histogram of hit ratios of given level
+
+        :param level: difficulty level
+        :return: list of (lower bound of bin, amount of players)
+        """
+        histogram = self.histograms.get(level, [0] * self.bins)
+        return [(i / self.bins, amount) for (i, amount) in enumerate(histogram)]
@@ -3,17 +3,24 @@ class BattleShip:
     Class describing Battleship
     """
 
+    __slots__ = ("id", "length", "fields_destroyed", "belongs_to_user", "fields")
+
     def __init__(self, length, user):
+        self.id = None
         self.length = length
         self.fields_destroyed = 0
         self.belongs_to_user = user
+        self.fields = []
 
-    def was_hit(self):
+    def was_hit(self, times=1):
         """
         Tells that battleship was hit (and is on fire :))
+
+        :param times: amount of its fields hit at once (by a salvo)
         """
-        self.fields_destroyed += 1
-        if self.fields_destroyed == self.length:
+        before = self.fields_destroyed
+        self.fields_destroyed += times
+        if before < self.length <= self.fields_destroyed:
             self.ship_was_destroyed()
 
     def ship_was_destroyed(self):
@@ -22,10 +29,30 @@ class BattleShip:
         """
         self.belongs_to_user.remove_ship(self)
 
+    def get_id(self):
+        """Returns id given to this ship by registry of its user"""
+        return self.id
+
+    def set_id(self, ship_id):
+        """Sets id of this ship"""
+        self.id = ship_id
+
     def get_length(self):
         """Returns the length of this ship"""
         return self.length
 
+    def get_fields(self):
+        """Returns coordinates of fields occupied by this ship"""
+        return self.fields
+
+    def set_fields(self, fields):
+        """Sets coordinates of fields occupied by this ship"""
+        self.fields = fields
+
+    def is_destroyed(self):
+        """Tells whether every field of this ship was hit"""
+        return self.fields_destroyed >= self.length
+
     def __str__(self):
         return "%s - %d" % (self.belongs_to_user.get_type(), self.length)
 
@@ -1,11 +1,21 @@
+from battleship.classes.cell_pool import CellPool
 from battleship.classes.field import Field
+from battleship.classes.placement_map import PlacementMap
+from battleship.classes.target_frontier import TargetFrontier
+from battleship.classes.zobrist import MISS, HIT, SUNK, SHIP, zobrist_keys
 
 
 class Board:
     """
     Describes (one half of the) board
+
+    Zobrist hash of what the opponent sees (shots, their results and sunk ships) and of the layout
+    of ships are updated with every shot and placed ship, see `battleship.classes.zobrist`.
     """
 
+    __slots__ = ("user", "length", "width", "board", "hit_ship_field", "hit_ship_fields", "total_hit",
+                 "sunk_ships", "frontier", "untried", "ship_fields_left", "placement_map", "hash", "layout_hash")
+
     def __init__(self, user, length, width):
         self.user = user
         self.length = length
@@ -15,11 +25,51 @@ class Board:
         self.hit_ship_field = 0
         self.hit_ship_fields = []
         self.total_hit = 0
+        self.sunk_ships = []
+        self.frontier = TargetFrontier(width, length)
+        self.untried = CellPool(width, length, full=True)
+        self.ship_fields_left = CellPool(width, length)
+        self.placement_map = None
+        self.hash = 0
+        self.layout_hash = 0
 
     def get_hit_ship_fields(self):
         """Returns exact coordinates of fields that was hit and contained battleship"""
         return self.hit_ship_fields
 
+    def get_sunk_ships(self):
+        """Returns ships on this board that were destroyed, in order of sinking"""
+        return self.sunk_ships
+
+    def get_frontier(self):
+        """Returns queue of fields worth firing at next to ships that were hit"""
+        return self.frontier
+
+    def random_untried_field(self, rng):
+        """
+        Returns random field that was not fired at yet
+
+        :param rng: `random.Random` instance
+        :return: (x, y) or None if every field was fired at
+        """
+        return self.untried.choice(rng)
+
+    def get_ship_field_left(self):
+        """
+        Returns field containing ship that was not hit yet
+
+        :return: (x, y) or None if every ship field was hit
+        """
+        return self.ship_fields_left.peek()
+
+    def get_hash(self):
+        """Returns Zobrist hash of shots, their results and sunk ships"""
+        return self.hash
+
+    def get_layout_hash(self):
+        """Returns Zobrist hash of fields occupied by ships"""
+        return self.layout_hash
+
     def get_total_hit(self):
         """Returns total amount of shots on this board"""
         return self.total_hit
@@ -49,9 +99,55 @@ class Board:
         """
         if self.can_fire(x, y):
             self.total_hit += 1
-            if self.board[x][self.get_length() - y - 1].field_hit():
+            self.untried.remove(x, y)
+            field = self.board[x][self.get_length() - y - 1]
+            hit = field.field_hit()
+            self.shot_hashed(x, y, hit)
+            if hit:
                 self.hit_ship_field += 1
                 self.hit_ship_fields.append((x, y))
+                self.ship_hit(x, y, field.get_battleship())
+
+    def shot_hashed(self, x, y, hit):
+        """
+        Updates Zobrist hash after shot at given field
+
+        :param x: x coordinate
+        :param y: y coordinate
+        :param hit: True if the field contained a ship
+        """
+        self.hash ^= zobrist_keys(self.width, self.length)[HIT if hit else MISS][y * self.width + x]
+
+    def ship_hit(self, x, y, ship):
+        """
+        Bookkeeping after field containing ship was hit
+
+        :param x: x coordinate
+        :param y: y coordinate
+        :param ship: ship that was hit
+        """
+        self.ship_fields_left.remove(x, y)
+        if ship.is_destroyed():
+            self.ship_sunk(x, y, ship)
+        else:
+            self.frontier.hit(x, y)
+
+    def ship_sunk(self, x, y, ship):
+        """
+        Bookkeeping after ship was sunk by the shot at given field
+
+        :param x: x coordinate
+        :param y: y coordinate
+        :param ship: ship that sank
+        """
+        self.sunk_ships.append(ship)
+        keys = zobrist_keys(self.width, self.length)
+        for (fx, fy) in ship.get_fields():
+            cell = fy * self.width + fx
+            self.hash ^= keys[HIT][cell] ^ keys[SUNK][cell]
+        self.frontier.hit(x, y, ship.get_fields())
+        # listeners (e.g. end of the game) see the sinking recorded by this board
+        self.user.get_registry().announce_sunk(ship)
 
     def set_user(self, user):
         """Sets that this board belongs to given user"""
@@ -72,6 +168,10 @@ class Board:
         """
         return self.board[x][self.get_length() - y - 1].has_battleship()
 
+    def has_ship_fields_left(self):
+        """Tells whether any field containing ship has not been hit yet"""
+        return len(self.ship_fields_left) > 0
+
     def get_length(self):
         """Returns board's length"""
         return self.length
@@ -109,7 +209,7 @@ class Board:
         """
         length = ship if type(1) == type(ship) else ship.get_length()
         if orientation == "horizontal":
-            if x + length - 1 >= self.get_length():
+            if x + length - 1 >= self.get_width():
                 return False
             for i in range(length):
                 if self.board[x + i][self.get_length() - y - 1].has_battleship():
@@ -139,11 +239,38 @@ class Board:
         if orientation == "horizontal":
             for i in range(ship.get_length()):
                 self.board[x + i][self.get_length() - y - 1].set_battleship(ship)
+            ship.set_fields([(x + i, y) for i in range(ship.get_length())])
         elif orientation == "vertical":
             for i in range(ship.get_length()):
                 self.board[x][self.get_length() - y + i - 1].set_battleship(ship)
+            ship.set_fields([(x, y - i) for i in range(ship.get_length())])
         else:
             raise Exception("unknown orientation type")
+        self.ship_placed(ship)
+
+    def ship_placed(self, ship):
+        """
+        Bookkeeping after ship was placed on this board
+
+        :param ship: placed ship
+        """
+        ship_keys = zobrist_keys(self.width, self.length)[SHIP]
+        for (x, y) in ship.get_fields():
+            self.ship_fields_left.add(x, y)
+            self.layout_hash ^= ship_keys[y * self.width + x]
+        if self.placement_map is not None:
+            self.placement_map.ship_placed(ship.get_fields())
+
+    def get_placement_map(self, length):
+        """
+        Returns map of fields where ship of given length can be placed
+
+        :param length: length of the ship
+        :return: `PlacementMap`
+        """
+        if self.placement_map is None or self.placement_map.get_length() != length:
+            self.placement_map = PlacementMap(self, length)
+        return self.placement_map
 
     def set_battleship(self, x, y, ship, orientation):
         """
@@ -0,0 +1,265 @@
+from battleship.classes.bit_board import BitBoard
+from battleship.classes.zobrist import MISS, HIT, SUNK, zobrist_keys, zobrist_hash, sink_ship
+
+
+class BoardSnapshot:
+    """
+    Immutable state of a board for lookahead search and what-if analysis
+
+    A shot does not change the snapshot, it returns a new one (a fork) pointing to its parent, so
+    `undo` is just going back to the parent. State is kept in integer bitmasks (field (x, y) is bit
+    number y * width + x) and tuples shared by all forks, so a fork costs one small object.
+    Zobrist hash of the observable state (`get_hash`) is updated with every shot, equal states
+    reached in different order have equal hashes.
+
+    Layout of ships is either known (`from_board`, shots are resolved by the snapshot itself) or
+    hidden (`observed`, results of shots are given to `record`, as seen by the shooting player).
+    """
+
+    __slots__ = ("width", "length", "ships", "afloat", "shot_mask", "hit_mask", "sunk_mask", "parent", "move",
+                 "depth", "hash")
+
+    def __init__(self, width, length, ships=None, afloat=(), shot_mask=0, hit_mask=0, sunk_mask=0, parent=None,
+                 move=None, hash_value=None):
+        """
+        :param width: board width
+        :param length: board length
+        :param ships: tuple of bitmasks of ships or None if the layout is hidden
+        :param afloat: tuple of lengths of ships still afloat, longest first
+        :param shot_mask: bitmask of fields fired at
+        :param hit_mask: bitmask of fields fired at that contained a ship
+        :param sunk_mask: bitmask of fields of sunk ships
+        :param parent: snapshot this one was forked from
+        :param move: (x, y, result) of the shot made from the parent, result is MISS, HIT or SUNK
+        :param hash_value: Zobrist hash of the state, computed if not given
+        """
+        self.width = width
+        self.length = length
+        self.ships = ships
+        self.afloat = afloat
+        self.shot_mask = shot_mask
+        self.hit_mask = hit_mask
+        self.sunk_mask = sunk_mask
+        self.parent = parent
+        self.move = move
+        self.depth = 0 if parent is None else parent.depth + 1
+        if hash_value is None:
+            hash_value = zobrist_hash(width, length, shot_mask, hit_mask, sunk_mask)
+        self.hash = hash_value
+
+    @classmethod
+    def from_board(cls, board):
+        """
+        Takes snapshot of board together with its ships
+
+        :param board: `Board` (or subclass)
+        :return: `BoardSnapshot` with known layout
+        """
+        width = board.get_width()
+        ships = list(board.get_user().get_registry().get_ships()) + list(board.get_sunk_ships())
+        masks = tuple(_fields_mask(width, ship.get_fields()) for ship in ships)
+        afloat = tuple(sorted((ship.get_length() for ship in ships if not ship.is_destroyed()), reverse=True))
+        sunk_mask = 0
+        for ship in board.get_sunk_ships():
+            sunk_mask |= _fields_mask(width, ship.get_fields())
+        (shot_mask, hit_mask) = _shots(board)
+        # the board keeps the same hash of the same state, it does not have to be computed again
+        return cls(width, board.get_length(), masks, afloat, shot_mask, hit_mask, sunk_mask,
+                   hash_value=board.get_hash())
+
+    @classmethod
+    def observed(cls, board, list_of_ships):
+        """
+        Takes snapshot of what the opponent knows about board: shots, their results and sunk ships
+
+        :param board: `Board` (or subclass, e.g. `RemoteBoard`)
+        :param list_of_ships: fleet of the game, list of (ship length, amount)
+        :return: `BoardSnapshot` with hidden layout
+        """
+        width = board.get_width()
+        afloat = sorted([length for length, amount in list_of_ships for _ in range(amount)], reverse=True)
+        sunk_mask = 0
+        for ship in board.get_sunk_ships():
+            sunk_mask |= _fields_mask(width, ship.get_fields())
+            if ship.get_length() in afloat:
+                afloat.remove(ship.get_length())
+        (shot_mask, hit_mask) = _shots(board)
+        return cls(width, board.get_length(), None, tuple(afloat), shot_mask, hit_mask, sunk_mask,
+                   hash_value=board.get_hash())
+
+    def fire(self, x, y):
+        """
+        Fires at given field of the known layout
+
+        :param x: x coordinate
+        :param y: y coordinate
+        :return: new `BoardSnapshot`, or this one if the field cannot be fired at
+        """
+        if self.ships is None:
+            raise Exception("layout of the snapshot is hidden, use record")
+        if not self.can_fire(x, y):
+            return self
+        field = 1 << (y * self.width + x)
+        for ship in self.ships:
+            if ship & field:
+                hit_mask = self.hit_mask | field
+                if ship & ~hit_mask:
+                    return self._fork(x, y, HIT, field, hit_mask, self.sunk_mask, self.afloat)
+                return self._fork(x, y, SUNK, field, hit_mask, self.sunk_mask | ship,
+                                  _without(self.afloat, bin(ship).count("1")), ship)
+        return self._fork(x, y, MISS, field, self.hit_mask, self.sunk_mask, self.afloat)
+
+    def record(self, x, y, hit, sunk_fields=None):
+        """
+        Records result of a shot, for snapshots with hidden layout
+
+        :param x: x coordinate
+        :param y: y coordinate
+        :param hit: True if a ship was hit
+        :param sunk_fields: fields of the ship sunk by this shot (list of (x, y)), if any
+        :return: new `BoardSnapshot`, or this one if the field cannot be fired at
+        """
+        if not self.can_fire(x, y):
+            return self
+        field = 1 << (y * self.width + x)
+        if not hit:
+            return self._fork(x, y, MISS, field, self.hit_mask, self.sunk_mask, self.afloat)
+        if not sunk_fields:
+            return self._fork(x, y, HIT, field, self.hit_mask | field, self.sunk_mask, self.afloat)
+        ship = _fields_mask(self.width, sunk_fields)
+        return self._fork(x, y, SUNK, field, self.hit_mask | field, self.sunk_mask | ship,
+                          _without(self.afloat, len(sunk_fields)), ship)
+
+    def _fork(self, x, y, result, field, hit_mask, sunk_mask, afloat, ship=0):
+        """Returns child snapshot after shot at field with given result (ship is bitmask of sunk ship)"""
+        keys = zobrist_keys(self.width, self.length)
+        cell = y * self.width + x
+        if result == MISS:
+            hash_value = self.hash ^ keys[MISS][cell]
+        else:
+            hash_value = self.hash ^ keys[HIT][cell]
+            if result == SUNK:
+                hash_value = sink_ship(hash_value, keys, ship)
+        return BoardSnapshot(self.width, self.length, self.ships, afloat, self.shot_mask | field, hit_mask,
+                             sunk_mask, self, (x, y, result), hash_value)
+
+    def undo(self):
+        """Returns snapshot before the last shot"""
+        if self.parent is None:
+            raise Exception("nothing to undo")
+        return self.parent
+
+    def get_parent(self):
+        """Returns snapshot this one was forked from or None"""
+        return self.parent
+
+    def get_move(self):
+        """Returns (x, y, result) of the shot made from the parent or None"""
+        return self.move
+
+    def get_moves(self):
+        """Returns shots made since the first snapshot of the chain, oldest first"""
+        moves = []
+        snapshot = self
+        while snapshot.parent is not None:
+            moves.append(snapshot.move)
+            snapshot = snapshot.parent
+        moves.reverse()
+        return moves
+
+    def get_depth(self):
+        """Returns amount of shots made since the first snapshot of the chain"""
+        return self.depth
+
+    def get_hash(self):
+        """Returns Zobrist hash of shots, their results and sunk ships"""
+        return self.hash
+
+    def get_width(self):
+        """Returns board's width"""
+        return self.width
+
+    def get_length(self):
+        """Returns board's length"""
+        return self.length
+
+    def get_shot_mask(self):
+        """Returns bitmask of fields fired at"""
+        return self.shot_mask
+
+    def get_hit_mask(self):
+        """Returns bitmask of fields fired at that contained a ship"""
+        return self.hit_mask
+
+    def get_sunk_mask(self):
+        """Returns bitmask of fields of sunk ships"""
+        return self.sunk_mask
+
+    def get_open_hits(self):
+        """Returns bitmask of hits of ships still afloat"""
+        return self.hit_mask & ~self.sunk_mask
+
+    def get_afloat(self):
+        """Returns lengths of ships still afloat, longest first"""
+        return self.afloat
+
+    def is_hidden(self):
+        """Tells whether layout of ships is unknown"""
+        return self.ships is None
+
+    def is_fleet_destroyed(self):
+        """Tells whether every ship was sunk"""
+        return not self.afloat
+
+    def can_fire(self, x, y):
+        """
+        Tests if field is on the board and was not fired at yet
+
+        :param x: x coordinate
+        :param y: y coordinate
+        """
+        return 0 <= x < self.width and 0 <= y < self.length and not (self.shot_mask >> (y * self.width + x)) & 1
+
+    def has_ship_on(self, x, y):
+        """
+        Checks if on given field is a ship, the layout has to be known
+
+        :param x: x coordinate
+        :param y: y coordinate
+        """
+        if self.ships is None:
+            raise Exception("layout of the snapshot is hidden")
+        field = 1 << (y * self.width + x)
+        return any(ship & field for ship in self.ships)
+
+
+def _fields_mask(width, fields):
+    """Returns bitmask of given list of (x, y)"""
+    mask = 0
+    for (x, y) in fields:
+        mask |= 1 << (y * width + x)
+    return mask
+
+
+def _without(afloat, length):
+    """Returns tuple of lengths without one ship of given length"""
+    if length not in afloat:
+        return afloat
+    i = afloat.index(length)
+    return afloat[:i] + afloat[i + 1:]
+
+
+def _shots(board):
+    """Returns (bitmask of shots, bitmask of hits) of board"""
+    if isinstance(board, BitBoard):
+        return board.get_shot_mask(), board.get_hit_mask()
+    width = board.get_width()
+    shot_mask = 0
+    hit_mask = 0
+    for y in range(board.get_length()):
+        for x in range(width):
+            if not board.can_fire(x, y):
+                shot_mask |= 1 << (y * width + x)
+                if board.has_ship_on(x, y):
+                    hit_mask |= 1 << (y * width + x)
+    return shot_mask, hit_mask
@@ -0,0 +1,74 @@
+from array import array
+
+# array of every field index for recently used board sizes, copying it is much faster than building it
+_full = {}
+
+
+class CellPool:
+    """
+    Set of fields of a board with constant time insertion, removal and random choice
+
+    Fields are kept in a flat array (removal swaps the last field into the freed slot),
+    together with the position of every field in that array (-1 if absent).
+    """
+
+    __slots__ = ("width", "fields", "positions")
+
+    def __init__(self, width, length, full=False):
+        self.width = width
+        size = width * length
+        if full:
+            if size not in _full:
+                if len(_full) >= 8:
+                    _full.clear()
+                _full[size] = array('i', range(size))
+            self.fields = _full[size][:]
+            self.positions = _full[size][:]
+        else:
+            self.fields = array('i')
+            self.positions = array('i', [-1]) * size
+
+    def __len__(self):
+        return len(self.fields)
+
+    def __contains__(self, field):
+        (x, y) = field
+        return self.positions[y * self.width + x] != -1
+
+    def add(self, x, y):
+        """Adds field to the pool"""
+        cell = y * self.width + x
+        if self.positions[cell] == -1:
+            self.positions[cell] = len(self.fields)
+            self.fields.append(cell)
+
+    def remove(self, x, y):
+        """Removes field from the pool, if it is there"""
+        cell = y * self.width + x
+        position = self.positions[cell]
+        if position == -1:
+            return
+        last = self.fields.pop()
+        if last != cell:
+            self.fields[position] = last
+            self.positions[last] = position
+        self.positions[cell] = -1
+
+    def choice(self, rng):
+        """
+        Returns random field from the pool
+
+        :param rng: `random.Random` instance
+        :return: (x, y) or None if the pool is empty
+        """
+        if not self.fields:
+            return None
+        cell = self.fields[rng.randrange(len(self.fields))]
+        return cell % self.width, cell // self.width
+
+    def peek(self):
+        """Returns any field from the pool (the most recently added one) or None if it is empty"""
+        if not self.fields:
+            return None
+        cell = self.fields[-1]
+        return cell % self.width, cell // self.width
@@ -0,0 +1,267 @@
+import random
+from collections import Counter
+from itertools import chain
+from time import monotonic
+
+from battleship.classes.board_snapshot import BoardSnapshot
+from battleship.classes.monte_carlo_ai import sample_layout, placement_mask
+
+
+class _BudgetSpent(Exception):
+    """Raised inside the search when its node or time budget is used up"""
+
+
+class ExpectimaxAI:
+    """
+    Lookahead AI: expectimax over its next shots and their results (miss, hit, sunk ship)
+
+    Posterior over layouts of the remaining fleet is approximated by layouts sampled consistently
+    with the shots, result of a shot is weighted by the share of layouts giving it. Value of a state
+    is the expected amount of hits within the remaining depth. Search deepens one shot at a time
+    until the node or time budget is spent; states reached by different orders of shots are
+    evaluated once, thanks to a transposition table keyed by Zobrist hash of `BoardSnapshot`.
+    Without time budget only the node budget and the amount of samples limit a move, so the moves
+    depend on the seed of the random generator only, not on speed of the machine. The time budget
+    covers the whole move (observing the board, sampling and the search): the clock is read at
+    every sampling attempt and every evaluated shot, so a move overruns it by one shot at most.
+
+    Only shots and their results are used, ships on the board are never looked at.
+    """
+
+    def __init__(self, board, list_of_ships, rng=None, time_budget=1.0, max_nodes=20000, max_depth=4, samples=300,
+                 beam=6):
+        """
+        :param board: board to fire at
+        :param list_of_ships: fleet of the game, list of (ship length, amount)
+        :param rng: `random.Random` instance
+        :param time_budget: seconds for one move, None for no limit
+        :param max_nodes: states evaluated for one move
+        :param max_depth: shots looked ahead at most
+        :param samples: layouts sampled for one move
+        :param beam: most probable fields tried in every state
+        """
+        self.board = board
+        self.list_of_ships = list(list_of_ships)
+        self.random = rng if rng is not None else random.Random()
+        self.time_budget = time_budget
+        self.max_nodes = max_nodes
+        self.max_depth = max_depth
+        self.samples = samples
+        self.beam = beam
+        self.table = {}
+        self.nodes = 0
+        self.depth = 0
+        self.layouts = 0
+        self.deadline = None
+        self.task = None
+
+    def observe(self, x, y):
+        """Nothing to update, shots at the board are read at every move"""
+        pass
+
+    def get_nodes(self):
+        """Returns amount of states evaluated for the last move"""
+        return self.nodes
+
+    def get_depth(self):
+        """Returns depth of the last completed search"""
+        return self.depth
+
+    def get_layouts(self):
+        """Returns amount of layouts sampled for the last move"""
+        return self.layouts
+
+    def select_field(self, task=None):
+        """
+        Selects the field with the best expected amount of hits within the budget
+
+        :param task: `AiTask` of the computation; its deadline shortens the time budget
+        :return: (x, y) of selected field or None if every field was fired at
+        """
+        fields = self.best_fields(task)
+        if not fields:
+            # no consistent layout was found in time, any field not fired at yet
+            return self.board.random_untried_field(self.random)
+        return fields[0]
+
+    def best_fields(self, task=None):
+        """
+        Returns the field with the best expected amount of hits within the budget
+
+        :param task: `AiTask` of the computation; its deadline shortens the time budget
+        :return: list with (x, y) of the field, empty if no consistent layout was found in time or
+                 the fleet is destroyed
+        """
+        start = monotonic()
+        seconds = self.time_budget
+        if task is not None and task.time_left() is not None:
+            # leave some time for posting the result back
+            seconds = task.time_left() * 0.8 if seconds is None else min(seconds, task.time_left() * 0.8)
+        self.deadline = None if seconds is None else start + max(0.0, seconds)
+        self.task = task
+        root = BoardSnapshot.observed(self.board, self.list_of_ships)
+        layouts = self._sample(root, None if seconds is None else start + max(0.0, seconds) * 0.3)
+        self.layouts = len(layouts)
+        self.table = {}
+        self.nodes = 0
+        self.depth = 0
+        candidates = self._candidates(root, layouts) if layouts else []
+        if not candidates:
+            return []
+
+        best = None
+        for depth in range(1, self.max_depth + 1):
+            try:
+                best = self._best_shot(root, layouts, candidates, depth)
+            except _BudgetSpent:
+                break
+            self.depth = depth
+        if best is None:
+            # even one shot ahead did not fit into the budget, the most probable field is taken
+            best = candidates[0]
+        return [(best % root.get_width(), best // root.get_width())]
+
+    def _sample(self, root, deadline):
+        """
+        Samples layouts consistent with the state until enough of them are found, time is up (deadline
+        None for no limit) or 64 times more attempts than samples were made
+
+        :return: list of (bitmask of all ship fields, tuple of bitmasks of ships, tuple of ship fields)
+        """
+        width = root.get_width()
+        length = root.get_length()
+        blocked = root.get_shot_mask() & ~root.get_hit_mask() | root.get_sunk_mask()
+        hits = root.get_open_hits()
+        ships = list(root.get_afloat())
+        layouts = []
+        attempts = 0
+        while len(layouts) < self.samples and attempts < 64 * self.samples:
+            attempts += 1
+            if deadline is not None and monotonic() >= deadline:
+                break
+            if self.task is not None and attempts & 15 == 0:
+                self.task.check()
+            layout = sample_layout(width, length, blocked, hits, ships, self.random, 32)
+            if layout is None:
+                continue
+            masks = tuple(placement_mask(first, step, ship_length) for (first, step, ship_length) in layout)
+            cover = 0
+            for mask in masks:
+                cover |= mask
+            layouts.append((cover, masks, _cells(cover)))
+        return layouts
+
+    def _check_time(self):
+        """Raises `_BudgetSpent` when the time is up"""
+        if self.deadline is not None and monotonic() >= self.deadline:
+            raise _BudgetSpent()
+
+    def _spend(self):
+        """Counts evaluated state, raises `_BudgetSpent` when the budget is used up"""
+        self.nodes += 1
+        if self.nodes >= self.max_nodes:
+            raise _BudgetSpent()
+        self._check_time()
+        if self.task is not None and self.nodes & 63 == 0:
+            self.task.check()
+
+    def _candidates(self, node, layouts):
+        """Returns fields not fired at yet covered by the most layouts (at most `beam` of them), best first"""
+        counts = Counter(chain.from_iterable(layout[2] for layout in layouts))
+        shots = node.get_shot_mask()
+        # fields grouped by count, best first; a layout covers only hits among the fields fired at
+        groups = []
+        taken = 0
+        level = None
+        for (cell, count) in counts.most_common():
+            if shots >> cell & 1:
+                continue
+            if count != level:
+                if taken >= self.beam:
+                    break
+                groups.append([])
+                level = count
+            groups[-1].append(cell)
+            taken += 1
+        # ties are broken randomly
+        order = []
+        for group in groups:
+            order.extend(self.random.sample(group, min(len(group), self.beam - len(order))))
+        return order
+
+    def _best_shot(self, root, layouts, candidates, depth):
+        """Returns field with the best value looking given amount of shots ahead"""
+        self._spend()
+        best = None
+        best_value = -1.0
+        for cell in candidates:
+            value = self._expected(root, layouts, cell, depth)
+            if value > best_value:
+                best = cell
+                best_value = value
+        return best
+
+    def _value(self, node, layouts, depth):
+        """Returns expected amount of hits of the best next shots from given state"""
+        if depth == 0 or node.is_fleet_destroyed() or not layouts:
+            return 0.0
+        # the hash does not tell which ships sank when sunk ships touch, so ships afloat are a part of the key
+        key = (node.get_hash(), node.get_afloat(), depth)
+        if key in self.table:
+            return self.table[key]
+        self._spend()
+        value = max(self._expected(node, layouts, cell, depth) for cell in self._candidates(node, layouts))
+        self.table[key] = value
+        return value
+
+    def _expected(self, node, layouts, cell, depth):
+        """Returns expected amount of hits after firing at given field, averaged over its results"""
+        self._check_time()
+        field = 1 << cell
+        hits = node.get_hit_mask() | field
+        # layouts grouped by result: None - miss, 0 - hit, bitmask of a ship - the ship sinks
+        results = {}
+        for layout in layouts:
+            if not layout[0] & field:
+                result = None
+            else:
+                ship = next(mask for mask in layout[1] if mask & field)
+                result = 0 if ship & ~hits else ship
+            results.setdefault(result, []).append(layout)
+
+        width = node.get_width()
+        (x, y) = (cell % width, cell // width)
+        value = 0.0
+        for (result, group) in results.items():
+            if result is None:
+                child = node.record(x, y, False)
+                gain = 0.0
+            elif result == 0:
+                child = node.record(x, y, True)
+                gain = 1.0
+            else:
+                child = node.record(x, y, True, _fields(width, result))
+                gain = 1.0
+            value += len(group) * (gain + self._value(child, group, depth - 1))
+        return value / len(layouts)
+
+
+def _cells(mask):
+    """Returns tuple of indices of fields in bitmask"""
+    cells = []
+    while mask:
+        low = mask & -mask
+        cells.append(low.bit_length() - 1)
+        mask ^= low
+    return tuple(cells)
+
+
+def _fields(width, mask):
+    """Returns list of (x, y) of fields in bitmask"""
+    fields = []
+    while mask:
+        low = mask & -mask
+        cell = low.bit_length() - 1
+        fields.append((cell % width, cell // width))
+        mask ^= low
+    return fields
@@ -3,6 +3,8 @@ class Field:
     Single field on board
     """
 
+    __slots__ = ("x", "y", "battleship", "was_hit")
+
     def __init__(self, x, y):
         self.x = x
         self.y = y
@@ -0,0 +1,450 @@
+import random
+from time import monotonic
+
+# (board width, board length, ship length) -> list of placements, shared by all placers;
+# only a few boards are kept, lists of big boards take tens of megabytes
+_PLACEMENT_INDEX = {}
+_MAX_INDEXED = 16
+
+
+def get_placements(width, length, ship_length):
+    """
+    Returns every placement of a ship of given length on empty board
+
+    Field (x, y) is described by bit number y * width + x (the same as in `BitBoard`).
+    Only the shift of the ship's pattern is stored, bitmasks of big boards would take
+    hundreds of megabytes; see `FleetPlacer.mask`.
+
+    :param width: board width
+    :param length: board length
+    :param ship_length: length of the ship
+    :return: list of (shift, x, y, orientation)
+    """
+    key = (width, length, ship_length)
+    if key not in _PLACEMENT_INDEX:
+        if len(_PLACEMENT_INDEX) >= _MAX_INDEXED:
+            _PLACEMENT_INDEX.clear()
+        placements = []
+        for y in range(length):
+            for x in range(width - ship_length + 1):
+                placements.append((y * width + x, x, y, "horizontal"))
+        for y in range(ship_length - 1, length):
+            for x in range(width):
+                placements.append(((y - ship_length + 1) * width + x, x, y, "vertical"))
+        _PLACEMENT_INDEX[key] = placements
+    return _PLACEMENT_INDEX[key]
+
+
+def count_placements(width, length, ship_length):
+    """Returns amount of placements of a ship of given length on empty board"""
+    return max(0, width - ship_length + 1) * length + width * max(0, length - ship_length + 1)
+
+
+def placement_at(width, length, ship_length, i):
+    """
+    Returns placement number i in order of `get_placements`, without building the list
+
+    :return: (shift, x, y, orientation)
+    """
+    row = width - ship_length + 1
+    if row > 0 and i < row * length:
+        (y, x) = divmod(i, row)
+        return y * width + x, x, y, "horizontal"
+    i -= max(0, row) * length
+    (top, x) = divmod(i, width)
+    return top * width + x, x, top + ship_length - 1, "vertical"
+
+
+def diagonal_colouring_fits(width, length, ships):
+    """
+    Tells whether fleet passes the colouring bound: for every k from 2 to the longest ship, fields are
+    coloured by (x + y) mod k and by (x - y) mod k; a ship of length L covers L consecutive colours,
+    so at least L // k fields of each colour, and no colour may be needed more often than it occurs
+
+    It proves e.g. that nine 1x4 ships do not tile 6x6. Field counts of colours come from counts of
+    x mod k and y mod k, so the bound costs O(k^2) per k, not O(board).
+
+    :param width: board width
+    :param length: board length
+    :param ships: lengths of ships
+    :return: False if the fleet surely does not fit, True if the bound cannot tell
+    """
+    for k in range(2, max(ships, default=0) + 1):
+        needed = sum(ship_length // k for ship_length in ships)
+        # fields with x mod k == a, and with y mod k == b
+        xs = [width // k + (a < width % k) for a in range(k)]
+        ys = [length // k + (b < length % k) for b in range(k)]
+        for c in range(k):
+            if sum(xs[a] * ys[(c - a) % k] for a in range(k)) < needed or \
+                    sum(xs[a] * ys[(a - c) % k] for a in range(k)) < needed:
+                return False
+    return True
+
+
+class FleetPlacer:
+    """
+    Places whole fleet on a board by sampling from precomputed legal placements and backtracking
+    """
+
+    def __init__(self, width, length, rng=None):
+        self.width = width
+        self.length = length
+        self.random = rng if rng is not None else random.Random()
+        self.nodes = 0
+        self.board_mask = (1 << (width * length)) - 1
+        self.row_anchors = {}
+        self.column_anchors = {}
+        self.patterns = {}
+
+    def mask(self, ship_length, placement):
+        """
+        Returns bitmask of fields covered by given placement
+
+        :param ship_length: length of the ship
+        :param placement: (shift, x, y, orientation) from `get_placements`
+        """
+        if ship_length not in self.patterns:
+            column = 0
+            for i in range(ship_length):
+                column |= 1 << (i * self.width)
+            self.patterns[ship_length] = {"horizontal": (1 << ship_length) - 1, "vertical": column}
+        return self.patterns[ship_length][placement[3]] << placement[0]
+
+    def _candidates(self, ship_length, occupied):
+        """
+        Yields placements of a ship that do not collide with occupied fields, in random order
+
+        A few uniformly drawn placements are tried first, so that on sparse boards the full
+        list of placements does not have to be filtered and shuffled.
+
+        :param ship_length: length of the ship
+        :param occupied: bitmask of occupied fields
+        :return: generator of (bitmask, x, y, orientation)
+        """
+        placements = get_placements(self.width, self.length, ship_length)
+        if not placements:
+            return
+        tried = set()
+        for _ in range(8):
+            i = self.random.randrange(len(placements))
+            if i in tried:
+                continue
+            tried.add(i)
+            mask = self.mask(ship_length, placements[i])
+            if not mask & occupied:
+                yield (mask,) + placements[i][1:]
+        legal = []
+        for i, placement in enumerate(placements):
+            if i not in tried:
+                mask = self.mask(ship_length, placement)
+                if not mask & occupied:
+                    legal.append((mask,) + placement[1:])
+        self.random.shuffle(legal)
+        for placement in legal:
+            yield placement
+
+    def place(self, list_of_ships, max_nodes=20000, random_nodes=1000, task=None):
+        """
+        Finds random layout of the whole fleet
+
+        If random search does not succeed within random_nodes placements, the board is crowded:
+        `fill` covers it field by field choosing among options in random order, and if even that
+        does not succeed within half of max_nodes, the exhaustive search of `check_fleet` decides.
+        Their layouts are turned into a random mirror image of the board. Layouts of crowded boards
+        are therefore varied, but not drawn uniformly.
+
+        :param list_of_ships: list of (ship length, amount of ships)
+        :param max_nodes: maximal amount of placements tried by exhaustive search before giving up
+        :param random_nodes: maximal amount of placements tried by random search
+        :param task: `AiTask` checked for cancellation while searching
+        :return: (True, list of (ship length, x, y, orientation)) if a layout was found, (False, None) if
+                 fleet does not fit, (None, None) if it could not be decided within max_nodes
+        """
+        ships = sorted([length for length, amount in list_of_ships for _ in range(amount)], reverse=True)
+        if sum(ships) > self.width * self.length:
+            return False, None
+        self.nodes = 0
+        layout = []
+        stack = []
+        occupied = 0
+        while len(layout) < len(ships):
+            if len(stack) == len(layout):
+                stack.append(self._candidates(ships[len(layout)], occupied))
+            placement = next(stack[-1], None)
+            if placement is None:
+                # no more options for this ship, take back the previous one
+                stack.pop()
+                if not layout:
+                    # every option was tried
+                    return False, None
+                occupied &= ~layout.pop()[0]
+                continue
+            self.nodes += 1
+            if task is not None and self.nodes & 255 == 0:
+                task.check()
+            if self.nodes > random_nodes:
+                # random search got stuck, the board is crowded
+                fits, layout = True, self.fill(list_of_ships, max_nodes // 2, task)
+                if layout is None:
+                    fits, layout = self.check_fleet(list_of_ships, max_nodes, task)
+                return fits, None if layout is None else self.mirror(layout)
+            layout.append(placement)
+            occupied |= placement[0]
+        return True, [(ships[i], x, y, orientation) for i, (mask, x, y, orientation) in enumerate(layout)]
+
+    def fill(self, list_of_ships, max_nodes=10000, task=None):
+        """
+        Finds layout of the fleet by covering fields one by one, suitable for crowded boards
+
+        The first free field (in order of bits) is either left empty, if the fleet leaves enough
+        empty fields, or it becomes the first field of a ship going right or down; options are
+        tried in random order.
+
+        :param list_of_ships: list of (ship length, amount of ships)
+        :param max_nodes: maximal amount of options tried before giving up
+        :param task: `AiTask` checked for cancellation while searching
+        :return: list of (ship length, x, y, orientation) or None if no layout was found
+        """
+        remaining = {}
+        for length, amount in list_of_ships:
+            if amount > 0:
+                remaining[length] = remaining.get(length, 0) + amount
+        empty = self.width * self.length - sum(length * amount for length, amount in remaining.items())
+        if empty < 0:
+            return None
+        self.nodes = 0
+        occupied = 0
+        # chosen options: (bitmask, ship length or 0 for empty field, x, y, orientation)
+        layout = []
+        stack = []
+        while remaining:
+            if len(stack) == len(layout):
+                stack.append(iter(self._fill_options(occupied, remaining, empty)))
+            option = next(stack[-1], None)
+            if option is None:
+                stack.pop()
+                if not layout:
+                    return None
+                (mask, length) = layout.pop()[:2]
+                occupied &= ~mask
+                if length == 0:
+                    empty += 1
+                else:
+                    remaining[length] = remaining.get(length, 0) + 1
+                continue
+            self.nodes += 1
+            if task is not None and self.nodes & 255 == 0:
+                task.check()
+            if self.nodes > max_nodes:
+                return None
+            (mask, length) = option[:2]
+            occupied |= mask
+            layout.append(option)
+            if length == 0:
+                empty -= 1
+            else:
+                remaining[length] -= 1
+                if remaining[length] == 0:
+                    del remaining[length]
+        return sorted((option[1:] for option in layout if option[1] > 0), key=lambda ship: -ship[0])
+
+    def _fill_options(self, occupied, remaining, empty):
+        """
+        Returns options for the first free field in random order
+
+        :param occupied: bitmask of occupied (or left empty) fields
+        :param remaining: dict of ship length -> amount of ships still to place
+        :param empty: amount of fields that may still be left empty
+        :return: list of (bitmask, ship length or 0, x, y, orientation)
+        """
+        low = ~occupied & (occupied + 1)
+        cell = low.bit_length() - 1
+        if cell >= self.width * self.length:
+            return []
+        x, y = cell % self.width, cell // self.width
+        options = []
+        if empty > 0:
+            options.append((low, 0, x, y, None))
+        for length in remaining:
+            if x + length <= self.width:
+                mask = self.mask(length, (cell, x, y, "horizontal"))
+                if not mask & occupied:
+                    options.append((mask, length, x, y, "horizontal"))
+            if length > 1 and y + length <= self.length:
+                mask = self.mask(length, (cell, x, y + length - 1, "vertical"))
+                if not mask & occupied:
+                    options.append((mask, length, x, y + length - 1, "vertical"))
+        self.random.shuffle(options)
+        return options
+
+    def _anchors(self, ship_length):
+        """
+        Returns bitmasks of fields from which ship of given length can start without leaving the board
+
+        :param ship_length: length of the ship
+        :return: (horizontal anchors, vertical anchors)
+        """
+        if ship_length not in self.row_anchors:
+            row = 0
+            for x in range(self.width - ship_length + 1):
+                row |= 1 << x
+            horizontal = 0
+            for y in range(self.length):
+                horizontal |= row << (y * self.width)
+            self.row_anchors[ship_length] = horizontal
+            self.column_anchors[ship_length] = (1 << (max(0, self.length - ship_length + 1) * self.width)) - 1
+        return self.row_anchors[ship_length], self.column_anchors[ship_length]
+
+    def _coverable(self, free, ship_length):
+        """
+        Returns bitmask of free fields that can still be covered by a ship of given length
+
+        :param free: bitmask of free fields
+        :param ship_length: length of the ship
+        """
+        horizontal, vertical = self._anchors(ship_length)
+        for i in range(ship_length):
+            horizontal &= free >> i
+            vertical &= free >> (i * self.width)
+        covered = 0
+        for i in range(ship_length):
+            covered |= (horizontal << i) | (vertical << (i * self.width))
+        return covered & self.board_mask
+
+    def _symmetries(self):
+        """Returns functions mapping field (x, y) onto its mirror images on this board"""
+        w, l = self.width - 1, self.length - 1
+        symmetries = [lambda x, y: (w - x, y), lambda x, y: (x, l - y), lambda x, y: (w - x, l - y)]
+        if self.width == self.length:
+            symmetries += [lambda x, y: (y, x), lambda x, y: (l - y, x),
+                           lambda x, y: (y, w - x), lambda x, y: (l - y, w - x)]
+        return symmetries
+
+    def mirror(self, layout, symmetry=None):
+        """
+        Returns mirror image of a layout, every mirror image of a legal layout is legal too
+
+        :param layout: list of (ship length, x, y, orientation)
+        :param symmetry: function from `_symmetries`, a random one (or none) if not given
+        :return: list of (ship length, x, y, orientation)
+        """
+        if symmetry is None:
+            symmetries = self._symmetries()
+            i = self.random.randrange(len(symmetries) + 1)
+            if i == len(symmetries):
+                return list(layout)
+            symmetry = symmetries[i]
+        images = []
+        for (ship_length, x, y, orientation) in layout:
+            if orientation == "horizontal":
+                fields = [symmetry(x + i, y) for i in range(ship_length)]
+            else:
+                fields = [symmetry(x, y - i) for i in range(ship_length)]
+            if ship_length == 1 or fields[0][1] == fields[1][1]:
+                images.append((ship_length, min(fx for (fx, fy) in fields), fields[0][1], "horizontal"))
+            else:
+                images.append((ship_length, fields[0][0], max(fy for (fx, fy) in fields), "vertical"))
+        return images
+
+    def _is_canonical(self, placement, ship_length):
+        """
+        Tells whether placement is the smallest one among its mirror images
+
+        :param placement: (shift, x, y, orientation)
+        :param ship_length: length of the ship
+        """
+        mask, x, y = self.mask(ship_length, placement), placement[1], placement[2]
+        if placement[3] == "horizontal":
+            fields = [(x + i, y) for i in range(ship_length)]
+        else:
+            fields = [(x, y - i) for i in range(ship_length)]
+        for symmetry in self._symmetries():
+            image = 0
+            for field in fields:
+                (fx, fy) = symmetry(*field)
+                image |= 1 << (fy * self.width + fx)
+            if image < mask:
+                return False
+        return True
+
+    def check_fleet(self, list_of_ships, max_nodes=200000, task=None, seconds=None):
+        """
+        Decides whether fleet fits on the board using exhaustive backtracking
+
+        Fleets failing the area or colouring bound (see `diagonal_colouring_fits`) are refused before
+        the search. Identical ships are placed in increasing order of placements, the first ship only in
+        one of its mirror images, and a branch is cut as soon as free fields that can still be
+        covered by the shortest remaining ship are fewer than fields of remaining ships.
+        Placements are generated as they are needed, so on big sparse boards the answer comes
+        after a few placements, without going through all of them.
+
+        :param list_of_ships: list of (ship length, amount of ships)
+        :param max_nodes: maximal amount of placements tried before giving up
+        :param task: `AiTask` checked for cancellation while searching
+        :param seconds: time limit of the search, None for no limit
+        :return: (True, sample layout) if fleet fits, (False, None) if it does not,
+                 (None, None) if it could not be decided within max_nodes or seconds
+        """
+        ships = sorted([length for length, amount in list_of_ships for _ in range(amount)], reverse=True)
+        if not ships:
+            return True, []
+        # area[i] - fields of ships from i on
+        area = [0] * (len(ships) + 1)
+        for i in range(len(ships) - 1, -1, -1):
+            area[i] = area[i + 1] + ships[i]
+        if area[0] > self.width * self.length or not diagonal_colouring_fits(self.width, self.length, ships):
+            return False, None
+        deadline = None if seconds is None else monotonic() + seconds
+        self.nodes = 0
+        steps = 0
+        # every layout has a mirror image in which the only longest ship is canonical
+        only_longest = ships.count(ships[0]) == 1
+        counts = [count_placements(self.width, self.length, ship_length) for ship_length in ships]
+        layout = []
+        occupied = 0
+        next_index = [0]
+        while True:
+            depth = len(layout)
+            if depth == len(ships):
+                return True, [(ships[i], x, y, orientation)
+                              for i, (mask, x, y, orientation) in enumerate(layout)]
+            found = None
+            i = next_index[depth]
+            while i < counts[depth]:
+                steps += 1
+                if steps & 1023 == 0:
+                    if task is not None:
+                        task.check()
+                    if deadline is not None and monotonic() >= deadline:
+                        return None, None
+                placement = placement_at(self.width, self.length, ships[depth], i)
+                mask = self.mask(ships[depth], placement)
+                if not mask & occupied and \
+                        not (depth == 0 and only_longest and not self._is_canonical(placement, ships[0])):
+                    found = (mask,) + placement[1:]
+                    break
+                i += 1
+            if found is not None:
+                next_index[depth] = i + 1
+                self.nodes += 1
+                if self.nodes & 255 == 0:
+                    if task is not None:
+                        task.check()
+                    if deadline is not None and monotonic() >= deadline:
+                        return None, None
+                if self.nodes > max_nodes:
+                    return None, None
+                free = self.board_mask & ~(occupied | found[0])
+                if depth + 1 == len(ships) or \
+                        bin(self._coverable(free, ships[-1])).count("1") >= area[depth + 1]:
+                    layout.append(found)
+                    occupied |= found[0]
+                    # identical ships are placed in increasing order of placements
+                    start = i + 1 if depth + 1 < len(ships) and ships[depth + 1] == ships[depth] else 0
+                    next_index.append(start)
+                continue
+            # no more options on this level, go back
+            if depth == 0:
+                return False, None
+            next_index.pop()
+            occupied &= ~layout.pop()[0]
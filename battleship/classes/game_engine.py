@@ -0,0 +1,455 @@
+import random
+
+from battleship.classes.battleship import BattleShip
+from battleship.classes.fleet_placer import FleetPlacer
+from battleship.classes.state_cache import shared_cache
+
+
+class GameEngine:
+    """
+    Game logic (pair of boards, turns, scoring and AI) independent from the user interface
+
+    Player 1 owns board b1 and fires at b2, player 2 owns board b2 and fires at b1.
+    """
+
+    def __init__(self, board1, board2, list_of_ships, rng=None, seed=None, cache=None):
+        assert (board1.get_length() == board2.get_length())
+        assert (board1.get_width() == board2.get_width())
+
+        self.b1 = board1
+        self.b2 = board2
+        self.ships_original = list(list_of_ships)
+        self.ships_to_place_u1 = list(list_of_ships)
+        self.ships_to_place_u2 = list(list_of_ships)
+        if rng is None:
+            # every game gets a seed, so that it can be saved and replayed
+            seed = random.getrandbits(63) if seed is None else seed
+            rng = random.Random(seed)
+        self.seed = seed
+        self.random = rng
+        self.ai_players = {}
+        # moves of AI levels 4 and higher computed for a state are reused, by default by every game in the process
+        self.cache = cache if cache is not None else shared_cache()
+        self.last_shots = {}
+        # game record: ships placed by every player (length, x, y, orientation) and shots (player, x, y)
+        self.placements = {1: [], 2: []}
+        self.moves = []
+
+        self.placement = True
+        self.real_game = False
+        self.user_turn = True
+        self.game_over = False
+        self.winner = None
+
+        # game is over when the last ship of either fleet sinks, nothing is recounted after shots
+        for player in (1, 2):
+            registry = self.own_board(player).get_user().get_registry()
+            registry.subscribe("fleet destroyed", lambda registry, player=player: self.fleet_destroyed(player))
+
+    def own_board(self, player):
+        """Returns board that belongs to given player"""
+        return self.b1 if player == 1 else self.b2
+
+    def enemy_board(self, player):
+        """Returns board on which given player fires"""
+        return self.b2 if player == 1 else self.b1
+
+    def place_user_ship(self, x, y, orientation, place_ai_ships=True):
+        """
+        Places next ship of user 1 (the local player)
+
+        :param x: x coordinate
+        :param y: y coordinate
+        :param orientation: vertical or horizontal
+        :type orientation: `string`
+        :param place_ai_ships: place ships of AI right after the last ship of the user, otherwise
+                               the caller does it (e.g. in a worker thread, see `ai_layout`)
+        :return: True if ship was placed, False otherwise
+        """
+        if not self.placement or len(self.ships_to_place_u1) == 0:
+            return False
+        length, amount = self.ships_to_place_u1[0]
+        if not self.b1.get_placement_map(length).is_legal(x, y, orientation):
+            return False
+        self.place_ship(1, length, x, y, orientation)
+        self.ships_to_place_u1.pop(0)
+        if amount > 1:
+            self.ships_to_place_u1.append((length, amount - 1))
+            self.ships_to_place_u1.sort(reverse=True)
+        if len(self.ships_to_place_u1) == 0:
+            self.placement = False
+            if place_ai_ships:
+                self.ai_place_ships()
+        return True
+
+    def user_fire(self, x, y):
+        """
+        User 1 fires at given field of enemy's board
+
+        :param x: x coordinate
+        :param y: y coordinate
+        :return: True if shot was fired, False if it was not allowed
+        """
+        if not self.real_game or not self.user_turn or self.game_over or not self.b2.can_fire(x, y):
+            return False
+        self.fire(1, x, y)
+        self.user_turn = False
+        return True
+
+    def place_ship(self, player, length, x, y, orientation):
+        """
+        Places new ship on board of given player and records it
+
+        :param player: number of player (1 or 2)
+        :param length: length of the ship
+        :param x: x coordinate
+        :param y: y coordinate
+        :param orientation: vertical or horizontal
+        :type orientation: `string`
+        :return: True if ship was placed, False otherwise
+        """
+        board = self.own_board(player)
+        if not board.set_battleship(x, y, BattleShip(length, board.get_user()), orientation):
+            return False
+        self.placements[player].append((length, x, y, orientation))
+        return True
+
+    def fire(self, player, x, y):
+        """
+        Given player fires at field of enemy's board and the shot is recorded (no turn checks)
+
+        :param player: number of player (1 or 2)
+        :param x: x coordinate
+        :param y: y coordinate
+        :return: True if shot was fired, False if the field cannot be fired at
+        """
+        board = self.enemy_board(player)
+        if not board.can_fire(x, y):
+            return False
+        board.fire(x, y)
+        self.last_shots[player] = (x, y)
+        self.moves.append((player, x, y))
+        return True
+
+    def nightmare_select_field(self, board=None):
+        """
+        Field selection algorithm for the most difficult AI
+
+        :param board: board to fire at, b1 by default
+        :return: (x, y) of selected field or None if every ship field was hit
+        """
+        board = self.b1 if board is None else board
+        return board.get_ship_field_left()
+
+    def medium_select_field(self, board=None, rng=None):
+        """
+        Field selection algorithm for middle difficulty AI
+
+        :param board: board to fire at, b1 by default
+        :param rng: `random.Random` instance, random generator of the engine by default
+        :return: (x, y) of selected field
+        """
+        board = self.b1 if board is None else board
+        target = board.get_frontier().next_target(board)
+        if target is not None:
+            return target
+        return self.easy_select_field(board, rng)
+
+    def easy_select_field(self, board=None, rng=None):
+        """
+        Field selection algorithm for the least difficult AI
+
+        :param board: board to fire at, b1 by default
+        :param rng: `random.Random` instance, random generator of the engine by default
+        :return: (x, y) of selected field or None if there are no moves left
+        """
+        board = self.b1 if board is None else board
+        return board.random_untried_field(self.random if rng is None else rng)
+
+    def fork_random(self):
+        """
+        Returns new random generator seeded from the one of the engine
+
+        Computations in a worker thread draw from such a fork, so that the generator of the engine
+        is used by one thread only; seeded games still play the same way.
+        """
+        return random.Random(self.random.getrandbits(64))
+
+    def add_ai(self, player, ai):
+        """
+        Sets AI of given player, it observes shots the player has fired so far
+
+        :param player: number of player (1 or 2)
+        :param ai: AI with method observe(x, y)
+        """
+        for (shooter, x, y) in self.moves:
+            if shooter == player:
+                ai.observe(x, y)
+        self.ai_players[player] = ai
+
+    def drop_ai(self, player):
+        """
+        Forgets AI of given player, e.g. when its computation could not be stopped; a new one
+        is made for the next move
+
+        :param player: number of player (1 or 2)
+        """
+        ai = self.ai_players.pop(player, None)
+        if ai is not None and hasattr(ai, "close"):
+            ai.close()
+
+    def get_probability_ai(self, player):
+        """
+        Returns (creating it if necessary) heatmap AI of given player
+
+        :param player: number of player (1 or 2)
+        :return: `ProbabilityAI`
+        """
+        if player not in self.ai_players:
+            # imported here, so that NumPy is needed only by this difficulty level
+            from battleship.classes.probability_ai import ProbabilityAI
+            self.add_ai(player, ProbabilityAI(self.enemy_board(player), self.ships_original, self.fork_random()))
+        return self.ai_players[player]
+
+    def get_monte_carlo_ai(self, player):
+        """
+        Returns (creating it if necessary) time-budgeted sampling AI of given player
+
+        :param player: number of player (1 or 2)
+        :return: `MonteCarloAI`
+        """
+        if player not in self.ai_players:
+            from battleship.classes.monte_carlo_ai import MonteCarloAI
+            user = self.own_board(player).get_user()
+            self.add_ai(player, MonteCarloAI(self.enemy_board(player), self.ships_original, self.fork_random(),
+                                             user.get_time_budget(), user.get_workers(), user.get_max_nodes()))
+        return self.ai_players[player]
+
+    def get_expectimax_ai(self, player):
+        """
+        Returns (creating it if necessary) lookahead AI of given player
+
+        :param player: number of player (1 or 2)
+        :return: `ExpectimaxAI`
+        """
+        if player not in self.ai_players:
+            from battleship.classes.expectimax_ai import ExpectimaxAI
+            user = self.own_board(player).get_user()
+            self.add_ai(player, ExpectimaxAI(self.enemy_board(player), self.ships_original, self.fork_random(),
+                                             user.get_time_budget(), user.get_max_nodes()))
+        return self.ai_players[player]
+
+    def prepare_ai(self, player=2):
+        """
+        Creates AI of given player if its difficulty level needs one (levels 4 and higher)
+
+        Called in the thread owning the engine before `select_field` runs in a worker thread.
+
+        :param player: number of player (1 or 2)
+        :return: AI of the player or None if its level does not use one
+        """
+        level = self.own_board(player).get_user().get_level()
+        if level == 6:
+            return self.get_expectimax_ai(player)
+        elif level == 5:
+            return self.get_monte_carlo_ai(player)
+        elif level == 4:
+            return self.get_probability_ai(player)
+        return None
+
+    def select_field(self, player=2, task=None, rng=None):
+        """
+        Selects field for AI of given player according to its difficulty level
+
+        The field is not fired at, but the call is not free of side effects: AI of the player is created
+        if it does not exist yet, random choices draw from rng, AI updates its own state and computed
+        moves are stored in the cache shared by games (which has its own lock). To run it in a worker
+        thread, call `prepare_ai` and `fork_random` in the thread owning the engine first, pass the fork
+        as rng, and do not fire at the enemy board until the computation has finished or was abandoned.
+
+        :param player: number of player (1 or 2)
+        :param task: `AiTask` of the computation, if it runs in a worker thread
+        :param rng: `random.Random` instance, random generator of the engine by default
+        :return: (x, y) of selected field or None if there are no moves left
+        """
+        if task is not None:
+            task.check()
+        board = self.enemy_board(player)
+        level = self.own_board(player).get_user().get_level()
+        if level >= 4:
+            return self.cached_select_field(player, self.prepare_ai(player), task, rng)
+        elif level == 3:
+            # Nightmare!
+            return self.nightmare_select_field(board)
+        elif level == 2:
+            return self.medium_select_field(board, rng)
+        else:
+            return self.easy_select_field(board, rng)
+
+    def cached_select_field(self, player, ai, task=None, rng=None):
+        """
+        Selects field for AI of given player, best fields found before for the same state are reused
+
+        The state is identified by Zobrist hash of the enemy board together with the level, the time
+        and node budgets, the board size, the fleet and lengths of sunk ships; ties are broken randomly.
+        The hash tells which fields belong to sunk ships, but not which ships they were (touching
+        ships may sink in different ways), so lengths of sunk ships are a part of the key too.
+
+        :param player: number of player (1 or 2)
+        :param ai: AI of the player (with method best_fields(task))
+        :param task: `AiTask` of the computation, if it runs in a worker thread
+        :param rng: `random.Random` instance, random generator of the engine by default
+        :return: (x, y) of selected field or None if there are no moves left
+        """
+        rng = self.random if rng is None else rng
+        board = self.enemy_board(player)
+        user = self.own_board(player).get_user()
+        sunk = tuple(sorted(ship.get_length() for ship in board.get_sunk_ships()))
+        key = (user.get_level(), user.get_time_budget(), user.get_max_nodes(), board.get_width(),
+               board.get_length(), tuple(self.ships_original), sunk, board.get_hash())
+        fields = self.cache.get(key)
+        if fields is None:
+            fields = tuple(ai.best_fields(task))
+            if fields:
+                self.cache.put(key, fields)
+        if fields:
+            # there may be thousands of tied fields, only the drawn one is checked
+            field = fields[rng.randrange(len(fields))]
+            if board.can_fire(*field):
+                return field
+            # guards against colliding hashes
+            fields = [(x, y) for (x, y) in fields if board.can_fire(x, y)]
+        if not fields:
+            # no consistent layout was found in time, any field not fired at yet
+            return board.random_untried_field(rng)
+        return fields[rng.randrange(len(fields))]
+
+    def ai_turn(self, player=2):
+        """
+        AI selects field and fire to it
+
+        :param player: number of player controlled by AI, 2 by default
+        """
+        if self.game_over:
+            return
+        self.apply_ai_shot(player, self.select_field(player))
+
+    def apply_ai_shot(self, player, field):
+        """
+        Fires shot selected for AI by `select_field`
+
+        :param player: number of player controlled by AI
+        :param field: (x, y) or None if there are no moves left
+        """
+        if self.game_over or field is None:
+            # every field was fired at already
+            return
+        (x, y) = field
+        self.fire(player, x, y)
+        if player in self.ai_players:
+            self.ai_players[player].observe(x, y)
+        self.user_turn = True
+
+    def fleet_destroyed(self, player):
+        """
+        Called by ship registry when the last ship of given player sinks
+
+        :param player: number of player who lost the fleet
+        """
+        if not self.game_over:
+            self.game_over = True
+            self.winner = 3 - player
+            # worker processes of sampling AI are not needed anymore
+            self.close()
+
+    def close(self):
+        """
+        Releases resources held by AIs (worker processes); called when the game ends or is abandoned
+
+        The engine may still be used, AIs start their workers again when they are asked for a move.
+        """
+        for ai in self.ai_players.values():
+            if hasattr(ai, "close"):
+                ai.close()
+
+    def check_if_end(self):
+        """
+        Check if game is over ;)
+
+        :return: True if game is over, False otherwise
+        """
+        return self.game_over
+
+    def calculate_scores(self):
+        """
+        Function calculates points at the end of the game
+
+        :return (u1 points, u2 points)
+        """
+        points_u1 = 0
+        points_u2 = 0
+        if self.game_over:
+            maximum_ship_fields = 0
+            ships_amount = 0
+            for leng, amount in self.ships_original:
+                maximum_ship_fields += leng * amount
+                ships_amount += amount
+
+            # points for victory (300 - 0)
+            if self.winner == 2:
+                points_u2 += 300
+            else:
+                points_u1 += 300
+
+            # points for destroyed ships (20 per ship)
+            points_u1 += 20 * (ships_amount - self.b2.get_user().get_amount_of_ships())
+            points_u2 += 20 * (ships_amount - self.b1.get_user().get_amount_of_ships())
+
+            # points for accuracy (ratio * 150)
+            if self.b2.get_total_hit() > 0:
+                points_u1 += self.b2.get_hit_ship_field() / self.b2.get_total_hit() * 150
+            if self.b1.get_total_hit() > 0:
+                points_u2 += self.b1.get_hit_ship_field() / self.b1.get_total_hit() * 150
+
+        return points_u1, points_u2
+
+    def ai_place_ships(self, player=2):
+        """
+        AI places ships on board
+
+        :param player: number of player controlled by AI, 2 by default
+        """
+        self.apply_ai_layout(player, self.ai_layout(player))
+
+    def ai_layout(self, player=2, task=None, rng=None):
+        """
+        Finds layout of ships for AI, it does not place them
+
+        It may run in a worker thread, with rng forked by `fork_random`.
+
+        :param player: number of player controlled by AI, 2 by default
+        :param task: `AiTask` of the computation, if it runs in a worker thread
+        :param rng: `random.Random` instance, random generator of the engine by default
+        :return: list of (ship length, x, y, orientation)
+        """
+        board = self.own_board(player)
+        ships_to_place = self.ships_to_place_u2 if player == 2 else self.ships_to_place_u1
+        placer = FleetPlacer(board.get_width(), board.get_length(), self.random if rng is None else rng)
+        (fits, layout) = placer.place(ships_to_place, task=task)
+        if fits is False:
+            raise Exception("Cannot place ships: the fleet does not fit on the board")
+        if layout is None:
+            raise Exception("Cannot place ships: no layout was found within the search limit")
+        return layout
+
+    def apply_ai_layout(self, player, layout):
+        """
+        Places ships of AI found by `ai_layout` and starts the game
+
+        :param player: number of player controlled by AI
+        :param layout: list of (ship length, x, y, orientation)
+        """
+        for (length, x, y, orientation) in layout:
+            self.place_ship(player, length, x, y, orientation)
+        self.real_game = True
+        self.user_turn = True
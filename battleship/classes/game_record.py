@@ -0,0 +1,224 @@
+import struct
+
+from battleship.classes.bit_board import BitBoard
+from battleship.classes.game_engine import GameEngine
+from battleship.classes.user import User
+
+MAGIC = b"BSG"
+VERSION = 1
+ORIENTATIONS = ("horizontal", "vertical")
+SCORES = struct.Struct("<dd")
+
+
+def write_varint(buffer, value):
+    """
+    Appends non negative integer to buffer as LEB128 varint (7 bits per byte)
+
+    :param buffer: `bytearray`
+    :param value: integer to write
+    """
+    while value > 0x7f:
+        buffer.append((value & 0x7f) | 0x80)
+        value >>= 7
+    buffer.append(value)
+
+
+def read_varint(data, position):
+    """
+    Reads varint written by `write_varint`
+
+    :param data: bytes
+    :param position: index of the first byte of varint
+    :return: (value, index of the first byte after varint)
+    """
+    value = 0
+    shift = 0
+    while True:
+        byte = data[position]
+        position += 1
+        value |= (byte & 0x7f) << shift
+        if byte < 0x80:
+            return value, position
+        shift += 7
+
+
+class GameRecord:
+    """
+    Complete game (board size, fleet, seed, placements, shots and scores) in a compact binary form
+
+    Every record starts with magic "BSG", version byte and varint length of the body, so records
+    can be concatenated in a file and streamed one by one (see `iter_records`). The body holds:
+
+    - header: width, length, seed, levels of both players and the fleet as (length, amount) pairs,
+    - placements of both players: amount of ships, then length and (y * width + x) * 2 + orientation,
+    - moves: amount of shots, then (y * width + x) * 2 + player - 1 for every shot,
+    - trailer: winner (0 if the game was not finished) and points of both players as doubles.
+
+    All integers but the scores are varints.
+    """
+
+    def __init__(self, width, length, list_of_ships, seed, levels, placements, moves, winner=None, scores=(0, 0)):
+        self.width = width
+        self.length = length
+        self.list_of_ships = list(list_of_ships)
+        self.seed = seed
+        self.levels = tuple(levels)
+        self.placements = placements
+        self.moves = moves
+        self.winner = winner
+        self.scores = tuple(scores)
+
+    @classmethod
+    def from_engine(cls, engine):
+        """
+        Creates record of game played by given engine
+
+        :param engine: `GameEngine`
+        """
+        if engine.seed is None:
+            raise Exception("game without seed cannot be recorded")
+        return cls(engine.b1.get_width(), engine.b1.get_length(), engine.ships_original, engine.seed,
+                   (engine.b1.get_user().get_level(), engine.b2.get_user().get_level()),
+                   {1: list(engine.placements[1]), 2: list(engine.placements[2])}, list(engine.moves),
+                   engine.winner, engine.calculate_scores())
+
+    def to_bytes(self):
+        """Returns binary form of this record"""
+        body = bytearray()
+        for value in (self.width, self.length, self.seed, self.levels[0], self.levels[1], len(self.list_of_ships)):
+            write_varint(body, value)
+        for (ship_length, amount) in self.list_of_ships:
+            write_varint(body, ship_length)
+            write_varint(body, amount)
+        for player in (1, 2):
+            write_varint(body, len(self.placements[player]))
+            for (ship_length, x, y, orientation) in self.placements[player]:
+                write_varint(body, ship_length)
+                write_varint(body, (y * self.width + x) * 2 + ORIENTATIONS.index(orientation))
+        write_varint(body, len(self.moves))
+        for (player, x, y) in self.moves:
+            write_varint(body, (y * self.width + x) * 2 + player - 1)
+        write_varint(body, self.winner or 0)
+        body += SCORES.pack(*self.scores)
+
+        data = bytearray(MAGIC)
+        data.append(VERSION)
+        write_varint(data, len(body))
+        return bytes(data + body)
+
+    @classmethod
+    def from_bytes(cls, data, position=0):
+        """
+        Reads record from binary form
+
+        :param data: bytes
+        :param position: index of the first byte of the record
+        :return: (`GameRecord`, index of the first byte after the record)
+        """
+        if data[position:position + 3] != MAGIC:
+            raise Exception("not a game record")
+        if data[position + 3] != VERSION:
+            raise Exception("unsupported game record version")
+        size, position = read_varint(data, position + 4)
+        end = position + size
+
+        values = []
+        for _ in range(6):
+            value, position = read_varint(data, position)
+            values.append(value)
+        width, length, seed, level1, level2, amount = values
+        list_of_ships = []
+        for _ in range(amount):
+            ship_length, position = read_varint(data, position)
+            ships, position = read_varint(data, position)
+            list_of_ships.append((ship_length, ships))
+        placements = {}
+        for player in (1, 2):
+            placements[player] = []
+            amount, position = read_varint(data, position)
+            for _ in range(amount):
+                ship_length, position = read_varint(data, position)
+                value, position = read_varint(data, position)
+                cell = value >> 1
+                placements[player].append((ship_length, cell % width, cell // width, ORIENTATIONS[value & 1]))
+        amount, position = read_varint(data, position)
+        moves = []
+        for _ in range(amount):
+            value, position = read_varint(data, position)
+            cell = value >> 1
+            moves.append(((value & 1) + 1, cell % width, cell // width))
+        winner, position = read_varint(data, position)
+        scores = SCORES.unpack_from(data, position)
+        if position + SCORES.size != end:
+            raise Exception("corrupted game record")
+        return cls(width, length, list_of_ships, seed, (level1, level2), placements, moves,
+                   winner or None, scores), end
+
+    def save(self, path, append=False):
+        """
+        Writes record to file
+
+        :param path: path of the file
+        :param append: add the record at the end of the file instead of overwriting it
+        """
+        with open(path, "ab" if append else "wb") as f:
+            f.write(self.to_bytes())
+
+    @classmethod
+    def load(cls, path):
+        """Reads the first record from file"""
+        with open(path, "rb") as f:
+            return cls.from_bytes(f.read())[0]
+
+    def replay(self, moves=None, board_class=BitBoard):
+        """
+        Plays the recorded game again through `GameEngine`
+
+        :param moves: amount of shots to replay, all by default
+        :param board_class: class of boards to use
+        :return: `GameEngine` in the state after the replayed shots
+        """
+        u1 = User(1, "computer", self.levels[0])
+        u2 = User(2, "computer", self.levels[1])
+        engine = GameEngine(board_class(u1, self.length, self.width), board_class(u2, self.length, self.width),
+                            self.list_of_ships, seed=self.seed)
+        for player in (1, 2):
+            for (ship_length, x, y, orientation) in self.placements[player]:
+                if not engine.place_ship(player, ship_length, x, y, orientation):
+                    raise Exception("recorded ship cannot be placed")
+        engine.placement = False
+        engine.real_game = True
+        for (player, x, y) in self.moves[:moves]:
+            if not engine.fire(player, x, y):
+                raise Exception("recorded shot cannot be fired")
+        return engine
+
+
+def iter_records(stream, chunk_size=1 << 20):
+    """
+    Reads game records one by one from binary stream (e.g. file with many concatenated records)
+
+    :param stream: file opened in binary mode
+    :param chunk_size: amount of bytes read at once
+    :return: generator of `GameRecord`
+    """
+    data = b""
+    position = 0
+    while True:
+        chunk = stream.read(chunk_size)
+        data = data[position:] + chunk
+        position = 0
+        while position < len(data):
+            try:
+                # magic, version and the length of the body tell where the record ends
+                size, start = read_varint(data, position + 4)
+            except IndexError:
+                break
+            if start + size > len(data):
+                break
+            record, position = GameRecord.from_bytes(data, position)
+            yield record
+        if not chunk:
+            if position < len(data):
+                raise Exception("truncated game record")
+            return
@@ -0,0 +1,304 @@
+import asyncio
+import sys
+from functools import partial
+
+from battleship.classes import net_protocol as protocol
+from battleship.classes.bit_board import BitBoard
+from battleship.classes.fleet_placer import FleetPlacer
+from battleship.classes.game_engine import GameEngine
+from battleship.classes.state_cache import StateCache
+from battleship.classes.user import User
+
+# largest board side accepted from clients; memory of a match (boards and Zobrist keys of its size)
+# grows with the square of it and any client may ask for any size
+MAX_SIZE = 100
+# the fleet check runs in a thread of the default executor, off the event loop serving every match;
+# it still competes for the interpreter with the loop, so it is kept short and its verdicts are kept
+CHECK_NODES = 5000
+CHECK_SECONDS = 0.05
+CHECKED_FLEETS = 1024
+
+
+class Match:
+    """
+    Game between two connected players, the server keeps the only authoritative state of it
+    """
+
+    __slots__ = ("width", "players", "engine", "to_place", "turn", "sunk")
+
+    def __init__(self, width, length, list_of_ships, session1, session2):
+        self.width = width
+        self.players = {1: session1, 2: session2}
+        self.engine = GameEngine(BitBoard(User(1, "network"), length, width),
+                                 BitBoard(User(2, "network"), length, width), list_of_ships, seed=0)
+        self.to_place = {1: dict(list_of_ships), 2: dict(list_of_ships)}
+        self.turn = None
+        # ship sunk by the shot being handled
+        self.sunk = None
+        for player in (1, 2):
+            self.engine.own_board(player).get_user().get_registry().subscribe("ship sunk", self.ship_sunk)
+
+    def ship_sunk(self, ship):
+        """Called by ship registry of either player when a ship sinks"""
+        self.sunk = ship
+
+    def broadcast(self, frame):
+        """Sends frame to both players"""
+        for session in self.players.values():
+            session.send(frame)
+
+    def place(self, player, length, placement):
+        """
+        Places ship of given player if it belongs to the fleet and fits on the board
+
+        :return: True if ship was placed, False otherwise
+        """
+        ships_left = self.to_place[player]
+        if self.turn is not None or ships_left.get(length, 0) == 0:
+            return False
+        (x, y, orientation) = protocol.decode_placement(self.width, placement)
+        if not self.engine.place_ship(player, length, x, y, orientation):
+            return False
+        ships_left[length] -= 1
+        if ships_left[length] == 0:
+            del ships_left[length]
+        self.players[player].send(protocol.encode(protocol.PLACED, length, placement))
+        if not self.to_place[1] and not self.to_place[2]:
+            self.turn = 1
+            self.engine.placement = False
+            self.engine.real_game = True
+            self.broadcast(protocol.encode(protocol.BATTLE, self.turn))
+        return True
+
+    def fire(self, player, cell):
+        """
+        Given player fires at cell of the enemy's board, if it is his/her turn
+
+        :return: True if shot was fired, False otherwise
+        """
+        if self.turn != player or self.engine.game_over:
+            return False
+        board = self.engine.enemy_board(player)
+        x, y = cell % self.width, cell // self.width
+        self.sunk = None
+        if not self.engine.fire(player, x, y):
+            return False
+        if self.sunk is not None:
+            frame = protocol.encode(protocol.SHOT, player, cell, protocol.SUNK, self.sunk.get_length(),
+                                    protocol.ship_placement(self.width, self.sunk))
+        else:
+            frame = protocol.encode(protocol.SHOT, player, cell,
+                                    protocol.HIT if board.has_ship_on(x, y) else protocol.MISS)
+        self.broadcast(frame)
+        self.turn = 3 - player
+        if self.engine.game_over:
+            (s_u1, s_u2) = self.engine.calculate_scores()
+            self.broadcast(protocol.encode(protocol.OVER, self.engine.winner,
+                                           int(round(s_u1 * 100)), int(round(s_u2 * 100))))
+        return True
+
+
+class ServerSession(asyncio.Protocol):
+    """
+    Connection of one client, messages are handled as soon as they arrive (no task per connection)
+    """
+
+    __slots__ = ("server", "transport", "decoder", "match", "player", "lobby_key", "checking")
+
+    def __init__(self, server):
+        self.server = server
+        self.transport = None
+        self.decoder = protocol.FrameDecoder()
+        self.match = None
+        self.player = None
+        self.lobby_key = None
+        # fleet asked for by JOIN is being checked
+        self.checking = False
+
+    def connection_made(self, transport):
+        self.transport = transport
+        self.server.sessions += 1
+
+    def connection_lost(self, exc):
+        self.server.sessions -= 1
+        self.server.leave(self)
+        self.transport = None
+
+    def send(self, frame):
+        """Sends frame to the client"""
+        if self.transport is not None:
+            self.transport.write(frame)
+
+    def reject(self, reason):
+        """Tells client that its last message was not accepted"""
+        self.send(protocol.encode(protocol.REJECTED, reason))
+
+    def data_received(self, data):
+        try:
+            messages = self.decoder.feed(data)
+        except Exception:
+            self.reject(protocol.BAD_MESSAGE)
+            self.transport.close()
+            return
+        for message in messages:
+            self.handle(message)
+
+    def handle(self, message):
+        """
+        Validates and applies single message
+
+        :param message: list of integers, type of the message first
+        """
+        kind = message[0]
+        if kind == protocol.JOIN:
+            if self.match is not None or self.lobby_key is not None or self.checking:
+                self.reject(protocol.NOT_NOW)
+            elif not self.server.join(self, message[1:]):
+                self.reject(protocol.BAD_MESSAGE)
+        elif kind == protocol.PLACE and len(message) == 3:
+            if self.match is None:
+                self.reject(protocol.NOT_NOW)
+            elif not self.match.place(self.player, message[1], message[2]):
+                self.reject(protocol.ILLEGAL_MOVE)
+        elif kind == protocol.FIRE and len(message) == 2:
+            if self.match is None:
+                self.reject(protocol.NOT_NOW)
+            elif not self.match.fire(self.player, message[1]):
+                self.reject(protocol.ILLEGAL_MOVE)
+        else:
+            self.reject(protocol.BAD_MESSAGE)
+
+
+class GameServer:
+    """
+    Hosts many matches on one asyncio event loop, players asking for the same board and fleet are paired
+    """
+
+    def __init__(self):
+        self.lobby = {}
+        self.sessions = 0
+        self.matches = 0
+        self.server = None
+        # (width, length, fleet) -> False if the fleet was proven not to fit, True otherwise
+        self.verdicts = StateCache(CHECKED_FLEETS)
+        # (width, length, fleet) -> future of its check running in the executor
+        self.checks = {}
+
+    def join(self, session, arguments):
+        """
+        Puts session into the lobby or pairs it with a waiting one
+
+        Fleet that cannot be placed on the board (e.g. a ship longer than both sides) is refused, the match
+        could never start; fleets the bounded search of `FleetPlacer.check_fleet` cannot decide are accepted.
+        A fleet not seen before is checked in the executor, meanwhile the session cannot join again and
+        the server answers once the check is done; verdicts are cached, so every fleet is checked once.
+
+        :param session: `ServerSession`
+        :param arguments: width, length, amount of fleet entries, (ship length, amount)...
+        :return: False if arguments are not valid
+        """
+        if len(arguments) < 3:
+            return False
+        (width, length, entries) = arguments[:3]
+        fleet = arguments[3:]
+        if not (5 <= width <= MAX_SIZE and 5 <= length <= MAX_SIZE) or entries == 0 or len(fleet) != 2 * entries:
+            return False
+        list_of_ships = sorted(((fleet[i], fleet[i + 1]) for i in range(0, len(fleet), 2)), reverse=True)
+        lengths = [ship_length for (ship_length, _) in list_of_ships]
+        if len(set(lengths)) != len(lengths) or \
+                any(ship_length < 1 or amount < 1 for (ship_length, amount) in list_of_ships) or \
+                max(lengths) > max(width, length) or \
+                sum(ship_length * amount for (ship_length, amount) in list_of_ships) > width * length:
+            return False
+
+        key = (width, length, tuple(list_of_ships))
+        # fleet of a waiting session was checked already
+        verdict = True if key in self.lobby else self.verdicts.get(key)
+        if verdict is not None:
+            if verdict:
+                self.enter(session, key)
+            return verdict
+        check = self.checks.get(key)
+        if check is None:
+            check = asyncio.get_running_loop().run_in_executor(None, _check_fleet, width, length, list_of_ships)
+            check.add_done_callback(partial(self.checked, key))
+            self.checks[key] = check
+        session.checking = True
+        check.add_done_callback(partial(self.checked_for, session, key))
+        return True
+
+    def checked(self, key, check):
+        """Stores verdict of a finished fleet check"""
+        del self.checks[key]
+        if not check.cancelled():
+            self.verdicts.put(key, check.result())
+
+    def checked_for(self, session, key, check):
+        """Answers JOIN of given session after the check of its fleet finished"""
+        session.checking = False
+        if session.transport is None or check.cancelled():
+            return
+        if check.result():
+            self.enter(session, key)
+        else:
+            session.reject(protocol.BAD_MESSAGE)
+
+    def enter(self, session, key):
+        """
+        Puts session asking for a checked board and fleet into the lobby or pairs it with a waiting one
+
+        :param session: `ServerSession`
+        :param key: (width, length, fleet)
+        """
+        (width, length, list_of_ships) = key
+        waiting = self.lobby.pop(key, None)
+        if waiting is None:
+            self.lobby[key] = session
+            session.lobby_key = key
+            session.send(protocol.encode(protocol.WAITING))
+            return True
+        waiting.lobby_key = None
+        match = Match(width, length, list_of_ships, waiting, session)
+        for (player, player_session) in match.players.items():
+            player_session.match = match
+            player_session.player = player
+            player_session.send(protocol.encode(protocol.MATCHED, player))
+        self.matches += 1
+
+    def leave(self, session):
+        """Removes disconnected session from the lobby or its match"""
+        if session.lobby_key is not None:
+            if self.lobby.get(session.lobby_key) is session:
+                del self.lobby[session.lobby_key]
+            session.lobby_key = None
+        match = session.match
+        if match is not None:
+            session.match = None
+            opponent = match.players[3 - session.player]
+            if opponent.match is match:
+                opponent.match = None
+                if not match.engine.game_over:
+                    opponent.send(protocol.encode(protocol.LEFT))
+
+    async def start(self, host="127.0.0.1", port=5000):
+        """Starts listening, returns `asyncio.Server`"""
+        loop = asyncio.get_running_loop()
+        self.server = await loop.create_server(lambda: ServerSession(self), host, port)
+        return self.server
+
+    async def serve_forever(self, host="127.0.0.1", port=5000):
+        """Starts listening and serves clients until cancelled"""
+        server = await self.start(host, port)
+        async with server:
+            await server.serve_forever()
+
+
+def _check_fleet(width, length, list_of_ships):
+    """Tells whether fleet may fit on the board, False only if the bounded search proved it does not"""
+    (fits, _) = FleetPlacer(width, length).check_fleet(list_of_ships, CHECK_NODES, seconds=CHECK_SECONDS)
+    return fits is not False
+
+
+if __name__ == '__main__':
+    port = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    asyncio.run(GameServer().serve_forever(port=port))
@@ -0,0 +1,292 @@
+import multiprocessing
+import random
+from array import array
+from concurrent.futures import ProcessPoolExecutor, TimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from time import monotonic
+
+from battleship.classes.fleet_placer import get_placements
+
+
+def _covering(width, length, cell, ship_length):
+    """
+    Returns placements of ship of given length covering given field
+
+    :return: list of (first field, step between fields)
+    """
+    x, y = cell % width, cell // width
+    placements = []
+    for x0 in range(max(0, x - ship_length + 1), min(x, width - ship_length) + 1):
+        placements.append((y * width + x0, 1))
+    for y0 in range(max(0, y - ship_length + 1), min(y, length - ship_length) + 1):
+        placements.append((y0 * width + x, width))
+    return placements
+
+
+def placement_mask(first, step, ship_length):
+    """Returns bitmask of fields covered by ship"""
+    mask = 0
+    for i in range(ship_length):
+        mask |= 1 << (first + i * step)
+    return mask
+
+
+def sample_layout(width, length, blocked, hits, ships, rng, tries):
+    """
+    Draws one layout of remaining ships consistent with the shots
+
+    Ships are first put over the hits (every hit has to be covered), then the rest is placed randomly.
+    Ship covering only hit fields is not allowed, it would have been reported as sunk.
+
+    :return: list of (first field, step, ship length) or None if the drawing failed
+    """
+    occupied = blocked
+    uncovered = hits
+    remaining = list(ships)
+    layout = []
+    while uncovered:
+        if not remaining:
+            return None
+        cell = (uncovered & -uncovered).bit_length() - 1
+        options = []
+        for (i, ship_length) in enumerate(remaining):
+            if i > 0 and remaining[i - 1] == ship_length:
+                continue
+            for (first, step) in _covering(width, length, cell, ship_length):
+                mask = placement_mask(first, step, ship_length)
+                if not mask & occupied and mask & ~hits:
+                    options.append((i, first, step, mask))
+        if not options:
+            return None
+        (i, first, step, mask) = options[rng.randrange(len(options))]
+        occupied |= mask
+        uncovered &= ~mask
+        layout.append((first, step, remaining.pop(i)))
+
+    for ship_length in remaining:
+        placements = get_placements(width, length, ship_length)
+        if not placements:
+            return None
+        for _ in range(tries):
+            (first, x, y, orientation) = placements[rng.randrange(len(placements))]
+            step = 1 if orientation == "horizontal" else width
+            mask = placement_mask(first, step, ship_length)
+            if not mask & occupied and mask & ~hits:
+                occupied |= mask
+                layout.append((first, step, ship_length))
+                break
+        else:
+            return None
+    return layout
+
+
+def sample_counts(width, length, blocked, hits, ships, seconds, seed, max_samples=None, task=None, tries=32):
+    """
+    Counts how often each field is covered by a ship in random layouts consistent with the shots
+
+    Runs until the time is up or max_samples layouts were sampled (it is a module function, so it can
+    run in another process). Without time limit the result depends on the seed only.
+
+    :param width: board width
+    :param length: board length
+    :param blocked: bitmask of misses and fields of sunk ships
+    :param hits: bitmask of hits of ships still afloat
+    :param ships: lengths of ships still afloat
+    :param seconds: time for sampling, None for no limit (max_samples is needed then)
+    :param seed: seed of the random generator
+    :param max_samples: stop after this amount of layouts, or after 64 times more attempts
+    :param task: `AiTask` checked for cancellation
+    :param tries: random placements tried for one ship before the layout is dropped
+    :return: (amount of layouts, array of counts indexed by y * width + x)
+    """
+    rng = random.Random(seed)
+    ships = sorted(ships, reverse=True)
+    counts = array('l', [0]) * (width * length)
+    deadline = None if seconds is None else monotonic() + seconds
+    # layouts consistent with the shots may be hard to find, attempts are limited as well
+    max_attempts = None if max_samples is None else 64 * max_samples
+    samples = 0
+    attempts = 0
+    while max_samples is None or samples < max_samples:
+        attempts += 1
+        if max_attempts is not None and attempts > max_attempts:
+            break
+        if attempts & 15 == 0:
+            if deadline is not None and monotonic() >= deadline:
+                break
+            if task is not None:
+                task.check()
+        layout = sample_layout(width, length, blocked, hits, ships, rng, tries)
+        if layout is None:
+            continue
+        samples += 1
+        for (first, step, ship_length) in layout:
+            for cell in range(first, first + ship_length * step, step):
+                counts[cell] += 1
+    return samples, counts
+
+
+class MonteCarloAI:
+    """
+    Anytime AI: samples layouts of the remaining fleet consistent with observed shots until the time
+    budget runs out (or max_samples layouts are sampled) and fires at the field covered most often
+
+    Without time budget only max_samples limits a move, so the moves depend on the seed of the
+    random generator only, not on speed of the machine.
+
+    `observe` has to be called after each `Board.fire` on the observed board. With more than one
+    worker, sampling runs in that many processes at once (this one included); `close` stops the
+    worker processes.
+    """
+
+    # share of the time budget for sampling when worker processes are used, the rest is for collecting
+    SAMPLING_SHARE = 0.8
+
+    def __init__(self, board, list_of_ships, rng=None, time_budget=1.0, workers=1, max_samples=None):
+        """
+        :param board: board to fire at
+        :param list_of_ships: fleet of the game, list of (ship length, amount)
+        :param rng: `random.Random` instance
+        :param time_budget: seconds for one move, None for no limit
+        :param workers: processes sampling at once (this one included)
+        :param max_samples: layouts sampled for one move at most, None for no limit (then time_budget is needed)
+        """
+        if time_budget is None and max_samples is None:
+            raise Exception("time budget or amount of samples has to be limited")
+        self.board = board
+        self.width = board.get_width()
+        self.length = board.get_length()
+        self.random = rng if rng is not None else random.Random()
+        self.time_budget = time_budget
+        self.workers = workers
+        self.max_samples = max_samples
+        self.executor = None
+        self.ships = sorted([length for length, amount in list_of_ships for _ in range(amount)], reverse=True)
+        self.shots = 0
+        self.blocked = 0
+        self.hits = 0
+        self.known_sunk = 0
+        self.samples = 0
+        for x in range(self.width):
+            for y in range(self.length):
+                if not board.can_fire(x, y):
+                    self.observe(x, y)
+
+    def observe(self, x, y):
+        """
+        Updates known state after shot at given field of observed board
+
+        :param x: x coordinate
+        :param y: y coordinate
+        """
+        field = 1 << (y * self.width + x)
+        if self.shots & field:
+            return
+        self.shots |= field
+        if self.board.has_ship_on(x, y):
+            self.hits |= field
+        else:
+            self.blocked |= field
+        sunk_ships = self.board.get_sunk_ships()
+        while self.known_sunk < len(sunk_ships):
+            ship = sunk_ships[self.known_sunk]
+            if ship.get_length() in self.ships:
+                self.ships.remove(ship.get_length())
+            for (sx, sy) in ship.get_fields():
+                self.hits &= ~(1 << (sy * self.width + sx))
+                self.blocked |= 1 << (sy * self.width + sx)
+            self.known_sunk += 1
+
+    def get_samples(self):
+        """Returns amount of layouts sampled for the last move"""
+        return self.samples
+
+    def _counts(self, seconds, task):
+        """
+        Samples layouts within given time, in this process and in the worker processes
+
+        Workers sample for SAMPLING_SHARE of the time, the rest is left for collecting their results;
+        results not ready by then (e.g. of workers still starting) are skipped. Without time limit
+        (seconds is None) all samples are taken in this process, so the result does not depend on timing.
+        """
+        if self.workers <= 1 or seconds is None:
+            arguments = (self.width, self.length, self.blocked, self.hits, self.ships, seconds)
+            return sample_counts(*arguments, seed=self.random.getrandbits(64), max_samples=self.max_samples,
+                                 task=task)
+        # every process takes its share of the samples
+        share = None if self.max_samples is None else -(-self.max_samples // self.workers)
+        wait_until = monotonic() + seconds
+        arguments = (self.width, self.length, self.blocked, self.hits, self.ships, seconds * self.SAMPLING_SHARE)
+        futures = []
+        try:
+            if self.executor is None:
+                # forking a process running GUI threads is not safe, workers are started fresh
+                self.executor = ProcessPoolExecutor(self.workers - 1,
+                                                    mp_context=multiprocessing.get_context("spawn"))
+            futures = [self.executor.submit(sample_counts, *arguments, seed=self.random.getrandbits(64),
+                                            max_samples=share)
+                       for _ in range(self.workers - 1)]
+        except BrokenProcessPool:
+            self._workers_broken()
+        # this process samples meanwhile too
+        (samples, counts) = sample_counts(*arguments, seed=self.random.getrandbits(64), max_samples=share, task=task)
+        for future in futures:
+            try:
+                (amount, partial) = future.result(timeout=max(0.0, wait_until - monotonic()))
+            except TimeoutError:
+                future.cancel()
+                continue
+            except BrokenProcessPool:
+                self._workers_broken()
+                break
+            samples += amount
+            for (i, value) in enumerate(partial):
+                if value:
+                    counts[i] += value
+        return samples, counts
+
+    def _workers_broken(self):
+        """Worker processes cannot run here, sampling goes on in this process only from now on"""
+        self.close()
+        self.workers = 1
+
+    def best_fields(self, task=None):
+        """
+        Returns the most probable fields of a ship, sampled within the time budget
+
+        :param task: `AiTask` of the computation; its deadline shortens the time budget
+        :return: list of (x, y), empty if no consistent layout was found in time
+        """
+        seconds = self.time_budget
+        if task is not None and task.time_left() is not None:
+            # leave some time for posting the result back
+            seconds = task.time_left() * 0.8 if seconds is None else min(seconds, task.time_left() * 0.8)
+        self.samples, counts = self._counts(None if seconds is None else max(0.0, seconds), task)
+        hits = self.hits
+        while hits:
+            low = hits & -hits
+            counts[low.bit_length() - 1] = 0
+            hits ^= low
+        best = max(counts) if self.samples > 0 else 0
+        if best == 0:
+            return []
+        return [(i % self.width, i // self.width) for (i, value) in enumerate(counts) if value == best]
+
+    def select_field(self, task=None):
+        """
+        Selects the most probable field of a ship within the time budget, ties are broken randomly
+
+        :param task: `AiTask` of the computation; its deadline shortens the time budget
+        :return: (x, y) of selected field or None if every field was fired at
+        """
+        fields = self.best_fields(task)
+        if not fields:
+            # no consistent layout was found in time, any field not fired at yet
+            return self.board.random_untried_field(self.random)
+        return fields[self.random.randrange(len(fields))]
+
+    def close(self):
+        """Stops worker processes, they are started again if another move is asked for"""
+        if self.executor is not None:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+            self.executor = None
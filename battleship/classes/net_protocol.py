@@ -0,0 +1,135 @@
+"""
+Binary protocol of network games
+
+Every message is a frame: varint length of the body, then the body - varints, the first one is
+the type of the message. Fields are sent as single numbers: cell = y * width + x, placement of
+a ship as cell * 2 + orientation (0 - horizontal, 1 - vertical). Points are sent multiplied by 100.
+
+Client to server:
+
+- JOIN width length amount_of_fleet_entries (ship_length amount)...
+- PLACE ship_length placement
+- FIRE cell
+
+Server to client:
+
+- WAITING - no opponent yet
+- MATCHED player - opponent found, player number (1 or 2), ships can be placed
+- PLACED ship_length placement - ship accepted by the server
+- REJECTED reason - message was not valid (see REASONS)
+- BATTLE first_player - both fleets are placed
+- SHOT player cell result [ship_length placement] - result of a shot (MISS, HIT, SUNK),
+  placement of the ship is sent when it sinks
+- OVER winner points1 points2 - game is over
+- LEFT - opponent disconnected
+"""
+
+from battleship.classes.game_record import write_varint, read_varint
+
+JOIN = 1
+PLACE = 2
+FIRE = 3
+
+WAITING = 10
+MATCHED = 11
+PLACED = 12
+REJECTED = 13
+BATTLE = 14
+SHOT = 15
+OVER = 16
+LEFT = 17
+
+MISS = 0
+HIT = 1
+SUNK = 2
+
+BAD_MESSAGE = 1
+NOT_NOW = 2
+ILLEGAL_MOVE = 3
+REASONS = {BAD_MESSAGE: "bad message", NOT_NOW: "not allowed now", ILLEGAL_MOVE: "illegal move"}
+
+MAX_FRAME = 4096
+ORIENTATIONS = ("horizontal", "vertical")
+
+
+def encode(*values):
+    """
+    Builds frame of given message
+
+    :param values: type of the message followed by its arguments (non negative integers)
+    :return: bytes
+    """
+    body = bytearray()
+    for value in values:
+        write_varint(body, value)
+    frame = bytearray()
+    write_varint(frame, len(body))
+    return bytes(frame + body)
+
+
+def encode_placement(width, x, y, orientation):
+    """Returns single number describing placement of a ship"""
+    return (y * width + x) * 2 + ORIENTATIONS.index(orientation)
+
+
+def decode_placement(width, placement):
+    """Returns (x, y, orientation) from number made by `encode_placement`"""
+    cell = placement >> 1
+    return cell % width, cell // width, ORIENTATIONS[placement & 1]
+
+
+def ship_placement(width, ship):
+    """
+    Returns number describing placement of ship already on a board
+
+    :param width: board width
+    :param ship: `BattleShip` with its fields set
+    """
+    fields = ship.get_fields()
+    (x, y) = fields[0]
+    orientation = "vertical" if len(fields) > 1 and fields[1][0] == x else "horizontal"
+    return encode_placement(width, x, y, orientation)
+
+
+class FrameDecoder:
+    """
+    Splits incoming stream of bytes into messages
+    """
+
+    __slots__ = ("buffer",)
+
+    def __init__(self):
+        self.buffer = b""
+
+    def feed(self, data):
+        """
+        Adds received bytes
+
+        :param data: bytes
+        :return: list of complete messages, each is a list of integers (type first)
+        """
+        buffer = self.buffer + data if self.buffer else data
+        messages = []
+        position = 0
+        while position < len(buffer):
+            try:
+                size, start = read_varint(buffer, position)
+            except IndexError:
+                break
+            if size > MAX_FRAME:
+                raise Exception("frame too long")
+            end = start + size
+            if end > len(buffer):
+                break
+            message = []
+            while start < end:
+                value, start = read_varint(buffer, start)
+                message.append(value)
+            if start != end or not message:
+                raise Exception("malformed frame")
+            messages.append(message)
+            position = end
+        self.buffer = buffer[position:]
+        if len(self.buffer) > MAX_FRAME + 8:
+            raise Exception("frame too long")
+        return messages
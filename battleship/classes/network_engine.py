@@ -0,0 +1,201 @@
+from battleship.classes import net_protocol as protocol
+from battleship.classes.battleship import BattleShip
+
+
+class NetworkEngine:
+    """
+    Client side of a network game, offers `GameBoard` the same interface as `GameEngine`
+
+    Moves of the local player are checked locally and sent to the server, the state changes only
+    after the server confirms them. Events for the user interface are passed to the listener
+    as listener(event, *arguments):
+
+    - "waiting" - no opponent yet,
+    - "matched" - opponent found, ships can be placed,
+    - "battle" - both fleets placed,
+    - "square" board x y - square of given board changed,
+    - "shot" own result - shot was fired (own tells whether by the local player), result is
+      MISS, HIT or SUNK from `net_protocol`,
+    - "rejected" reason - server did not accept the last move,
+    - "over" - game is over, see `calculate_scores`,
+    - "left" - opponent disconnected,
+    - "disconnected" reason - connection to the server was lost.
+    """
+
+    def __init__(self, board1, board2, list_of_ships):
+        """
+        :param board1: board of the local player
+        :param board2: `RemoteBoard` of the opponent
+        :param list_of_ships: list of (ship length, amount of ships)
+        """
+        self.b1 = board1
+        self.b2 = board2
+        self.width = board1.get_width()
+        self.ships_original = list(list_of_ships)
+        self.ships_to_place_u1 = sorted(list_of_ships, reverse=True)
+        self.pending = []
+        self.player = None
+        self.last_shots = {}
+        self.scores = (0, 0)
+        self.winner = None
+        self.send = None
+        self.disconnect = None
+        self.listener = None
+
+        self.placement = False
+        self.real_game = False
+        self.user_turn = False
+        self.game_over = False
+
+    def set_sender(self, send):
+        """Sets function sending frames to the server"""
+        self.send = send
+
+    def set_closer(self, disconnect):
+        """Sets function closing the connection to the server"""
+        self.disconnect = disconnect
+
+    def set_listener(self, listener):
+        """Sets function receiving events for the user interface"""
+        self.listener = listener
+
+    def notify(self, event, *arguments):
+        """Passes event to the listener"""
+        if self.listener is not None:
+            self.listener(event, *arguments)
+
+    def join(self):
+        """Asks the server for an opponent with the same board and fleet"""
+        values = [protocol.JOIN, self.width, self.b1.get_length(), len(self.ships_original)]
+        for (length, amount) in self.ships_original:
+            values += [length, amount]
+        self.send(protocol.encode(*values))
+
+    def place_user_ship(self, x, y, orientation, place_ai_ships=True):
+        """
+        Sends placement of the next ship of the local player
+
+        :param x: x coordinate
+        :param y: y coordinate
+        :param orientation: vertical or horizontal
+        :type orientation: `string`
+        :param place_ai_ships: ignored, there is no AI in network game
+        :return: always False, the ship is placed after the server confirms it
+        """
+        if not self.placement or len(self.ships_to_place_u1) == 0:
+            return False
+        length, amount = self.ships_to_place_u1[0]
+        if not self.b1.get_placement_map(length).is_legal(x, y, orientation):
+            return False
+        # one ship at a time, the next one is sent after the server confirms this one
+        self.placement = False
+        self.pending.append((length, x, y, orientation))
+        self.send(protocol.encode(protocol.PLACE, length, protocol.encode_placement(self.width, x, y, orientation)))
+        return False
+
+    def user_fire(self, x, y):
+        """
+        Sends shot of the local player
+
+        :param x: x coordinate
+        :param y: y coordinate
+        :return: True if shot was sent, False if it was not allowed
+        """
+        if not self.real_game or not self.user_turn or self.game_over or not self.b2.can_fire(x, y):
+            return False
+        self.user_turn = False
+        self.last_shots[1] = (x, y)
+        self.send(protocol.encode(protocol.FIRE, y * self.width + x))
+        return True
+
+    def ai_turn(self, player=2):
+        """Opponent's moves come from the server, nothing to do here"""
+        pass
+
+    def calculate_scores(self):
+        """Returns points sent by the server at the end of the game"""
+        return self.scores
+
+    def handle(self, message):
+        """
+        Applies message received from the server
+
+        :param message: list of integers, type of the message first
+        """
+        kind = message[0]
+        if kind == protocol.WAITING:
+            self.notify("waiting")
+        elif kind == protocol.MATCHED:
+            self.player = message[1]
+            self.placement = True
+            self.notify("matched")
+        elif kind == protocol.PLACED:
+            (length, x, y, orientation) = self.pending.pop(0)
+            self.b1.set_battleship(x, y, BattleShip(length, self.b1.get_user()), orientation)
+            amount = self.ships_to_place_u1.pop(0)[1]
+            if amount > 1:
+                self.ships_to_place_u1.append((length, amount - 1))
+                self.ships_to_place_u1.sort(reverse=True)
+            for i in range(length):
+                if orientation == "vertical":
+                    self.notify("square", 1, x, y - i)
+                else:
+                    self.notify("square", 1, x + i, y)
+            self.placement = len(self.ships_to_place_u1) > 0
+        elif kind == protocol.REJECTED:
+            if self.pending:
+                self.pending.pop(0)
+                self.placement = True
+            elif self.real_game and not self.game_over:
+                self.user_turn = True
+            self.notify("rejected", protocol.REASONS.get(message[1], "unknown reason"))
+        elif kind == protocol.BATTLE:
+            self.real_game = True
+            self.user_turn = message[1] == self.player
+            self.notify("battle")
+        elif kind == protocol.SHOT:
+            self.shot(message[1:])
+        elif kind == protocol.OVER:
+            self.winner = 1 if message[1] == self.player else 2
+            points = (message[2] / 100, message[3] / 100)
+            self.scores = points if self.player == 1 else (points[1], points[0])
+            self.game_over = True
+            self.user_turn = False
+            self.notify("over")
+        elif kind == protocol.LEFT:
+            self.game_over = True
+            self.user_turn = False
+            self.notify("left")
+
+    def shot(self, arguments):
+        """Applies result of a shot: player, cell, result and placement of the ship if it sank"""
+        (player, cell, result) = arguments[:3]
+        x, y = cell % self.width, cell // self.width
+        if player == self.player:
+            self.b2.mark_shot(x, y, result != protocol.MISS)
+            self.last_shots[1] = (x, y)
+            self.notify("square", 2, x, y)
+            if result == protocol.SUNK and len(arguments) >= 5:
+                (length, placement) = arguments[3:5]
+                for (fx, fy) in self.b2.mark_sunk(length, *protocol.decode_placement(self.width, placement)):
+                    self.notify("square", 2, fx, fy)
+        else:
+            self.b1.fire(x, y)
+            self.last_shots[2] = (x, y)
+            self.notify("square", 1, x, y)
+            self.user_turn = not self.game_over
+        self.notify("shot", player == self.player, result)
+
+    def close(self):
+        """Closes the connection to the server when the game is left, no more events are passed"""
+        self.listener = None
+        if self.disconnect is not None:
+            (disconnect, self.disconnect) = (self.disconnect, None)
+            disconnect()
+
+    def connection_lost(self, reason):
+        """Called when connection to the server is lost"""
+        if not self.game_over:
+            self.game_over = True
+            self.user_turn = False
+            self.notify("disconnected", reason)
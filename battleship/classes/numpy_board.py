@@ -0,0 +1,214 @@
+import numpy as np
+
+from battleship.classes.board import Board
+from battleship.classes.zobrist import MISS, HIT, zobrist_keys
+
+
+class NumpyBoard(Board):
+    """
+    Board keeping ships and shots in NumPy arrays, able to apply many shots in one call
+
+    Public API is the same as in `Board`. Arrays are indexed [x, y], ships are referred to
+    by their index in `ships_by_id` (-1 means no ship).
+    """
+
+    __slots__ = ("occupied", "shots", "ship_ids", "ships_by_id")
+
+    def fill_with_fields(self, length, width):
+        """
+        Called in __init__(), instead of creating fields it allocates the arrays
+
+        :param length: y dimension
+        :type length: `int`
+        :param width: x dimension
+        :type width: `int`
+        """
+        self.occupied = np.zeros((width, length), dtype=bool)
+        self.shots = np.zeros((width, length), dtype=bool)
+        self.ship_ids = np.full((width, length), -1, dtype=np.int32)
+        self.ships_by_id = []
+
+    def can_fire(self, x, y):
+        """
+        Tests if user has already hit this field
+
+        :param x: x coordinate
+        :param y: y coordinate
+        """
+        return 0 <= x < self.width and 0 <= y < self.length and not self.shots[x, y]
+
+    def fire(self, x, y):
+        """
+        Hits specific field (given by coordinates)
+
+        :param x: x coordinate
+        :param y: y coordinate
+        """
+        if self.can_fire(x, y):
+            self.shots[x, y] = True
+            self.total_hit += 1
+            self.untried.remove(x, y)
+            self.shot_hashed(x, y, self.occupied[x, y])
+            if self.occupied[x, y]:
+                self.hit_ship_field += 1
+                self.hit_ship_fields.append((x, y))
+                ship = self.ships_by_id[self.ship_ids[x, y]]
+                ship.was_hit()
+                self.ship_hit(x, y, ship)
+
+    def fire_many(self, coords):
+        """
+        Fires a salvo: many shots applied at once, in given order
+
+        Shots outside the board, at fields already fired at, or repeated within the salvo
+        are ignored, just like `fire` ignores them. Hit test, hash and pools of fields are updated
+        with array operations; Python loops run only over the ships hit (for their damage and
+        sinking) and over hits of ships left afloat (for the target frontier). The board ends in
+        the same state as after firing the shots one by one, except for the order of fields in its
+        pools (so random choices from them differ) and that ships sunk are announced after the
+        whole salvo, in order of sinking.
+
+        :param coords: sequence of (x, y) or array of shape (n, 2)
+        :return: (hit mask - `bool` array telling which of the shots hit a ship, list of ships sunk)
+        """
+        coords = np.asarray(coords, dtype=np.intp).reshape(-1, 2)
+        xs, ys = coords[:, 0], coords[:, 1]
+        hit_mask = np.zeros(len(coords), dtype=bool)
+        on_board = np.flatnonzero((xs >= 0) & (xs < self.width) & (ys >= 0) & (ys < self.length))
+        if len(on_board) == 0:
+            return hit_mask, []
+
+        # keep the first shot at every field which was not fired at before
+        cells = xs[on_board] * self.length + ys[on_board]
+        cells, first = np.unique(cells, return_index=True)
+        order = np.sort(first)
+        shots = on_board[order]
+        shots = shots[~self.shots[xs[shots], ys[shots]]]
+        if len(shots) == 0:
+            return hit_mask, []
+        sx, sy = xs[shots], ys[shots]
+        self.shots[sx, sy] = True
+        self.total_hit += len(shots)
+        hits = self.occupied[sx, sy]
+        cells = sy * self.width + sx
+        _remove_from_pool(self.untried, cells)
+        _remove_from_pool(self.ship_fields_left, cells[hits])
+        keys = zobrist_keys(self.width, self.length)
+        shot_keys = np.where(hits, np.frombuffer(keys[HIT], dtype=np.uint64)[cells],
+                             np.frombuffer(keys[MISS], dtype=np.uint64)[cells])
+        self.hash ^= int(np.bitwise_xor.reduce(shot_keys))
+
+        hit_mask[shots[hits]] = True
+        sunk_before = len(self.sunk_ships)
+        hx, hy = sx[hits], sy[hits]
+        self.hit_ship_field += len(hx)
+        self.hit_ship_fields.extend(zip(hx.tolist(), hy.tolist()))
+        ship_ids = self.ship_ids[hx, hy]
+        # the last hit of every ship hit, found in the reversed salvo
+        (hit_ids, last, counts) = np.unique(ship_ids[::-1], return_index=True, return_counts=True)
+        last = len(ship_ids) - 1 - last
+        sunk = []
+        for (ship_id, i, count) in zip(hit_ids.tolist(), last.tolist(), counts.tolist()):
+            ship = self.ships_by_id[ship_id]
+            ship.was_hit(count)
+            if ship.is_destroyed():
+                sunk.append((i, ship))
+        afloat = np.ones(len(ship_ids), dtype=bool)
+        for (i, ship) in sorted(sunk, key=lambda sunk_ship: sunk_ship[0]):
+            afloat &= ship_ids != ship_ids[i]
+            self.ship_sunk(int(hx[i]), int(hy[i]), ship)
+        for (x, y) in zip(hx[afloat].tolist(), hy[afloat].tolist()):
+            self.frontier.hit(x, y)
+        return hit_mask, self.sunk_ships[sunk_before:]
+
+    def has_ship_on(self, x, y):
+        """
+        Checks if on this specific field (given by coordinates) is a battleship
+
+        :param x: x coordinate
+        :type x: `int`
+        :param y: y coordinate
+        :type y: `int`
+        """
+        return 0 <= x < self.width and 0 <= y < self.length and bool(self.occupied[x, y])
+
+    def has_ship_fields_left(self):
+        """Tells whether any field containing ship has not been hit yet"""
+        return bool((self.occupied & ~self.shots).any())
+
+    def can_be_placed(self, x, y, ship, orientation):
+        """
+        Tests whether specific ship can be placed properly on this board using given coordinates
+
+        :param x: x coordinate
+        :type x: `int`
+        :param y: y coordinate
+        :type y: `int`
+        :param ship: ship to place (or its length)
+        :type ship: `Battleship`
+        :param orientation: vertical or horizontal
+        :type orientation: `string`
+        """
+        length = ship if type(1) == type(ship) else ship.get_length()
+        if orientation == "horizontal":
+            if not (0 <= y < self.length and 0 <= x and x + length <= self.width):
+                return False
+            return not self.occupied[x:x + length, y].any()
+        elif orientation == "vertical":
+            if not (0 <= x < self.width and length - 1 <= y < self.length):
+                return False
+            return not self.occupied[x, y - length + 1:y + 1].any()
+        return False
+
+    def place_ship(self, x, y, ship, orientation):
+        """
+        Places specific ship on this board in a given way
+
+        :param x: x coordinate
+        :param y: y coordinate
+        :param ship: ship to place
+        :param orientation: vertical or horizontal
+        :type orientation: `string`
+        """
+        if orientation == "horizontal":
+            fields = [(x + i, y) for i in range(ship.get_length())]
+        elif orientation == "vertical":
+            fields = [(x, y - i) for i in range(ship.get_length())]
+        else:
+            raise Exception("unknown orientation type")
+        ship_id = len(self.ships_by_id)
+        self.ships_by_id.append(ship)
+        for (fx, fy) in fields:
+            self.occupied[fx, fy] = True
+            self.ship_ids[fx, fy] = ship_id
+        ship.set_fields(fields)
+        self.ship_placed(ship)
+
+
+def _remove_from_pool(pool, cells):
+    """
+    Removes fields from `CellPool` with array operations
+
+    Removed fields leave holes in the first len(pool) - len(cells) slots of the pool; fields left in
+    the slots behind them fill the holes, in order. The pool holds the same fields as after calls
+    of `CellPool.remove`, but in different order.
+
+    :param pool: `CellPool`
+    :param cells: array of indices y * width + x of fields in the pool
+    """
+    if len(cells) == 0:
+        return
+    fields = np.frombuffer(pool.fields, dtype=np.intc)
+    positions = np.frombuffer(pool.positions, dtype=np.intc)
+    removed = positions[cells]
+    size = len(fields) - len(cells)
+    holes = np.sort(removed[removed < size])
+    tail = np.ones(len(fields) - size, dtype=bool)
+    tail[removed[removed >= size] - size] = False
+    movers = fields[size:][tail]
+    fields[holes] = movers
+    positions[movers] = holes
+    positions[cells] = -1
+    # the array cannot shrink while NumPy looks at its memory
+    del fields, positions
+    del pool.fields[size:]
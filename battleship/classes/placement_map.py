@@ -0,0 +1,61 @@
+class PlacementMap:
+    """
+    Tells for every field whether ship of one length can be placed there, in both orientations
+
+    The map is built once from the board and then updated after each ship placed on it,
+    so checking a field is a single lookup.
+    """
+
+    __slots__ = ("width", "board_length", "length", "legal")
+
+    def __init__(self, board, length):
+        self.width = board.get_width()
+        self.board_length = board.get_length()
+        self.length = length
+        self.legal = {"horizontal": bytearray(self.width * self.board_length),
+                      "vertical": bytearray(self.width * self.board_length)}
+
+        # a ship fits where the run of free fields starting there is long enough
+        for y in range(self.board_length):
+            run = 0
+            for x in range(self.width - 1, -1, -1):
+                run = 0 if board.has_ship_on(x, y) else run + 1
+                if run >= length:
+                    self.legal["horizontal"][y * self.width + x] = 1
+        for x in range(self.width):
+            run = 0
+            for y in range(self.board_length):
+                run = 0 if board.has_ship_on(x, y) else run + 1
+                if run >= length:
+                    self.legal["vertical"][y * self.width + x] = 1
+
+    def get_length(self):
+        """Returns length of ship this map is made for"""
+        return self.length
+
+    def is_legal(self, x, y, orientation):
+        """
+        Tells whether ship can be placed on given field
+
+        :param x: x coordinate
+        :param y: y coordinate
+        :param orientation: vertical or horizontal
+        :type orientation: `string`
+        """
+        if orientation not in self.legal or not (0 <= x < self.width and 0 <= y < self.board_length):
+            return False
+        return self.legal[orientation][y * self.width + x] == 1
+
+    def ship_placed(self, fields):
+        """
+        Marks placements covering newly occupied fields as illegal
+
+        :param fields: fields occupied by the new ship
+        """
+        for (fx, fy) in fields:
+            for i in range(self.length):
+                # horizontal ship from (x, y) covers (x + i, y), vertical one covers (x, y - i)
+                if 0 <= fx - i:
+                    self.legal["horizontal"][fy * self.width + fx - i] = 0
+                if fy + i < self.board_length:
+                    self.legal["vertical"][(fy + i) * self.width + fx] = 0
@@ -0,0 +1,172 @@
+import random
+
+import numpy as np
+
+# subtracted from density of fields fired at, so the best field is found without masking the heatmap
+FIRED = 1 << 40
+
+
+class ProbabilityAI:
+    """
+    Targeting AI firing at the field covered by the most legal placements of remaining ships
+
+    For every ship length it keeps which anchors (leftmost/lowest field of a ship) are still legal
+    and how many legal placements cover each field. Both are updated incrementally in `observe`,
+    which has to be called after each `Board.fire` on the observed board; a move then costs
+    a few array operations over the board and a handful over the rows and columns of the shot.
+    Arrays are indexed [x, y].
+    """
+
+    def __init__(self, board, list_of_ships, rng=None):
+        self.board = board
+        self.width = board.get_width()
+        self.length = board.get_length()
+        self.random = rng if rng is not None else random.Random()
+        self.remaining = {}
+        for length, amount in list_of_ships:
+            self.remaining[length] = self.remaining.get(length, 0) + amount
+        self.fired = np.zeros((self.width, self.length), dtype=bool)
+        self.unsunk_hits = set()
+        self.known_sunk = 0
+        self.sunk_fields = set()
+
+        self.horizontal = {}
+        self.vertical = {}
+        self.coverage = {}
+        self.density = np.zeros((self.width, self.length), dtype=np.int64)
+        for length, amount in self.remaining.items():
+            # amount of anchors in a row and in a column, none if the ship is longer than the board
+            rows = max(0, self.width - length + 1)
+            columns = max(0, self.length - length + 1)
+            self.horizontal[length] = np.ones((rows, self.length), dtype=bool)
+            self.vertical[length] = np.ones((self.width, columns), dtype=bool)
+            coverage = np.zeros((self.width, self.length), dtype=np.int64)
+            for i in range(length):
+                if rows > 0:
+                    coverage[i:i + rows, :] += self.horizontal[length]
+                if columns > 0:
+                    coverage[:, i:i + columns] += self.vertical[length]
+            self.coverage[length] = coverage
+            self.density += amount * coverage
+
+    def _block(self, x, y):
+        """
+        Removes every placement covering given field (a miss or a field of sunk ship)
+
+        :param x: x coordinate
+        :param y: y coordinate
+        """
+        for length, amount in self.remaining.items():
+            ones = np.ones(length, dtype=np.int64)
+
+            anchors = self.horizontal[length]
+            a0, a1 = max(0, x - length + 1), min(x, self.width - length)
+            if a0 <= a1:
+                lost = anchors[a0:a1 + 1, y].astype(np.int64)
+                anchors[a0:a1 + 1, y] = False
+                delta = np.convolve(lost, ones)
+                self.coverage[length][a0:a1 + length, y] -= delta
+                self.density[a0:a1 + length, y] -= amount * delta
+
+            anchors = self.vertical[length]
+            a0, a1 = max(0, y - length + 1), min(y, self.length - length)
+            if a0 <= a1:
+                lost = anchors[x, a0:a1 + 1].astype(np.int64)
+                anchors[x, a0:a1 + 1] = False
+                delta = np.convolve(lost, ones)
+                self.coverage[length][x, a0:a1 + length] -= delta
+                self.density[x, a0:a1 + length] -= amount * delta
+
+    def _ship_sunk(self, ship):
+        """
+        Removes sunk ship from remaining fleet and blocks its fields
+
+        :param ship: sunk ship
+        """
+        length = ship.get_length()
+        if self.remaining.get(length, 0) > 0:
+            self.density -= self.coverage[length]
+            self.remaining[length] -= 1
+            if self.remaining[length] == 0:
+                del self.remaining[length]
+        for (x, y) in ship.get_fields():
+            self.sunk_fields.add((x, y))
+            self.unsunk_hits.discard((x, y))
+            self._block(x, y)
+
+    def observe(self, x, y):
+        """
+        Updates heatmap after shot at given field of observed board
+
+        :param x: x coordinate
+        :param y: y coordinate
+        """
+        if self.fired[x, y]:
+            return
+        self.fired[x, y] = True
+        self.density[x, y] -= FIRED
+        if self.board.has_ship_on(x, y):
+            # shots may be observed late (see `GameEngine.add_ai`), after their ship sank
+            if (x, y) not in self.sunk_fields:
+                self.unsunk_hits.add((x, y))
+        else:
+            self._block(x, y)
+        sunk_ships = self.board.get_sunk_ships()
+        while self.known_sunk < len(sunk_ships):
+            self._ship_sunk(sunk_ships[self.known_sunk])
+            self.known_sunk += 1
+
+    def _target_scores(self):
+        """
+        Counts legal placements going through fields that were hit, but whose ship is still afloat
+
+        :return: array of scores
+        """
+        scores = np.zeros((self.width, self.length), dtype=np.int64)
+        for (x, y) in self.unsunk_hits:
+            for length, amount in self.remaining.items():
+                ones = np.ones(length, dtype=np.int64)
+                a0, a1 = max(0, x - length + 1), min(x, self.width - length)
+                if a0 <= a1:
+                    legal = self.horizontal[length][a0:a1 + 1, y].astype(np.int64)
+                    scores[a0:a1 + length, y] += amount * np.convolve(legal, ones)
+                a0, a1 = max(0, y - length + 1), min(y, self.length - length)
+                if a0 <= a1:
+                    legal = self.vertical[length][x, a0:a1 + 1].astype(np.int64)
+                    scores[x, a0:a1 + length] += amount * np.convolve(legal, ones)
+        return scores
+
+    def get_heatmap(self):
+        """Returns amount of legal placements of remaining ships covering each field"""
+        return self.density + FIRED * self.fired
+
+    def best_fields(self, task=None):
+        """
+        Returns fields with the highest score
+
+        :param task: not used, the computation is short
+        :return: list of (x, y), empty if every field was fired at
+        """
+        scores = None
+        if self.unsunk_hits:
+            scores = np.where(self.fired, -1, self._target_scores())
+            if scores.max() <= 0:
+                scores = None
+        if scores is None:
+            scores = self.density
+        best = scores.max()
+        if best < 0:
+            return []
+        (xs, ys) = np.unravel_index(np.flatnonzero(scores == best), scores.shape)
+        return list(zip(xs.tolist(), ys.tolist()))
+
+    def select_field(self):
+        """
+        Selects field with the highest score, ties are broken randomly
+
+        :return: (x, y) of selected field or None if every field was fired at
+        """
+        fields = self.best_fields()
+        if not fields:
+            return None
+        return fields[self.random.randrange(len(fields))]
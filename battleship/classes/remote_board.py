@@ -0,0 +1,63 @@
+from battleship.classes.battleship import BattleShip
+from battleship.classes.bit_board import BitBoard, MISSED, HIT
+
+
+class RemoteBoard(BitBoard):
+    """
+    Board of opponent playing over network, only results of shots sent by the server are known
+
+    Fields of ships are known only where they were hit, so `has_ship_on` tells about hits.
+    """
+
+    __slots__ = ()
+
+    def fire(self, x, y):
+        """Shots at remote board are decided by the server, see `mark_shot`"""
+        raise Exception("result of a shot at remote board comes from the server")
+
+    def mark_shot(self, x, y, hit):
+        """
+        Records result of a shot sent by the server
+
+        :param x: x coordinate
+        :param y: y coordinate
+        :param hit: True if a ship was hit
+        """
+        if not self.can_fire(x, y):
+            return
+        cell = y * self.width + x
+        self.total_hit += 1
+        self.untried.remove(x, y)
+        self.shot_hashed(x, y, hit)
+        bit = 1 << cell
+        self.shot_mask |= bit
+        if hit:
+            self.shot_cells[cell] = HIT
+            self.ship_cells[cell] = 1
+            self.ship_mask |= bit
+            self.hit_mask |= bit
+            self.hit_ship_field += 1
+            self.hit_ship_fields.append((x, y))
+        else:
+            self.shot_cells[cell] = MISSED
+
+    def mark_sunk(self, length, x, y, orientation):
+        """
+        Records ship sunk by the last shot, as sent by the server
+
+        :param length: length of the ship
+        :param x: x coordinate of the ship
+        :param y: y coordinate of the ship
+        :param orientation: vertical or horizontal
+        :return: fields of the ship
+        """
+        if orientation == "horizontal":
+            fields = [(x + i, y) for i in range(length)]
+        else:
+            fields = [(x, y - i) for i in range(length)]
+        ship = BattleShip(length, self.user)
+        ship.set_fields(fields)
+        for _ in fields:
+            ship.was_hit()
+        self.ship_hit(x, y, ship)
+        return fields
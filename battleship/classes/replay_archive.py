@@ -0,0 +1,201 @@
+import mmap
+import os
+import struct
+
+from battleship.classes.game_record import GameRecord, ORIENTATIONS
+
+MAGIC = b"BSA"
+VERSION = 1
+FILE_HEADER = struct.Struct("<3sBIII")
+FLEET_ENTRY = struct.Struct("<II")
+# seed, points of player 1 and 2, level of player 1 and 2, winner, amount of shots
+RECORD_HEADER = struct.Struct("<QddBBBxI")
+
+
+class ArchivedGame:
+    """
+    View of one game stored in `ReplayArchive`, values are read straight from the mapped file
+
+    The view keeps the mapping of the file alive, so it stays valid after the iteration is over
+    (e.g. `next(iter(archive)).to_record()`); the file is unmapped when the last view is gone.
+    """
+
+    __slots__ = ("archive", "data", "offset")
+
+    def __init__(self, archive, data, offset):
+        self.archive = archive
+        self.data = data
+        self.offset = offset
+
+    def _header(self):
+        return RECORD_HEADER.unpack_from(self.data, self.offset)
+
+    def get_seed(self):
+        """Returns seed of the game"""
+        return self._header()[0]
+
+    def get_scores(self):
+        """Returns (points of player 1, points of player 2)"""
+        return self._header()[1:3]
+
+    def get_levels(self):
+        """Returns (level of player 1, level of player 2)"""
+        return self._header()[3:5]
+
+    def get_winner(self):
+        """Returns number of player who won or None if the game was not finished"""
+        return self._header()[5] or None
+
+    def get_moves(self):
+        """
+        Returns codes of shots: (y * width + x) * 2 + player - 1
+
+        :return: tuple of unsigned integers
+        """
+        return self.archive.codes(self.data, self.offset + self.archive.moves_offset, self._header()[6])
+
+    def get_shots(self):
+        """Returns generator of shots as (player, x, y)"""
+        width = self.archive.width
+        for code in self.get_moves():
+            cell = code >> 1
+            yield (code & 1) + 1, cell % width, cell // width
+
+    def get_placements(self, player):
+        """
+        Returns ships placed by given player
+
+        :param player: number of player (1 or 2)
+        :return: list of (length, x, y, orientation)
+        """
+        archive = self.archive
+        ships = archive.ships
+        start = self.offset + RECORD_HEADER.size + (player - 1) * ships * 2
+        lengths = struct.unpack_from("<%dH" % ships, self.data, start)
+        codes = archive.codes(self.data, self.offset + archive.codes_offset + (player - 1) * ships * archive.code_size,
+                              ships)
+        placements = []
+        for (length, code) in zip(lengths, codes):
+            cell = code >> 1
+            placements.append((length, cell % archive.width, cell // archive.width, ORIENTATIONS[code & 1]))
+        return placements
+
+    def to_record(self):
+        """Returns copy of this game as `GameRecord`"""
+        (seed, s_u1, s_u2, level1, level2, winner, _) = self._header()
+        return GameRecord(self.archive.width, self.archive.length, self.archive.list_of_ships, seed,
+                          (level1, level2), {1: self.get_placements(1), 2: self.get_placements(2)},
+                          list(self.get_shots()), winner or None, (s_u1, s_u2))
+
+
+class ReplayArchive:
+    """
+    Append-only file of games of one board size and fleet, every game stored in a record of the same size
+
+    The file starts with a header (magic "BSA", version, width, length and the fleet), then records follow:
+
+    - seed, scores, levels, winner and amount of shots (`RECORD_HEADER`),
+    - lengths of ships of both players (unsigned shorts),
+    - placements of both players: (y * width + x) * 2 + orientation,
+    - room for the largest possible amount of shots: (y * width + x) * 2 + player - 1.
+
+    Codes are unsigned shorts on boards up to 32767 fields, unsigned ints on bigger ones, all numbers
+    are little-endian. Since every record has the same size, the file is iterated through `mmap`
+    without parsing or copying it, values are decoded as they are asked for. A record cut short by
+    interrupted append is ignored and overwritten by the next append.
+    """
+
+    def __init__(self, path, width=None, length=None, list_of_ships=None):
+        """
+        Opens archive, creating it if the file does not exist
+
+        :param path: path of the archive file
+        :param width: board width (needed to create the archive)
+        :param length: board length (needed to create the archive)
+        :param list_of_ships: list of (ship length, amount of ships) (needed to create the archive)
+        """
+        self.path = path
+        if not os.path.exists(path) or os.path.getsize(path) == 0:
+            if width is None or length is None or list_of_ships is None:
+                raise Exception("board size and fleet are needed to create an archive")
+            header = FILE_HEADER.pack(MAGIC, VERSION, width, length, len(list_of_ships))
+            for (ship_length, amount) in list_of_ships:
+                header += FLEET_ENTRY.pack(ship_length, amount)
+            with open(path, "wb") as f:
+                f.write(header)
+
+        with open(path, "rb") as f:
+            (magic, version, self.width, self.length, entries) = FILE_HEADER.unpack(f.read(FILE_HEADER.size))
+            if magic != MAGIC:
+                raise Exception("not a replay archive")
+            if version != VERSION:
+                raise Exception("unsupported replay archive version")
+            self.list_of_ships = [FLEET_ENTRY.unpack(f.read(FLEET_ENTRY.size)) for _ in range(entries)]
+        if (width, length) != (None, None) and (width, length) != (self.width, self.length):
+            raise Exception("archive holds games on a board of different size")
+        if list_of_ships is not None and list(map(tuple, list_of_ships)) != self.list_of_ships:
+            raise Exception("archive holds games with different fleet")
+
+        self.header_size = FILE_HEADER.size + entries * FLEET_ENTRY.size
+        self.ships = sum(amount for (_, amount) in self.list_of_ships)
+        self.max_moves = 2 * self.width * self.length
+        (self.code_type, self.code_size) = ("H", 2) if self.max_moves <= 0xffff else ("I", 4)
+        self.codes_offset = RECORD_HEADER.size + 2 * self.ships * 2
+        self.moves_offset = self.codes_offset + 2 * self.ships * self.code_size
+        self.record_size = self.moves_offset + self.max_moves * self.code_size
+
+    def __len__(self):
+        return max(0, os.path.getsize(self.path) - self.header_size) // self.record_size
+
+    def codes(self, data, offset, amount):
+        """Decodes given amount of codes stored at offset of data, returns tuple of them"""
+        return struct.unpack_from("<%d%s" % (amount, self.code_type), data, offset)
+
+    def append(self, record):
+        """
+        Adds game at the end of the archive
+
+        :param record: `GameRecord` of a game with the board size and fleet of this archive
+        """
+        if (record.width, record.length) != (self.width, self.length) or \
+                list(map(tuple, record.list_of_ships)) != self.list_of_ships:
+            raise Exception("game does not match the archive")
+        data = bytearray(self.record_size)
+        RECORD_HEADER.pack_into(data, 0, record.seed, record.scores[0], record.scores[1],
+                                record.levels[0], record.levels[1], record.winner or 0, len(record.moves))
+        lengths = []
+        codes = []
+        for player in (1, 2):
+            placements = record.placements[player]
+            if len(placements) > self.ships:
+                raise Exception("game does not match the archive")
+            lengths += [length for (length, _, _, _) in placements] + [0] * (self.ships - len(placements))
+            codes += [(y * self.width + x) * 2 + ORIENTATIONS.index(orientation)
+                      for (_, x, y, orientation) in placements] + [0] * (self.ships - len(placements))
+        struct.pack_into("<%dH" % len(lengths), data, RECORD_HEADER.size, *lengths)
+        struct.pack_into("<%d%s" % (len(codes), self.code_type), data, self.codes_offset, *codes)
+        moves = [(y * self.width + x) * 2 + player - 1 for (player, x, y) in record.moves]
+        struct.pack_into("<%d%s" % (len(moves), self.code_type), data, self.moves_offset, *moves)
+        with open(self.path, "r+b") as f:
+            # a record cut short by interrupted append would shift every record written after it
+            f.seek(self.header_size + len(self) * self.record_size)
+            f.write(data)
+            f.truncate()
+
+    def __iter__(self):
+        """
+        Iterates over games mapped from the file, see `ArchivedGame`
+
+        Memory used does not depend on size of the archive, pages of the file are loaded by the system
+        when they are read. Games appended during the iteration are not visited.
+        """
+        amount = len(self)
+        if amount == 0:
+            return
+        with open(self.path, "rb") as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        # not released at the end, views of games may outlive the iteration; the mapping is closed
+        # when the last of them is gone
+        data = memoryview(mapped)
+        for i in range(amount):
+            yield ArchivedGame(self, data, self.header_size + i * self.record_size)
@@ -0,0 +1,85 @@
+class ShipRegistry:
+    """
+    Ships of one user keyed by ship id, with counters of ships registered and still afloat
+
+    Listeners subscribed to "ship sunk" are called with the sunk ship, listeners subscribed
+    to "fleet destroyed" are called with the registry once its last ship sinks. Events are
+    emitted by the board the ship is on (see `announce_sunk`), after it has recorded the
+    sinking, so listeners see the board, its sunk ships and its hash up to date.
+    """
+
+    __slots__ = ("ships", "next_id", "afloat", "listeners")
+
+    EVENTS = ("ship sunk", "fleet destroyed")
+
+    def __init__(self):
+        self.ships = {}
+        self.next_id = 0
+        self.afloat = 0
+        self.listeners = dict((event, []) for event in self.EVENTS)
+
+    def __len__(self):
+        return self.afloat
+
+    def subscribe(self, event, listener):
+        """
+        Registers function called when given event happens
+
+        :param event: "ship sunk" or "fleet destroyed"
+        :param listener: function taking one argument
+        """
+        if event not in self.listeners:
+            raise Exception("unknown event")
+        self.listeners[event].append(listener)
+
+    def emit(self, event, argument):
+        """Calls every listener of given event"""
+        for listener in self.listeners[event]:
+            listener(argument)
+
+    def register(self, ship):
+        """
+        Adds ship afloat to the registry and gives it an id
+
+        :param ship: `BattleShip`
+        :return: id of the ship
+        """
+        ship.set_id(self.next_id)
+        self.ships[self.next_id] = ship
+        self.next_id += 1
+        self.afloat += 1
+        return ship.get_id()
+
+    def sink(self, ship):
+        """
+        Marks ship as sunk, events are emitted later by `announce_sunk`
+
+        :param ship: `BattleShip` registered here
+        """
+        if self.ships.pop(ship.get_id(), None) is not None:
+            self.afloat -= 1
+
+    def announce_sunk(self, ship):
+        """
+        Emits "ship sunk" for given ship and "fleet destroyed" if no ship is afloat anymore
+
+        :param ship: `BattleShip` sunk just now
+        """
+        if ship.get_id() is None or ship.get_id() in self.ships:
+            # ship was never registered here or it is still afloat
+            return
+        self.emit("ship sunk", ship)
+        if self.afloat == 0:
+            self.emit("fleet destroyed", self)
+
+    def get_ship(self, ship_id):
+        """Returns ship afloat with given id or None"""
+        return self.ships.get(ship_id)
+
+    def get_ships(self):
+        """Returns ships afloat in order of registration"""
+        return list(self.ships.values())
+
+    def get_amount_registered(self):
+        """Returns amount of all ships ever registered"""
+        return self.next_id
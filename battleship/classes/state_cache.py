@@ -0,0 +1,98 @@
+from collections import OrderedDict
+from threading import Lock
+
+
+class StateCache:
+    """
+    Bounded cache of results computed for board states, least recently used entries are dropped first
+
+    Keys are built from `Board.get_hash` (with whatever else the result depends on, e.g. the AI level
+    and the fleet). Hashes are the same in every process, so keys are too. AI runs in worker threads
+    while other games use the same cache, so every operation holds a lock (computations in
+    `get_or_compute` do not).
+    """
+
+    __slots__ = ("entries", "capacity", "hits", "misses", "lock")
+
+    def __init__(self, capacity=4096):
+        """
+        :param capacity: maximal amount of entries
+        """
+        self.entries = OrderedDict()
+        self.capacity = capacity
+        self.hits = 0
+        self.misses = 0
+        self.lock = Lock()
+
+    def __len__(self):
+        with self.lock:
+            return len(self.entries)
+
+    def get(self, key):
+        """
+        Returns value stored under given key
+
+        :param key: hashable key
+        :return: value or None if it is not in the cache
+        """
+        with self.lock:
+            value = self.entries.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value):
+        """
+        Stores value under given key, dropping the least recently used entry if the cache is full
+
+        :param key: hashable key
+        :param value: anything but None
+        """
+        with self.lock:
+            self.entries[key] = value
+            self.entries.move_to_end(key)
+            if len(self.entries) > self.capacity:
+                self.entries.popitem(last=False)
+
+    def get_or_compute(self, key, compute):
+        """
+        Returns value stored under given key, computing and storing it if it is missing
+
+        :param key: hashable key
+        :param compute: function without arguments returning the value
+        """
+        value = self.get(key)
+        if value is None:
+            value = compute()
+            if value is not None:
+                self.put(key, value)
+        return value
+
+    def get_hits(self):
+        """Returns amount of lookups that found their value"""
+        return self.hits
+
+    def get_misses(self):
+        """Returns amount of lookups that did not find their value"""
+        return self.misses
+
+    def clear(self):
+        """Removes every entry"""
+        with self.lock:
+            self.entries.clear()
+
+
+_shared = None
+_shared_lock = Lock()
+
+
+def shared_cache():
+    """Returns cache shared by every game in this process"""
+    global _shared
+    with _shared_lock:
+        if _shared is None:
+            _shared = StateCache()
+        return _shared
@@ -0,0 +1,75 @@
+from collections import deque
+
+
+class TargetFrontier:
+    """
+    Queue of fields worth firing at next to hit ships that are still afloat
+
+    It is updated by the board after every hit. Each candidate remembers the hit it comes from;
+    candidates of sunk ships and fields already fired at are dropped lazily when reached.
+    Ends of a detected ship axis go first, but the neighbours of every hit stay queued until they
+    are fired at or the ship sinks: a line of hits may run across several ships lying side by side.
+    """
+
+    __slots__ = ("width", "length", "queue", "open_hits")
+
+    directions = [(-1, 0), (1, 0), (0, -1), (0, 1)]
+
+    def __init__(self, width, length):
+        self.width = width
+        self.length = length
+        self.queue = deque()
+        self.open_hits = set()
+
+    def _on_board(self, x, y):
+        """Tells whether given coordinates lie on the board"""
+        return 0 <= x < self.width and 0 <= y < self.length
+
+    def _line_end(self, x, y, dx, dy):
+        """Returns first field from (x, y) in direction (dx, dy) that is not a hit of a ship afloat"""
+        while (x, y) in self.open_hits:
+            x += dx
+            y += dy
+        return x, y
+
+    def _queue_neighbours(self, x, y):
+        """Queues the neighbours of hit (x, y) on the board, behind the candidates queued before"""
+        for (dx, dy) in self.directions:
+            if self._on_board(x + dx, y + dy):
+                self.queue.append((x + dx, y + dy, (x, y)))
+
+    def hit(self, x, y, sunk_fields=None):
+        """
+        Updates frontier after a ship was hit on given field
+
+        :param x: x coordinate
+        :param y: y coordinate
+        :param sunk_fields: fields of the ship if this hit sank it, None otherwise
+        """
+        if sunk_fields is not None:
+            for field in sunk_fields:
+                self.open_hits.discard(field)
+            return
+        self.open_hits.add((x, y))
+        self._queue_neighbours(x, y)
+        for (dx, dy) in self.directions:
+            if (x - dx, y - dy) in self.open_hits:
+                # ship axis detected, both ends of the line go first
+                for (ex, ey) in (self._line_end(x, y, dx, dy), self._line_end(x, y, -dx, -dy)):
+                    if self._on_board(ex, ey):
+                        self.queue.appendleft((ex, ey, (x, y)))
+                return
+
+    def next_target(self, board):
+        """
+        Returns next candidate field on given board without removing it
+
+        :param board: board being observed
+        :return: (x, y) or None if there are no candidates
+        """
+        while self.queue:
+            (x, y, origin) = self.queue[0]
+            if origin in self.open_hits and board.can_fire(x, y):
+                return x, y
+            self.queue.popleft()
+        return None
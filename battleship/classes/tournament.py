@@ -0,0 +1,204 @@
+import os
+from time import time
+
+from battleship.classes.bit_board import BitBoard
+from battleship.classes.game_engine import GameEngine
+from battleship.classes.game_record import GameRecord
+from battleship.classes.state_cache import StateCache
+from battleship.classes.user import User
+
+
+def play_game(level1, level2, length, width, list_of_ships, seed, time_budget=None, max_nodes=20000, record=False):
+    """
+    Plays single AI vs AI game
+
+    Player who starts alternates with the seed, so both levels move first equally often. Without
+    time budget the game depends on the seed only, also on levels 5 and 6.
+
+    :param level1: difficulty level of player 1
+    :param level2: difficulty level of player 2
+    :param length: board length
+    :param width: board width
+    :param list_of_ships: list of (ship length, amount of ships)
+    :param seed: seed of the random generator used by this game
+    :param time_budget: seconds AI may think about one move (levels 5 and 6), None for no limit
+    :param max_nodes: states (level 6) or sampled layouts (level 5) AI may evaluate for one move
+    :param record: add `GameRecord` of the game at the end of the result
+    :return: (seed, winner or None if nobody could win, shots of the winner, points of player 1,
+             points of player 2[, `GameRecord`])
+    """
+    u1 = User(1, "computer", level1, time_budget, max_nodes=max_nodes)
+    u2 = User(2, "computer", level2, time_budget, max_nodes=max_nodes)
+    # moves cached by earlier games of the process would make the game depend on which games a worker
+    # played before, the process-wide cache is shared only when results depend on timing anyway
+    cache = StateCache() if time_budget is None else None
+    engine = GameEngine(BitBoard(u1, length, width), BitBoard(u2, length, width), list_of_ships, seed=seed,
+                        cache=cache)
+    engine.ai_place_ships(1)
+    engine.ai_place_ships(2)
+    player = 1 if seed % 2 == 0 else 2
+    # turns in a row in which nobody could fire, the game cannot end when both players are out of moves
+    idle = 0
+    while not engine.game_over and idle < 2:
+        shots = len(engine.moves)
+        engine.ai_turn(player)
+        idle = idle + 1 if len(engine.moves) == shots else 0
+        player = 3 - player
+    winner = engine.winner
+    s_u1, s_u2 = engine.calculate_scores()
+    result = (seed, winner, 0 if winner is None else engine.enemy_board(winner).get_total_hit(), s_u1, s_u2)
+    if record:
+        result += (GameRecord.from_engine(engine),)
+    return result
+
+
+def _play_games(level1, level2, length, width, list_of_ships, seeds, time_budget, max_nodes, record):
+    """Plays a chunk of games inside worker process"""
+    return [play_game(level1, level2, length, width, list_of_ships, seed, time_budget, max_nodes, record)
+            for seed in seeds]
+
+
+class Tournament:
+    """
+    Plays many AI vs AI games across a pool of processes
+    """
+
+    def __init__(self, level1, level2, length=5, width=5, list_of_ships=None, seed=0, time_budget=None,
+                 max_nodes=20000, record=False):
+        """
+        :param level1: difficulty level of player 1
+        :param level2: difficulty level of player 2
+        :param length: board length
+        :param width: board width
+        :param list_of_ships: list of (ship length, amount of ships)
+        :param seed: seed of the first game
+        :param time_budget: seconds AI may think about one move (levels 5 and 6), None for no limit;
+                            with a time budget results of levels 5 and 6 depend on speed of the machine
+                            and do not repeat for the same seed
+        :param max_nodes: states (level 6) or sampled layouts (level 5) AI may evaluate for one move
+        :param record: `iter_games` adds `GameRecord` of every game to its result, to be saved
+        """
+        self.level1 = level1
+        self.level2 = level2
+        self.length = length
+        self.width = width
+        self.list_of_ships = list_of_ships if list_of_ships is not None else [(5, 1), (4, 1), (3, 1)]
+        self.seed = seed
+        self.time_budget = time_budget
+        self.max_nodes = max_nodes
+        self.record = record
+
+    def run(self, games, workers=None):
+        """
+        Plays given amount of games
+
+        Game number i uses seed (seed + i), so results do not depend on amount of workers.
+
+        :param games: amount of games to play
+        :param workers: amount of processes, all cores by default
+        :return: `TournamentResult`
+        """
+        workers = workers or os.cpu_count() or 1
+        start = time()
+        results = [result[:5] for result in self.iter_games(games, workers)]
+        elapsed = time() - start
+        results.sort()
+        return TournamentResult(self.level1, self.level2, results, elapsed, workers)
+
+    def iter_games(self, games, workers=None, chunk_size=64):
+        """
+        Plays given amount of games, results are yielded as soon as they are known (not in order of seeds)
+
+        :param games: amount of games to play
+        :param workers: amount of processes, all cores by default
+        :param chunk_size: maximal amount of games sent to a worker at once
+        :return: generator of (seed, winner, shots of the winner, points of player 1, points of player 2),
+                 followed by `GameRecord` if the games are recorded
+        """
+        workers = workers or os.cpu_count() or 1
+        seeds = list(range(self.seed, self.seed + games))
+        if workers == 1:
+            for seed in seeds:
+                yield play_game(self.level1, self.level2, self.length, self.width, self.list_of_ships, seed,
+                                self.time_budget, self.max_nodes, self.record)
+            return
+        # imported here, process pool takes longer to import than the whole game logic
+        from concurrent.futures import ProcessPoolExecutor, as_completed
+
+        # a few chunks per worker keeps all cores busy with little inter-process traffic
+        size = max(1, min(chunk_size, games // (workers * 4)))
+        executor = ProcessPoolExecutor(max_workers=workers)
+        try:
+            futures = [executor.submit(_play_games, self.level1, self.level2, self.length, self.width,
+                                       self.list_of_ships, seeds[i:i + size], self.time_budget, self.max_nodes,
+                                       self.record)
+                       for i in range(0, games, size)]
+            for future in as_completed(futures):
+                for result in future.result():
+                    yield result
+        finally:
+            executor.shutdown(cancel_futures=True)
+
+
+class TournamentResult:
+    """
+    Results and statistics of a tournament
+    """
+
+    def __init__(self, level1, level2, games, elapsed, workers):
+        self.level1 = level1
+        self.level2 = level2
+        self.games = games
+        self.elapsed = elapsed
+        self.workers = workers
+
+    def get_win_rate(self, player):
+        """Returns ratio of games won by given player"""
+        if len(self.games) == 0:
+            return 0.0
+        return sum(1 for game in self.games if game[1] == player) / len(self.games)
+
+    def get_average_shots_to_win(self, player):
+        """Returns average amount of shots that given player needed to win, None if it never won"""
+        import statistics
+
+        shots = [game[2] for game in self.games if game[1] == player]
+        return statistics.mean(shots) if shots else None
+
+    def get_score_distribution(self, player):
+        """
+        Returns distribution of points calculated by `GameEngine.calculate_scores`
+
+        :return: dictionary with mean, stdev, min, median and max
+        """
+        import statistics
+
+        scores = [game[2 + player] for game in self.games]
+        if not scores:
+            return {}
+        return {
+            "mean": statistics.mean(scores),
+            "stdev": statistics.pstdev(scores),
+            "min": min(scores),
+            "median": statistics.median(scores),
+            "max": max(scores),
+        }
+
+    def get_games_per_second_per_core(self):
+        """Returns throughput of the tournament"""
+        if self.elapsed == 0:
+            return 0.0
+        return len(self.games) / self.elapsed / self.workers
+
+    def __str__(self):
+        lines = ["%d games, level %s vs level %s, %.1f games/s/core on %d core(s)"
+                 % (len(self.games), self.level1, self.level2, self.get_games_per_second_per_core(),
+                    self.workers)]
+        for player, level in ((1, self.level1), (2, self.level2)):
+            shots = self.get_average_shots_to_win(player)
+            scores = self.get_score_distribution(player)
+            lines.append("player %d (level %s): won %.1f%%, shots to win %s, points mean %.1f (%.1f - %.1f)"
+                         % (player, level, 100 * self.get_win_rate(player),
+                            "-" if shots is None else "%.1f" % shots,
+                            scores.get("mean", 0), scores.get("min", 0), scores.get("max", 0)))
+        return "\n".join(lines)
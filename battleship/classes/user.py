@@ -1,17 +1,37 @@
+from battleship.classes.ship_registry import ShipRegistry
+
+LEVELS = {"Very easy": 1, "Medium": 2, "Nightmare!": 3, "Hard": 4, "Monte Carlo": 5, "Expectimax": 6}
+
+
 class User:
     """
     User class
     """
 
-    def __init__(self, nr, typee, level=1):
+    __slots__ = ("nr", "type", "ships", "level", "time_budget", "workers", "max_nodes")
+
+    def __init__(self, nr, typee, level=1, time_budget=1.0, workers=1, max_nodes=20000):
+        """
+        :param nr: number of the user
+        :param typee: type of the user, e.g., local, computer
+        :param level: difficulty level (name from LEVELS or its number)
+        :param time_budget: seconds AI may think about one move (used by "Monte Carlo" and "Expectimax" levels),
+                            None for no limit: moves are limited by max_nodes only and do not depend on timing
+        :param workers: processes AI may use at once (used by "Monte Carlo" level)
+        :param max_nodes: states AI may evaluate for one move (states of "Expectimax", sampled layouts
+                          of "Monte Carlo" level)
+        """
         self.nr = nr
         self.type = typee
-        self.ships = []
+        self.ships = ShipRegistry()
+        self.time_budget = time_budget
+        self.workers = workers
+        self.max_nodes = max_nodes
         self.level = 1
-        if level == "Medium":
-            self.level = 2
-        elif level == "Nightmare!":
-            self.level = 3
+        if level in LEVELS:
+            self.level = LEVELS[level]
+        elif level in LEVELS.values():
+            self.level = level
 
     def get_type(self):
         """Returns type of user e.g., local, computer"""
@@ -21,8 +41,24 @@ class User:
         """Returns difficulty level if any, e.g., vary easy, medium, nightmare! ;)"""
         return self.level
 
+    def get_time_budget(self):
+        """Returns seconds AI of this user may think about one move"""
+        return self.time_budget
+
+    def get_workers(self):
+        """Returns amount of processes AI of this user may use"""
+        return self.workers
+
+    def get_max_nodes(self):
+        """Returns amount of states AI of this user may evaluate for one move"""
+        return self.max_nodes
+
     def get_ships(self):
         """Returns all understroyed ships of this user"""
+        return self.ships.get_ships()
+
+    def get_registry(self):
+        """Returns registry of ships of this user, which emits "ship sunk" and "fleet destroyed" events"""
         return self.ships
 
     def get_amount_of_ships(self):
@@ -31,8 +67,8 @@ class User:
 
     def remove_ship(self, ship):
         """Removes specific ship form collection"""
-        self.ships.remove(ship)
+        self.ships.sink(ship)
 
     def add_ship(self, ship):
         """Adds ship to collection"""
-        self.ships.append(ship)
\ No newline at end of file
+        self.ships.register(ship)
\ No newline at end of file
@@ -0,0 +1,79 @@
+"""
+Zobrist hashing of observable state of a board
+
+Every field has random 64-bit keys: for a miss, for a hit and for a field of a sunk ship.
+Hash of a state is XOR of keys of all fields fired at, so a shot changes it with one XOR and
+a sinking ship with two XORs per its field. The fourth key of a field (SHIP) describes layout
+of ships, which the opponent does not see. Keys are drawn from a fixed seed, so hashes are the
+same in every process (e.g. tournament workers).
+"""
+
+import random
+from array import array
+
+MISS = 0
+HIT = 1
+SUNK = 2
+SHIP = 3
+
+_tables = {}
+
+
+def zobrist_keys(width, length):
+    """
+    Returns keys of board of given size
+
+    :param width: board width
+    :param length: board length
+    :return: tuple of four arrays (MISS, HIT, SUNK, SHIP) of keys indexed by y * width + x
+    """
+    size = (width, length)
+    if size not in _tables:
+        rng = random.Random("zobrist %d %d" % size)
+        _tables[size] = tuple(array('Q', [rng.getrandbits(64) for _ in range(width * length)]) for _ in range(4))
+    return _tables[size]
+
+
+def zobrist_hash(width, length, shot_mask, hit_mask, sunk_mask):
+    """
+    Computes hash of a state from scratch
+
+    :param width: board width
+    :param length: board length
+    :param shot_mask: bitmask of fields fired at
+    :param hit_mask: bitmask of fields fired at that contained a ship
+    :param sunk_mask: bitmask of fields of sunk ships
+    :return: 64-bit hash
+    """
+    keys = zobrist_keys(width, length)
+    value = 0
+    while shot_mask:
+        low = shot_mask & -shot_mask
+        cell = low.bit_length() - 1
+        if sunk_mask & low:
+            value ^= keys[SUNK][cell]
+        elif hit_mask & low:
+            value ^= keys[HIT][cell]
+        else:
+            value ^= keys[MISS][cell]
+        shot_mask ^= low
+    return value
+
+
+def sink_ship(value, keys, ship_mask):
+    """
+    Updates hash after a ship sank: its fields change from hits to fields of a sunk ship
+
+    :param value: hash with every field of the ship marked as hit
+    :param keys: keys returned by `zobrist_keys`
+    :param ship_mask: bitmask of fields of the ship
+    :return: new hash
+    """
+    hit_keys = keys[HIT]
+    sunk_keys = keys[SUNK]
+    while ship_mask:
+        low = ship_mask & -ship_mask
+        cell = low.bit_length() - 1
+        value ^= hit_keys[cell] ^ sunk_keys[cell]
+        ship_mask ^= low
+    return value
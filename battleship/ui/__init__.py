@@ -0,0 +1,22 @@
+"""
+User interface of the battleship game (PySide widgets)
+
+Widgets are loaded when they are first used, importing the package alone does not load Qt.
+"""
+
+WIDGETS = {
+    "DialogWindow": "battleship.ui.dialog_window",
+    "GameWindow": "battleship.ui.game_window",
+    "GameBoard": "battleship.ui.game_board",
+    "EndScores": "battleship.ui.end_scores",
+    "MyTableModel": "battleship.ui.my_table_model",
+    "NetworkClient": "battleship.ui.network_client",
+    "AiWorker": "battleship.ui.ai_worker",
+}
+
+
+def __getattr__(name):
+    if name in WIDGETS:
+        import importlib
+        return getattr(importlib.import_module(WIDGETS[name]), name)
+    raise AttributeError("module %r has no attribute %r" % (__name__, name))
@@ -0,0 +1,94 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from PySide import QtCore
+
+from battleship.classes.ai_task import AiTask, AiCancelled
+
+
+class AiWorker(QtCore.QObject):
+    """
+    Runs AI computations in a worker thread and posts their results back to the GUI thread
+
+    Results travel through a Qt signal, so callbacks are called in the thread this object lives in.
+    """
+
+    finished = QtCore.Signal(object, object, object)
+
+    def __init__(self, parent=None):
+        super(AiWorker, self).__init__(parent)
+        self.executor = ThreadPoolExecutor(max_workers=1)
+        self.pending = {}
+        self.finished.connect(self._finished)
+
+    def submit(self, function, callback, budget=None, fallback=None, abandon=None, error=None):
+        """
+        Starts computation
+
+        :param function: function(task) returning the result, called in the worker thread
+        :param callback: function(result) called in the GUI thread
+        :param budget: seconds the computation may take, None for no limit
+        :param fallback: function() returning cheap result used when the deadline passes
+                         (called in the GUI thread), without it the result is just awaited
+        :param abandon: function() called in the GUI thread before the fallback if the computation
+                        is still running at the deadline; objects it uses must not be touched
+                        anymore
+        :param error: function(exception) called in the GUI thread if the computation raised
+        :return: `AiTask`
+        """
+        task = AiTask(budget)
+        self.pending[task] = (callback, fallback, abandon, error)
+        self.executor.submit(self._run, task, function)
+        if budget is not None and fallback is not None:
+            QtCore.QTimer.singleShot(int(budget * 1000), lambda: self._deadline(task))
+        return task
+
+    def _run(self, task, function):
+        """Runs in the worker thread"""
+        try:
+            result = function(task)
+        except AiCancelled:
+            return
+        except Exception as e:
+            self.finished.emit(task, None, e)
+            return
+        finally:
+            task.stop()
+        self.finished.emit(task, result, None)
+
+    def _finished(self, task, result, error):
+        """Runs in the GUI thread after the computation finished"""
+        entry = self.pending.pop(task, None)
+        if entry is None or task.is_cancelled():
+            return
+        if error is not None:
+            if entry[3] is None:
+                raise error
+            entry[3](error)
+            return
+        entry[0](result)
+
+    def _deadline(self, task):
+        """
+        Runs in the GUI thread when the deadline passes, uses fallback if there is no result yet
+
+        The GUI thread does not wait for the computation: it is cancelled and, if it still runs,
+        abandoned, so that the fallback never works on the same objects at once.
+        """
+        entry = self.pending.pop(task, None)
+        if entry is None:
+            return
+        task.cancel()
+        if not task.wait_stopped(0) and entry[2] is not None:
+            entry[2]()
+        entry[0](entry[1]())
+
+    def cancel_all(self):
+        """Cancels every computation, their results will be ignored"""
+        for task in self.pending:
+            task.cancel()
+        self.pending = {}
+
+    def shutdown(self):
+        """Cancels computations and stops the worker thread"""
+        self.cancel_all()
+        self.executor.shutdown(wait=False)
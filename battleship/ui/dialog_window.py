@@ -0,0 +1,228 @@
+import os
+
+from PySide import QtGui
+from PySide.QtCore import QSize
+from PySide.QtGui import QWidget, QLabel, QDoubleSpinBox, QSpinBox, QImage, QPixmap, QTableView
+
+from battleship.classes.user import User
+from battleship.classes.board import Board
+from battleship.classes.remote_board import RemoteBoard
+from battleship.classes.network_engine import NetworkEngine
+from battleship.classes.fleet_placer import FleetPlacer
+from battleship.ui.network_client import NetworkClient
+from battleship.ui.game_board import GameBoard
+from battleship.ui.game_window import GameWindow
+from battleship.ui.my_table_model import MyTableModel
+
+
+class DialogWindow(QWidget):
+    """
+    Initial window that collect necessary data from the user
+    """
+
+    # seconds the fleet check may take after every change of settings
+    CHECK_SECONDS = 0.05
+
+    def __init__(self):
+        super(DialogWindow, self).__init__()
+        self.combo = QtGui.QComboBox()
+        self.length_input = QDoubleSpinBox()
+        self.time_budget_input = QDoubleSpinBox()
+        self.max_nodes_input = QSpinBox()
+        self.width_input = QDoubleSpinBox()
+        self.computer = QtGui.QPushButton("Play with computer")
+        self.network = QtGui.QPushButton("Play with human over network")
+        self.server_input = QtGui.QLineEdit("localhost:5000")
+        self.fleet_label = QLabel()
+        self.ships_l = [(5, 1), (4, 1), (3, 1)]
+        self.ships_d = {5: 1, 4: 1, 3: 1}
+        self.u1 = None
+        self.u2 = None
+        self.b1 = None
+        self.b2 = None
+        self.g = None
+        self.gw = None
+        self.engine = None
+        self.client = None
+        self.init_ui()
+
+    def init_ui(self):
+        """
+        Initialize the user interface
+        """
+        label = QtGui.QLabel("Choose game type:")
+        self.computer.clicked.connect(self.play_with_computer)
+
+        label_level = QtGui.QLabel("Choose difficulty level")
+
+        comp_hbox = QtGui.QHBoxLayout()
+        comp_hbox.addWidget(self.computer)
+        comp_hbox.addWidget(label_level)
+        self.combo.addItem("Very easy")
+        self.combo.addItem("Medium")
+        self.combo.addItem("Hard")
+        self.combo.addItem("Nightmare!")
+        self.combo.addItem("Monte Carlo")
+        self.combo.addItem("Expectimax")
+        comp_hbox.addWidget(self.combo)
+        # strength of "Monte Carlo" and "Expectimax" levels depends on the time it may think about a move
+        comp_hbox.addWidget(QLabel("Seconds per move:"))
+        self.time_budget_input.setMinimum(0.1)
+        self.time_budget_input.setMaximum(60)
+        self.time_budget_input.setSingleStep(0.5)
+        self.time_budget_input.setValue(1)
+        comp_hbox.addWidget(self.time_budget_input)
+        # and of "Expectimax" also on the amount of states it may evaluate
+        comp_hbox.addWidget(QLabel("States per move:"))
+        self.max_nodes_input.setMinimum(100)
+        self.max_nodes_input.setMaximum(1000000)
+        self.max_nodes_input.setSingleStep(5000)
+        self.max_nodes_input.setValue(20000)
+        comp_hbox.addWidget(self.max_nodes_input)
+
+        self.network.clicked.connect(self.play_over_network)
+        network_hbox = QtGui.QHBoxLayout()
+        network_hbox.addWidget(self.network)
+        network_hbox.addWidget(QtGui.QLabel("Server:"))
+        network_hbox.addWidget(self.server_input)
+        image = QImage()
+        image.load("./resources/image.jpg")
+        image_label = QLabel()
+        image_label.setPixmap(QPixmap.fromImage(image))
+        image_label.setFixedSize(QSize(640, 360))
+
+        hbox = QtGui.QHBoxLayout()
+        hbox.addStretch(1)
+        hbox.addWidget(label)
+        hbox.addStretch(1)
+
+        h_conf_length = QtGui.QHBoxLayout()
+        length_label = QtGui.QLabel("Set board length: ")
+        h_conf_length.addWidget(length_label)
+        self.length_input.setMaximum(500)
+        self.length_input.setMinimum(5)
+        self.length_input.setDecimals(0)
+        self.length_input.valueChanged.connect(self.check_fleet)
+        h_conf_length.addWidget(self.length_input)
+
+        width_label = QLabel("Set board width: ")
+        h_conf_length.addWidget(width_label)
+        self.width_input.setMaximum(500)
+        self.width_input.setMinimum(5)
+        self.width_input.setDecimals(0)
+        self.width_input.valueChanged.connect(self.check_fleet)
+        h_conf_length.addWidget(self.width_input)
+
+        header = ['Ship length', 'Amount of ships']
+        table_model = MyTableModel(self, self.ships_l, header)
+        table_model.dataChanged.connect(self.check_fleet)
+        table_model.layoutChanged.connect(self.check_fleet)
+        table_view = QTableView()
+        table_view.setModel(table_model)
+        table_view.resizeColumnsToContents()
+        table_view.setSortingEnabled(True)
+        table_view.setColumnWidth(0, table_view.width() / 2 - 5)
+        table_view.setColumnWidth(1, table_view.width() / 2 - 5)
+        table_view.setFixedHeight(200)
+
+        vbox = QtGui.QVBoxLayout()
+        vbox.addWidget(image_label)
+        vbox.addLayout(hbox)
+        vbox.addLayout(comp_hbox)
+        vbox.addLayout(network_hbox)
+        vbox.addLayout(h_conf_length)
+        vbox.addWidget(table_view)
+        self.fleet_label.setWordWrap(True)
+        vbox.addWidget(self.fleet_label)
+        self.check_fleet()
+
+        self.setLayout(vbox)
+
+        self.setWindowTitle("Choose gametype")
+        self.setFixedSize(self.minimumSize())
+        self.resize(self.minimumSize())
+
+    def check_fleet(self, *args):
+        """
+        Checks whether the fleet fits on the board of chosen size, runs after every change of settings
+
+        It runs in the GUI thread, so the search is limited to CHECK_SECONDS.
+        """
+        placer = FleetPlacer(int(self.width_input.value()), int(self.length_input.value()))
+        fits, layout = placer.check_fleet(self.ships_l, max_nodes=5000, seconds=self.CHECK_SECONDS)
+        if fits is None:
+            self.fleet_label.setText("Cannot tell quickly whether the fleet fits on the board")
+        elif fits:
+            sample = ", ".join("%d at (%d, %d) %s" % ship for ship in layout)
+            self.fleet_label.setText("Fleet fits on the board, e.g.: %s" % sample)
+        else:
+            self.fleet_label.setText("Fleet does not fit on the board")
+        self.computer.setEnabled(fits is not False)
+        self.network.setEnabled(fits is not False and self.client is None)
+
+    def play_with_computer(self):
+        """
+        Performs after "play with computer" button is pressed, sets up necessary settings
+
+        :return:
+        """
+        self.u1 = User(1, "local")
+        self.u2 = User(2, "computer", self.combo.currentText(), self.time_budget_input.value(),
+                       max(1, (os.cpu_count() or 1) - 1), self.max_nodes_input.value())
+        self.b1 = Board(self.u1, int(self.length_input.value()), int(self.width_input.value()))
+        self.b2 = Board(self.u2, int(self.length_input.value()), int(self.width_input.value()))
+        self.g = GameBoard(self.b1, self.b2, self.ships_l, self)
+
+        self.gw = GameWindow(self.g)
+        self.g.set_game_window(self.gw)
+        self.gw.show()
+        self.close()
+
+    def play_over_network(self):
+        """
+        Performs after "play with human over network" button is pressed, connects to the server
+        and waits there for an opponent who chose the same board and fleet
+        """
+        (host, _, port) = self.server_input.text().strip().rpartition(":")
+        if not host or not port.isdigit():
+            self.fleet_label.setText("Server address should look like host:port")
+            return
+        self.u1 = User(1, "local")
+        self.u2 = User(2, "network")
+        self.b1 = Board(self.u1, int(self.length_input.value()), int(self.width_input.value()))
+        self.b2 = RemoteBoard(self.u2, int(self.length_input.value()), int(self.width_input.value()))
+        self.engine = NetworkEngine(self.b1, self.b2, self.ships_l)
+        self.engine.set_listener(self.network_event)
+        self.network.setEnabled(False)
+        self.fleet_label.setText("Connecting to %s..." % self.server_input.text())
+        self.client = NetworkClient(self.engine, host, int(port), self)
+
+    def network_event(self, event, *arguments):
+        """
+        Reacts to events of the network game until the opponent is found
+
+        :param event: name of the event
+        :param arguments: arguments of the event
+        """
+        if event == "waiting":
+            self.fleet_label.setText("Waiting for an opponent...")
+        elif event == "matched":
+            self.g = GameBoard(self.b1, self.b2, self.ships_l, self, engine=self.engine)
+            self.engine.set_listener(self.g.network_event)
+            self.gw = GameWindow(self.g)
+            self.g.set_game_window(self.gw)
+            self.gw.show()
+            self.close()
+        elif event == "disconnected":
+            self.fleet_label.setText("Connection failed: %s" % arguments[0])
+            self.client = None
+            self.check_fleet()
+
+    def center(self):
+        """
+        Should center the widget on the screen
+        """
+        qr = self.frameGeometry()
+        cp = QtGui.QDesktopWidget().availableGeometry().center()
+        qr.moveCenter(cp)
+        self.move(qr.topLeft())
\ No newline at end of file
@@ -1,4 +1,5 @@
-from battleship.classes.dialog_window import DialogWindow
+from PySide import QtGui
+from PySide.QtGui import QWidget, QPushButton
 
 
 class EndScores(QWidget):
@@ -69,6 +70,9 @@ class EndScores(QWidget):
         """
         Performs after reset button is pressed
         """
+        # imported here, dialog window imports this module (through game board)
+        from battleship.ui.dialog_window import DialogWindow
+
         self.d = DialogWindow()
         self.d.show()
         self.close()
\ No newline at end of file
@@ -0,0 +1,502 @@
+import math
+import os
+from collections import OrderedDict
+
+from PySide import QtGui
+from PySide.QtCore import Qt, QRect, QSize
+from PySide.QtGui import QBrush, QPainter, QPixmap
+
+from battleship.classes.game_engine import GameEngine
+from battleship.classes.game_record import GameRecord
+from battleship.ui.ai_worker import AiWorker
+from battleship.ui.end_scores import EndScores
+
+
+class GameBoard(QtGui.QWidget):
+    """
+    Widget on which game board is being drawn
+
+    Boards are cached in square pixmap tiles of at most TILE_PIXELS pixels (as many
+    whole squares as fit), only tiles visible in the repainted area are drawn (and
+    rendered if they are not cached yet). The cache is least recently used first:
+    it keeps about twice the tiles of the visible part of the widget with a ring
+    of tiles around it, so its memory depends on the window, not on the zoom;
+    tiles scrolled far away are dropped.
+    """
+
+    TILE_PIXELS = 256
+    MIN_SQUARE_SIZE = 4
+    MAX_SQUARE_SIZE = 100
+    # seconds AI may think about a shot beyond its own time budget, then a random one is fired
+    AI_DEADLINE = 5.0
+    # games against computer are appended to this file when they are left, see `GameRecord`
+    RECORDS = os.path.join(os.path.expanduser("~"), ".battleship_games.bsg")
+
+    def __init__(self, board1, board2, list_of_ships, dialog_window, parent=None, engine=None):
+        super(GameBoard, self).__init__()
+
+        self.parent = parent
+        # engine of a network game (`NetworkEngine`) is created by the dialog window
+        self.engine = engine if engine is not None else GameEngine(board1, board2, list_of_ships)
+        self.b1 = self.engine.b1
+        self.b2 = self.engine.b2
+        self.dialog_window = dialog_window
+        self.placement_vertical_orientation = True
+        self.last_board_x_square = -1
+        self.last_board_y_square = -1
+        self.last_board = -1
+
+        self.es = None
+        self.game_window = None
+        self.ai_worker = AiWorker(self)
+        self.recorded = False
+
+        self.square_size = 50
+        self.division_height = 20
+        # static pictures of both boards: (board, tile x, tile y) -> QPixmap, least recently
+        # drawn first, repainted square by square after fire/place_ship
+        self.tiles = OrderedDict()
+        self.water_brush = QBrush(Qt.blue)
+        self.ship_brush = QBrush(Qt.black)
+        self.red_brush = QBrush(Qt.red)
+        self.division_brush = QBrush(Qt.darkGray)
+
+        # big boards start zoomed out, so that as much as possible fits on the screen
+        screen_height = QtGui.QDesktopWidget().availableGeometry().height()
+        self.set_square_size(min(50, screen_height // (self.b1.get_length() + self.b2.get_length() + 2)))
+        self.resize(self.sizeHint())
+        self.setWindowTitle("Battleship game")
+        qr = self.frameGeometry()
+        cp = QtGui.QDesktopWidget().availableGeometry().center()
+        qr.moveCenter(cp)
+        self.move(qr.topLeft())
+        self.setMouseTracking(True)
+
+    def set_game_window(self, game_window):
+        """Sets reference to game window, it is necessary further"""
+        self.game_window = game_window
+
+    def get_game_window(self):
+        """Returns reference to game window"""
+        return self.game_window
+
+    def _coordinates_from_position(self, x, y):
+        """
+        Useful function that transforms mouse x and y position
+        into specific square coordinates
+
+        :param x: mouse x position
+        :param y: mouse y position
+        """
+        size = self.square_size
+        if y > size * self.b2.get_length() + self.division_height:
+            board = 1
+            ry = math.floor((y - size * self.b2.get_length() - self.division_height) / size)
+        else:
+            board = 2
+            ry = math.floor(y / size)
+
+        return math.floor(x / size), ry, board
+
+    def square_pos_changed(self, old_rect=None):
+        """
+        Function fires if mouse hovers different square than previously,
+        repaints only squares covered by the old and the new hover preview
+
+        :param old_rect: area of the previous hover preview
+        """
+        for rect in (old_rect, self._hover_rect()):
+            if rect is not None:
+                self.update(rect)
+
+    def mouseMoveEvent(self, event):
+        act_x, act_y, act_board = self._coordinates_from_position(event.x(), event.y())
+        if act_x != self.last_board_x_square or act_y != self.last_board_y_square \
+                or act_board != self.last_board:
+            if 0 <= act_x < self.b1.get_width() and 0 <= act_y < self.b1.get_length():
+                old_rect = self._hover_rect()
+                self.last_board_x_square = act_x
+                self.last_board_y_square = act_y
+                self.last_board = act_board
+                self.square_pos_changed(old_rect)
+
+    def mouseReleaseEvent(self, event):
+        if self.engine.placement:
+            if event.button() == Qt.MouseButton.LeftButton:
+                length = self.engine.ships_to_place_u1[0][0]
+                orientation = "vertical" if self.placement_vertical_orientation else "horizontal"
+                old_rect = self._hover_rect()
+                if self.last_board == 1 and \
+                        self.engine.place_user_ship(self.last_board_x_square, self.last_board_y_square, orientation,
+                                                    place_ai_ships=False):
+                    for i in range(length):
+                        if orientation == "vertical":
+                            self.refresh_square(1, self.last_board_x_square, self.last_board_y_square - i)
+                        else:
+                            self.refresh_square(1, self.last_board_x_square + i, self.last_board_y_square)
+                    self.square_pos_changed(old_rect)
+                    if not self.engine.placement:
+                        self.start_ai_placement()
+            elif event.button() == Qt.MouseButton.RightButton:
+                old_rect = self._hover_rect()
+                self.placement_vertical_orientation = not self.placement_vertical_orientation
+                self.square_pos_changed(old_rect)
+            else:
+                raise Exception("unknown button")
+        elif self.last_board == 2 and self.engine.user_fire(self.last_board_x_square, self.last_board_y_square):
+            self.refresh_square(2, *self.engine.last_shots[1])
+            if self.engine.game_over:
+                self.show_scores(*self.engine.calculate_scores())
+            elif isinstance(self.engine, GameEngine):
+                self.start_ai_turn()
+        else:
+            # it's not your turn
+            pass
+
+    def start_ai_placement(self):
+        """Lets AI place its ships in the worker thread, the game starts when they are placed"""
+        self.game_window.set_status_text("Computer is placing its ships...")
+        rng = self.engine.fork_random()
+        self.ai_worker.submit(lambda task: self.engine.ai_layout(2, task, rng), self.ai_ships_ready,
+                              error=lambda error: self.ai_failed("Computer could not place its ships", error))
+
+    def ai_ships_ready(self, layout):
+        """Called in the GUI thread with layout of AI's ships"""
+        self.engine.apply_ai_layout(2, layout)
+        self.clear_tiles()
+        self.game_window.set_status_text("""Choose field on enemy's board and fire!""")
+
+    def start_ai_turn(self):
+        """
+        Lets AI select its shot in the worker thread, the window stays responsive meanwhile
+
+        If AI does not decide within its time budget plus AI_DEADLINE, a random field is fired at instead
+        and AI whose computation is still running is replaced by a new one. If AI fails, the error
+        is shown and a random field is fired at too. AI is created here and draws from a fork of the
+        random generator, the worker thread does not change the engine.
+        """
+        deadline = self.AI_DEADLINE + self.b2.get_user().get_time_budget()
+        self.engine.prepare_ai(2)
+        rng = self.engine.fork_random()
+        self.ai_worker.submit(lambda task: self.engine.select_field(2, task, rng), self.ai_shot_ready,
+                              deadline, lambda: self.engine.easy_select_field(self.b1),
+                              lambda: self.engine.drop_ai(2), self.ai_shot_failed)
+
+    def ai_failed(self, text, error):
+        """Shows error raised by AI computation in the status bar"""
+        self.game_window.set_status_text("%s: %s" % (text, error))
+
+    def ai_shot_failed(self, error):
+        """Called in the GUI thread if AI failed to select its shot, a random field is fired at"""
+        self.engine.drop_ai(2)
+        self.ai_shot_ready(self.engine.easy_select_field(self.b1))
+        if not self.engine.game_over:
+            self.ai_failed("Computer's move failed, it fired at random", error)
+
+    def ai_shot_ready(self, field):
+        """Called in the GUI thread with field selected by AI"""
+        self.engine.apply_ai_shot(2, field)
+        if 2 in self.engine.last_shots:
+            self.refresh_square(1, *self.engine.last_shots[2])
+        self.square_pos_changed()
+        if self.engine.game_over:
+            self.show_scores(*self.engine.calculate_scores())
+
+    def network_event(self, event, *arguments):
+        """
+        Reacts to events of `NetworkEngine`: moves confirmed by the server and moves of the opponent
+
+        :param event: name of the event
+        :param arguments: arguments of the event
+        """
+        if event == "square":
+            self.refresh_square(*arguments)
+            if arguments[0] == 1 and not self.engine.ships_to_place_u1 and not self.engine.real_game:
+                self.game_window.set_status_text("Waiting for the opponent's fleet")
+        elif event == "battle":
+            self.clear_tiles()
+            self.game_window.set_status_text("Choose field on enemy's board and fire!" if self.engine.user_turn
+                                             else "Opponent fires first")
+        elif event == "shot":
+            (own, result) = arguments
+            text = ["Miss", "Hit", "Hit and sunk"][result]
+            if own:
+                self.game_window.set_status_text("%s! Opponent's turn" % text)
+            else:
+                self.game_window.set_status_text("Opponent: %s. Your turn, fire!" % text.lower())
+            self.square_pos_changed()
+        elif event == "rejected":
+            self.game_window.set_status_text("Move rejected by the server: %s" % arguments[0])
+        elif event == "over":
+            self.show_scores(*self.engine.calculate_scores())
+        elif event == "left":
+            self.game_window.set_status_text("Opponent left the game")
+        elif event == "disconnected":
+            self.game_window.set_status_text("Connection lost: %s" % arguments[0])
+
+    def wheelEvent(self, event):
+        """
+        Ctrl + mouse wheel zooms the boards in and out
+        """
+        if event.modifiers() & Qt.ControlModifier:
+            factor = 1.25 if event.delta() > 0 else 0.8
+            self.set_square_size(int(round(self.square_size * factor)))
+            event.accept()
+        else:
+            event.ignore()
+
+    def set_square_size(self, size):
+        """
+        Changes zoom of the boards
+
+        :param size: new size of a square in pixels
+        """
+        size = max(self.MIN_SQUARE_SIZE, min(self.MAX_SQUARE_SIZE, size))
+        if size != self.square_size:
+            self.square_size = size
+            self.division_height = max(4, size * 2 // 5)
+            self.clear_tiles()
+            self.resize(self.sizeHint())
+
+    def show_scores(self, s_u1, s_u2):
+        """
+        Shows Widget to present scores at the end of the game
+
+        :param s_u1: User 1 points
+        :param s_u2: User 2 points
+        :return:
+        """
+        self.shutdown()
+        self.es = EndScores(s_u1, s_u2)
+        self.es.show()
+        self.game_window.close()
+
+    def shutdown(self):
+        """
+        Stops AI computations and worker processes of AIs and records the game, or closes the connection
+        of a network game; called when the game is left
+        """
+        self.ai_worker.shutdown()
+        self.engine.close()
+        if isinstance(self.engine, GameEngine):
+            self.save_record()
+
+    def save_record(self):
+        """
+        Appends record of the game against computer to RECORDS, once; games left before the battle
+        started are not recorded, unfinished ones are recorded without a winner
+        """
+        if self.recorded or not self.engine.real_game:
+            return
+        self.recorded = True
+        try:
+            GameRecord.from_engine(self.engine).save(self.RECORDS, append=True)
+        except OSError as error:
+            self.game_window.set_status_text("Game could not be saved: %s" % error.strerror)
+
+    def size(self):
+        return self.sizeHint()
+
+    def sizeHint(self):
+        return QSize(self.square_size * self.b1.get_width(),
+                     self.square_size * (self.b1.get_length() + self.b2.get_length()) + self.division_height)
+
+    def _board_top(self, board):
+        """Returns y position of the top edge of given board on this widget"""
+        return 0 if board == 2 else self.square_size * self.b2.get_length() + self.division_height
+
+    def _paint_square(self, painter, board, x, y, left=0, top=0):
+        """
+        Paints single square of given board
+
+        :param painter: painter working on the tile
+        :param board: board number
+        :param x: square x coordinate
+        :param y: square y coordinate
+        :param left: x position of the tile on the board
+        :param top: y position of the tile on the board
+        """
+        b = self.b1 if board == 1 else self.b2
+        size = self.square_size
+        px = size * x - left
+        py = size * y - top
+        if b.has_ship_on(x, y) and (board == 1 or not b.can_fire(x, y)):
+            painter.fillRect(QRect(px, py, size, size), self.ship_brush)
+        else:
+            painter.fillRect(QRect(px, py, size, size), self.water_brush)
+        if not b.can_fire(x, y):
+            margin = size // 5
+            painter.fillRect(QRect(px + margin, py + margin, size - 2 * margin, size - 2 * margin),
+                             self.red_brush)
+        painter.drawLine(px, py, px + size, py)
+        painter.drawLine(px, py, px, py + size)
+
+    def _render_tile(self, board, tx, ty):
+        """
+        Paints one tile of given board onto a new pixmap
+
+        :param board: board number
+        :param tx: tile x coordinate
+        :param ty: tile y coordinate
+        :return: `QPixmap`
+        """
+        b = self.b1 if board == 1 else self.b2
+        squares = self._tile_squares()
+        span = squares * self.square_size
+        tile = QPixmap(span, span)
+        tile.fill(Qt.transparent)
+        painter = QPainter()
+        painter.begin(tile)
+        for x in range(tx * squares, min((tx + 1) * squares, b.get_width())):
+            for y in range(ty * squares, min((ty + 1) * squares, b.get_length())):
+                self._paint_square(painter, board, x, y, tx * span, ty * span)
+        painter.end()
+        return tile
+
+    def clear_tiles(self):
+        """Drops all cached tiles and repaints the widget"""
+        self.tiles = OrderedDict()
+        self.update()
+
+    def _tile_squares(self):
+        """Returns amount of squares along the side of a tile at the current zoom"""
+        return max(1, self.TILE_PIXELS // self.square_size)
+
+    def _tile_limit(self):
+        """Returns amount of tiles kept in the cache: twice the tiles of the visible area and a ring around it"""
+        span = self._tile_squares() * self.square_size
+        visible = self.visibleRegion().boundingRect()
+        return 2 * (visible.width() // span + 2) * (visible.height() // span + 2)
+
+    def refresh_square(self, board, x, y):
+        """
+        Repaints single square in the cached tile and schedules repainting of it on the screen
+
+        :param board: board number
+        :param x: square x coordinate
+        :param y: square y coordinate
+        """
+        squares = self._tile_squares()
+        key = (board, x // squares, y // squares)
+        if key in self.tiles:
+            span = squares * self.square_size
+            painter = QPainter()
+            painter.begin(self.tiles[key])
+            self._paint_square(painter, board, x, y, key[1] * span, key[2] * span)
+            painter.end()
+        self.update(QRect(self.square_size * x, self._board_top(board) + self.square_size * y,
+                          self.square_size, self.square_size))
+
+    def _hover_rect(self):
+        """
+        Returns area covered by the hover preview or None if nothing is previewed
+        """
+        if self.last_board_x_square == -1 and self.last_board_y_square == -1:
+            return None
+        size = self.square_size
+        (x, y) = self.square_coordinates_to_position(self.last_board_x_square, self.last_board_y_square,
+                                                     self.last_board)
+        if len(self.engine.ships_to_place_u1) > 0 and self.last_board == 1:
+            length = self.engine.ships_to_place_u1[0][0]
+            if self.placement_vertical_orientation:
+                rows = min(length, self.last_board_y_square + 1)
+                return QRect(x, y - size * (rows - 1), size, size * rows)
+            columns = min(length, self.b1.get_width() - self.last_board_x_square)
+            return QRect(x, y, size * columns, size)
+        if self.engine.real_game and self.engine.user_turn and self.last_board == 2:
+            return QRect(x, y, size, size)
+        return None
+
+    def _paint_board(self, painter, board, area):
+        """
+        Draws tiles of given board that intersect with the repainted area
+
+        :param painter: painter working on this widget
+        :param board: board number
+        :param area: repainted area (`QRect` in widget coordinates)
+        """
+        b = self.b1 if board == 1 else self.b2
+        squares = self._tile_squares()
+        span = squares * self.square_size
+        top = self._board_top(board)
+        first_tx = max(0, area.left() // span)
+        last_tx = min((b.get_width() - 1) // squares, area.right() // span)
+        first_ty = max(0, (area.top() - top) // span)
+        last_ty = min((b.get_length() - 1) // squares, (area.bottom() - top) // span)
+        for tx in range(first_tx, last_tx + 1):
+            for ty in range(first_ty, last_ty + 1):
+                key = (board, tx, ty)
+                if key in self.tiles:
+                    self.tiles.move_to_end(key)
+                else:
+                    self.tiles[key] = self._render_tile(board, tx, ty)
+                painter.drawPixmap(tx * span, top + ty * span, self.tiles[key])
+        limit = self._tile_limit()
+        while len(self.tiles) > limit:
+            self.tiles.popitem(last=False)
+
+    def paintEvent(self, event):
+        """
+        Does the painting: copies visible cached tiles and draws the hover preview over them
+        """
+        size = self.square_size
+        area = event.rect()
+        painter = QPainter()
+        painter.begin(self)
+        painter.setClipRect(area)
+
+        self._paint_board(painter, 2, area)
+        painter.fillRect(QRect(0, size * self.b2.get_length(), size * self.b1.get_width(), self.division_height),
+                         self.division_brush)
+        self._paint_board(painter, 1, area)
+
+        if len(self.engine.ships_to_place_u1) > 0 and (self.last_board_y_square != -1 or self.last_board_x_square != -1) \
+                and self.last_board == 1:
+            # draw imaginary ship placement
+            length = self.engine.ships_to_place_u1[0][0]
+            ok_brush = QBrush(Qt.green)
+            incorrect_brush = QBrush(Qt.red)
+            fields_to_color = []
+
+            if self.b1.get_placement_map(length).is_legal(
+                    self.last_board_x_square, self.last_board_y_square,
+                    "vertical" if self.placement_vertical_orientation else "horizontal"):
+                brush = ok_brush
+            else:
+                brush = incorrect_brush
+            for i in range(length):
+                if self.placement_vertical_orientation:
+                    if self.last_board_y_square - i >= 0:
+                        fields_to_color.append((self.last_board_x_square, self.last_board_y_square - i))
+                else:
+                    if self.last_board_x_square + i < self.b1.get_width():
+                        fields_to_color.append((self.last_board_x_square + i, self.last_board_y_square))
+
+            for field in fields_to_color:
+                (x, y) = self.square_coordinates_to_position(field[0], field[1],
+                                                             self.last_board)
+                painter.fillRect(QRect(x, y, size, size), brush)
+        if self.engine.real_game and self.engine.user_turn and self.last_board == 2:
+            (x, y) = self.square_coordinates_to_position(self.last_board_x_square, self.last_board_y_square,
+                                                         self.last_board)
+            painter.fillRect(QRect(x, y, size, size), self.red_brush)
+
+        painter.end()
+
+    def square_coordinates_to_position(self, mx, my, board):
+        """
+        Calculates the bottom square of specific rectangle
+        over that mouse is currently located
+
+        :param mx: square x coordinate
+        :param my: square y coordinate
+        :param board: board number
+        :return: (x, y) - position of left bottom corner of this square
+        """
+        x = mx * self.square_size
+        if my >= self.b2.get_length():
+            my -= 1
+        y = my * self.square_size
+        if board == 1:
+            y += self._board_top(1)
+        return x, y
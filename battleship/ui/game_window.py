@@ -1,4 +1,6 @@
-from battleship.classes.dialog_window import DialogWindow
+from PySide import QtGui
+from PySide.QtCore import Qt, QSize
+from PySide.QtGui import QWidget, QLabel, QPushButton
 
 
 class GameWindow(QWidget):
@@ -30,9 +32,14 @@ left click - place"""
         hbox.addWidget(self.status_label)
         hbox.addStretch(1)
 
+        # big boards do not fit on the screen, scroll area shows only part of them
+        scroll_area = QtGui.QScrollArea()
+        scroll_area.setWidget(self.game)
+        scroll_area.setAlignment(Qt.AlignCenter)
+
         vbox = QtGui.QVBoxLayout()
         vbox.addLayout(hbox)
-        vbox.addWidget(self.game)
+        vbox.addWidget(scroll_area)
 
         hbox2 = QtGui.QHBoxLayout()
         hbox2.addStretch(1)
@@ -45,16 +52,25 @@ left click - place"""
 
         self.setLayout(vbox)
         self.setWindowTitle("Battleship game")
+        available = QtGui.QDesktopWidget().availableGeometry()
+        # room for the labels, buttons and scroll bars around the boards
+        self.resize((self.game.sizeHint() + QSize(40, 100)).boundedTo(available.size()))
         qr = self.frameGeometry()
-        cp = QtGui.QDesktopWidget().availableGeometry().center()
-        qr.moveCenter(cp)
+        qr.moveCenter(available.center())
         self.move(qr.topLeft())
-        self.setFixedSize(self.sizeHint())
-        self.resize(self.sizeHint())
+
+    def closeEvent(self, event):
+        """Window is closed (also by reset or at the end of the game), AI of the game is stopped"""
+        self.game.shutdown()
+        event.accept()
 
     def reset(self):
         """Play once again with new settings"""
 
+        # imported here, dialog window imports this module
+        from battleship.ui.dialog_window import DialogWindow
+
+        self.game.shutdown()
         self.dialogWindow = DialogWindow()
         self.dialogWindow.show()
         self.close()
\ No newline at end of file
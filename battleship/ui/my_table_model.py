@@ -1,6 +1,6 @@
-from PySide.QtGui import QAbstractTableModel
-from PySide.QtCore import Signal
-from PySide import Qt
+import operator
+
+from PySide.QtCore import QAbstractTableModel, Qt, SIGNAL
 
 
 class MyTableModel(QAbstractTableModel):
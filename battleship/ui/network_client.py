@@ -0,0 +1,51 @@
+from PySide import QtCore, QtNetwork
+
+from battleship.classes.net_protocol import FrameDecoder
+
+
+class NetworkClient(QtCore.QObject):
+    """
+    Connects `NetworkEngine` to the game server through `QTcpSocket`
+
+    Socket works inside the Qt event loop, so the user interface is never blocked by the network.
+    """
+
+    def __init__(self, engine, host, port, parent=None):
+        super(NetworkClient, self).__init__(parent)
+        self.engine = engine
+        self.decoder = FrameDecoder()
+        self.socket = QtNetwork.QTcpSocket(self)
+        self.socket.connected.connect(self.engine.join)
+        self.socket.readyRead.connect(self.read)
+        self.socket.error.connect(self.failed)
+        self.socket.disconnected.connect(self.disconnected)
+        self.engine.set_sender(self.send)
+        self.engine.set_closer(self.close)
+        self.socket.connectToHost(host, port)
+
+    def send(self, frame):
+        """Sends frame to the server"""
+        self.socket.write(QtCore.QByteArray(frame))
+
+    def read(self):
+        """Passes received messages to the engine"""
+        try:
+            messages = self.decoder.feed(self.socket.readAll().data())
+        except Exception:
+            self.socket.abort()
+            self.engine.connection_lost("server sent malformed data")
+            return
+        for message in messages:
+            self.engine.handle(message)
+
+    def failed(self, error):
+        """Called when connection cannot be made or breaks"""
+        self.engine.connection_lost(self.socket.errorString())
+
+    def disconnected(self):
+        """Called when server closes connection"""
+        self.engine.connection_lost("server closed connection")
+
+    def close(self):
+        """Closes connection"""
+        self.socket.disconnectFromHost()
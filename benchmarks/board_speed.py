@@ -0,0 +1,138 @@
+"""
+Speed benchmark: operations of `Board` (grid of `Field` objects) against `BitBoard` (byte arrays and bitmasks)
+
+For every board size it measures building an empty board, the queries used by the AIs and the
+placement (`can_fire`, `has_ship_on`, `can_be_placed`, `has_ship_fields_left`), firing at every
+field, taking `BoardSnapshot` of a half fired board (bitmasks of shots and hits, used by lookahead
+AI) and whole AI-vs-AI games, and prints microseconds per operation with the speedup of `BitBoard`.
+
+Run from the repository root: python benchmarks/board_speed.py [board sizes, 10,100 by default]
+"""
+import os
+import random
+import sys
+from time import perf_counter
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from battleship.classes.bit_board import BitBoard
+from battleship.classes.board import Board
+from battleship.classes.board_snapshot import BoardSnapshot
+from battleship.classes.game_engine import GameEngine
+from battleship.classes.user import User
+
+FLEET = [(5, 1), (4, 1), (3, 2), (2, 1)]
+
+
+def timed(function, repeat=3):
+    """Returns the best of `repeat` times (in seconds) of calling function"""
+    best = None
+    for _ in range(repeat):
+        start = perf_counter()
+        function()
+        elapsed = perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def fleet_for(size):
+    """Returns fleet covering about a fifth of the board"""
+    ships = max(1, size * size // 5 // 17)
+    return [(length, amount * ships) for (length, amount) in FLEET]
+
+
+def placed_board(board_class, size, seed=0):
+    """Returns board of given class with a fleet placed on it"""
+    u1 = User(1, "computer", 1)
+    u2 = User(2, "computer", 1)
+    engine = GameEngine(board_class(u1, size, size), board_class(u2, size, size), fleet_for(size), seed=seed)
+    engine.ai_place_ships(2)
+    return engine.b2
+
+
+def play(board_class, size, seed):
+    """Plays whole game of the nightmare level against the random one, returns amount of shots"""
+    u1 = User(1, "computer", 1)
+    u2 = User(2, "computer", 3)
+    engine = GameEngine(board_class(u1, size, size), board_class(u2, size, size), fleet_for(size), seed=seed)
+    engine.ai_place_ships(1)
+    engine.ai_place_ships(2)
+    player = 1
+    while not engine.game_over:
+        engine.ai_turn(player)
+        player = 3 - player
+    return engine.b1.get_total_hit() + engine.b2.get_total_hit()
+
+
+def measure(board_class, size):
+    """
+    Measures operations on boards of given class and size
+
+    :return: dict of operation name -> microseconds per operation
+    """
+    cells = size * size
+    fields = [(x, y) for y in range(size) for x in range(size)]
+    rng = random.Random(1)
+    rng.shuffle(fields)
+    board = placed_board(board_class, size)
+    results = {}
+
+    boards = max(1, 20000 // cells)
+    results["build empty board"] = timed(lambda: [board_class(User(1, "local"), size, size)
+                                                  for _ in range(boards)]) / boards * 1e6
+
+    def queries(method):
+        for (x, y) in fields:
+            method(x, y)
+    results["can_fire"] = timed(lambda: queries(board.can_fire)) / cells * 1e6
+    results["has_ship_on"] = timed(lambda: queries(board.has_ship_on)) / cells * 1e6
+
+    def placements():
+        for (x, y) in fields:
+            board.can_be_placed(x, y, 5, "horizontal")
+            board.can_be_placed(x, y, 5, "vertical")
+    results["can_be_placed"] = timed(placements) / (2 * cells) * 1e6
+
+    def left():
+        for _ in range(cells):
+            board.has_ship_fields_left()
+    results["has_ship_fields_left"] = timed(left) / cells * 1e6
+
+    def fire_everywhere():
+        target = placed_board(board_class, size)
+        start = perf_counter()
+        for (x, y) in fields:
+            target.fire(x, y)
+        return perf_counter() - start
+    results["fire"] = min(fire_everywhere() for _ in range(3)) / cells * 1e6
+
+    fired = placed_board(board_class, size)
+    for (x, y) in fields[:cells // 2]:
+        fired.fire(x, y)
+    snapshots = max(1, 2000 // cells)
+    results["take snapshot"] = timed(lambda: [BoardSnapshot.from_board(fired)
+                                              for _ in range(snapshots)]) / snapshots * 1e6
+
+    games = max(1, 2000 // cells)
+    shots = [0]
+
+    def games_played():
+        shots[0] = sum(play(board_class, size, seed) for seed in range(games))
+    elapsed = timed(games_played, 1)
+    results["game move"] = elapsed / shots[0] * 1e6
+    return results
+
+
+def main():
+    sizes = [int(size) for size in sys.argv[1].split(",")] if len(sys.argv) > 1 else [10, 100]
+    print("%-22s %6s %12s %12s %9s" % ("operation", "size", "Board us", "BitBoard us", "speedup"))
+    for size in sizes:
+        board = measure(Board, size)
+        bit_board = measure(BitBoard, size)
+        for name in board:
+            print("%-22s %6d %12.3f %12.3f %8.1fx" % (name, size, board[name], bit_board[name],
+                                                      board[name] / bit_board[name]))
+
+
+if __name__ == "__main__":
+    main()
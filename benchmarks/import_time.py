@@ -0,0 +1,70 @@
+"""
+Import-time benchmark: cold import of the Qt-free core in a fresh interpreter
+
+Every module is imported in a new process (median of several runs) and the process checks that
+PySide was not loaded. The exit status is 1 if any module takes longer than the budget, so the
+script can guard against regressions.
+
+Run from the repository root: python benchmarks/import_time.py [budget in ms, 20 by default]
+"""
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+CORE_MODULES = [
+    "battleship.classes",
+    "battleship.classes.field",
+    "battleship.classes.battleship",
+    "battleship.classes.user",
+    "battleship.classes.timer",
+    "battleship.classes.board",
+    "battleship.classes.bit_board",
+    "battleship.classes.game_engine",
+    "battleship.classes.tournament",
+    "battleship.ui",
+]
+
+PROBE = """
+import sys
+from time import perf_counter
+start = perf_counter()
+import %s
+elapsed = perf_counter() - start
+print(elapsed * 1000, any(name.startswith("PySide") for name in sys.modules))
+"""
+
+
+def measure(module, runs=7):
+    """
+    Imports module in fresh interpreters
+
+    :return: (median time in ms, whether PySide was loaded)
+    """
+    times = []
+    qt_loaded = False
+    for _ in range(runs):
+        output = subprocess.check_output([sys.executable, "-c", PROBE % module], cwd=ROOT).decode().split()
+        times.append(float(output[0]))
+        qt_loaded = qt_loaded or output[1] == "True"
+    return statistics.median(times), qt_loaded
+
+
+def main():
+    budget = float(sys.argv[1]) if len(sys.argv) > 1 else 20.0
+    failed = False
+    print("%-36s %10s %8s" % ("module", "ms", "PySide"))
+    for module in CORE_MODULES:
+        elapsed, qt_loaded = measure(module)
+        print("%-36s %10.2f %8s" % (module, elapsed, "yes" if qt_loaded else "no"))
+        if elapsed > budget or qt_loaded:
+            failed = True
+    if failed:
+        print("import of the core is slower than %.0f ms or loads PySide" % budget)
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+"""
+Memory benchmark: bytes per field of a board and bytes per game of this tree against a baseline revision
+
+A game is two boards with their users and ships placed, half of the fields of each board fired at.
+Both trees are measured by the same procedure, using only the API that the baseline has too, each
+in its own process. Ratios are given against `Board` of the baseline.
+
+Run from the repository root: python benchmarks/memory.py [baseline git revision, the first commit by default]
+"""
+import importlib
+import io
+import json
+import os
+import random
+import subprocess
+import sys
+import tarfile
+import tempfile
+import tracemalloc
+import types
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+SIZES = (10, 50, 200)
+FLEET = [(5, 1), (4, 1), (3, 2), (2, 1)]
+BOARD_MODULES = [("board", "Board"), ("bit_board", "BitBoard"), ("numpy_board", "NumpyBoard")]
+
+
+def load_classes(root):
+    """
+    Imports classes of the game from battleship/classes of the tree in given directory
+
+    Package __init__ files are not run, the one of the baseline imports PySide.
+
+    :return: (list of board classes found in the tree, `BattleShip`, `User`)
+    """
+    sys.path.insert(0, root)
+    for name in ("battleship", "battleship.classes"):
+        package = types.ModuleType(name)
+        package.__path__ = [os.path.join(root, *name.split("."))]
+        sys.modules[name] = package
+    board_classes = []
+    for (module, name) in BOARD_MODULES:
+        try:
+            board_classes.append(getattr(importlib.import_module("battleship.classes." + module), name))
+        except ImportError:
+            pass
+    battleship = importlib.import_module("battleship.classes.battleship").BattleShip
+    user = importlib.import_module("battleship.classes.user").User
+    return board_classes, battleship, user
+
+
+def measure(build):
+    """Returns amount of bytes still allocated by objects returned from build()"""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = build()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del result
+    return after - before
+
+
+def build_game(board_class, battleship, user, size, seed):
+    """Builds two boards with fleets placed at random and half of the fields of each board fired at"""
+    rng = random.Random(seed)
+    boards = []
+    for nr in (1, 2):
+        owner = user(nr, "computer", 1)
+        board = board_class(owner, size, size)
+        for (length, amount) in FLEET:
+            for _ in range(amount):
+                ship = battleship(length, owner)
+                while True:
+                    (x, y) = (rng.randrange(size), rng.randrange(size))
+                    orientation = rng.choice(("horizontal", "vertical"))
+                    if board.can_be_placed(x, y, ship, orientation):
+                        break
+                board.place_ship(x, y, ship, orientation)
+                owner.add_ship(ship)
+        for _ in range(size * size // 2):
+            board.fire(rng.randrange(size), rng.randrange(size))
+        boards.append(board)
+    return boards
+
+
+def measure_tree(root):
+    """Prints JSON lines with bytes per field and per game of every board class of the tree in given directory"""
+    board_classes, battleship, user = load_classes(root)
+    for board_class in board_classes:
+        for size in SIZES:
+            # caches shared by all boards of a size (e.g. Zobrist keys) are filled before measuring
+            build_game(board_class, battleship, user, size, -1)
+            cells = size * size
+            per_field = measure(lambda: [board_class(user(1, "local"), size, size) for _ in range(5)]) / 5 / cells
+            games = 20 if size < 200 else 2
+            per_game = measure(lambda: [build_game(board_class, battleship, user, size, seed)
+                                        for seed in range(games)]) / games
+            print(json.dumps([board_class.__name__, size, per_field, per_game]))
+
+
+def run_tree(root):
+    """Measures tree in given directory in a new process, returns list of [class name, size, per field, per game]"""
+    output = subprocess.check_output([sys.executable, os.path.abspath(__file__), "--tree", root])
+    return [json.loads(line) for line in output.decode().splitlines()]
+
+
+def extract(revision, directory):
+    """Extracts battleship package of given git revision into directory"""
+    if revision is None:
+        revision = subprocess.check_output(["git", "rev-list", "--max-parents=0", "HEAD"], cwd=ROOT).split()[-1]
+    archive = subprocess.check_output(["git", "archive", revision, "battleship"], cwd=ROOT)
+    with tarfile.open(fileobj=io.BytesIO(archive)) as tar:
+        tar.extractall(directory)
+
+
+def main():
+    if len(sys.argv) > 2 and sys.argv[1] == "--tree":
+        measure_tree(sys.argv[2])
+        return
+    with tempfile.TemporaryDirectory() as directory:
+        extract(sys.argv[1] if len(sys.argv) > 1 else None, directory)
+        baseline = run_tree(directory)
+    current = run_tree(ROOT)
+    base = dict((size, (per_field, per_game)) for (name, size, per_field, per_game) in baseline if name == "Board")
+    print("%-9s %-12s %6s %12s %12s %10s %10s" % ("tree", "board", "size", "bytes/field", "bytes/game",
+                                                  "field x", "game x"))
+    for (tree, results) in (("baseline", baseline), ("current", current)):
+        for (name, size, per_field, per_game) in results:
+            print("%-9s %-12s %6d %12.1f %12.0f %10.2f %10.2f" % (tree, name, size, per_field, per_game,
+                                                                 per_field / base[size][0],
+                                                                 per_game / base[size][1]))
+
+
+if __name__ == "__main__":
+    main()
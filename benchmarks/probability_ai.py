@@ -0,0 +1,79 @@
+"""
+Speed benchmark: moves of `ProbabilityAI` ("Hard" level) on a small and a large board
+
+For every board size it plays whole games of the level against a placed fleet and prints the median
+and the 90th percentile of a move, both of the AI alone (select_field and observe) and of
+`GameEngine.ai_turn` (with the cache of moves and the shot itself).
+
+Run from the repository root: python benchmarks/probability_ai.py [board sizes, 10,100 by default]
+"""
+import os
+import random
+import statistics
+import sys
+from time import perf_counter
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from battleship.classes.board import Board
+from battleship.classes.game_engine import GameEngine
+from battleship.classes.probability_ai import ProbabilityAI
+from battleship.classes.state_cache import StateCache
+from battleship.classes.user import User
+
+FLEET = [(5, 1), (4, 1), (3, 2), (2, 1)]
+# 80 ships on the board of 100x100
+LARGE_FLEET = [(5, 10), (4, 20), (3, 25), (2, 25)]
+
+
+def placed_engine(size, seed=0):
+    """Returns engine whose player 1 plays "Hard" level against a placed fleet of player 2"""
+    fleet = FLEET if size < 50 else LARGE_FLEET
+    engine = GameEngine(Board(User(1, "computer", 4), size, size), Board(User(2, "computer"), size, size), fleet,
+                        seed=seed, cache=StateCache())
+    engine.apply_ai_layout(2, engine.ai_layout(2, rng=random.Random(seed)))
+    return engine, fleet
+
+
+def ai_moves(size, games):
+    """Returns seconds of every move of the AI alone"""
+    times = []
+    for seed in range(games):
+        (engine, fleet) = placed_engine(size, seed)
+        ai = ProbabilityAI(engine.b2, fleet, random.Random(seed))
+        while engine.b2.has_ship_fields_left():
+            start = perf_counter()
+            field = ai.select_field()
+            elapsed = perf_counter() - start
+            engine.fire(1, *field)
+            start = perf_counter()
+            ai.observe(*field)
+            times.append(elapsed + perf_counter() - start)
+    return times
+
+
+def engine_moves(size, games):
+    """Returns seconds of every `GameEngine.ai_turn`"""
+    times = []
+    for seed in range(games):
+        (engine, _) = placed_engine(size, seed)
+        while engine.b2.has_ship_fields_left():
+            start = perf_counter()
+            engine.ai_turn(1)
+            times.append(perf_counter() - start)
+    return times
+
+
+def main():
+    sizes = [int(size) for size in sys.argv[1].split(",")] if len(sys.argv) > 1 else [10, 100]
+    print("%-10s %6s %8s %12s %12s" % ("moves of", "size", "moves", "median ms", "90% ms"))
+    for size in sizes:
+        games = 20 if size < 50 else 1
+        for (name, moves) in (("AI", ai_moves), ("ai_turn", engine_moves)):
+            times = sorted(moves(size, games))
+            print("%-10s %6d %8d %12.3f %12.3f" % (name, size, len(times), statistics.median(times) * 1e3,
+                                                   times[len(times) * 9 // 10] * 1e3))
+
+
+if __name__ == "__main__":
+    main()
@@ -5,17 +5,169 @@
 Battleship python game with GUI in QT (PySide)
 
 Author: Tomasz Potanski, tomasz@potanski.pl
+
+Usage:
+    python start.py - play the game
+    python start.py simulate --games N --levels 2,3 --board 10x10 --fleet 5:1,4:1,3:1 --workers K --time-budget S
+                         --max-nodes M --record PATH --archive PATH
+        - plays AI vs AI games without GUI (Qt is not loaded), prints one JSON line per game
+    python start.py analyse ARCHIVE
+        - prints statistics of games in a replay archive, one JSON line per AI level
 """
 
-from PySide.QtGui import QApplication
+import os
+import sys
 
-from battleship.classes import DialogWindow
 
+def simulate(arguments):
+    """
+    Plays AI vs AI games and streams results as JSON lines to the standard output
+
+    :param arguments: command line arguments after "simulate"
+    """
+    import argparse
+    import json
+    from time import time
+
+    from battleship.classes.fleet_placer import FleetPlacer
+    from battleship.classes.tournament import Tournament
+    from battleship.classes.user import LEVELS
+
+    parser = argparse.ArgumentParser(prog="start.py simulate", description="Plays AI vs AI games without GUI")
+    parser.add_argument("--games", type=int, default=100, help="amount of games")
+    parser.add_argument("--levels", default="2,3", help="levels of player 1 and 2, e.g. 2,3")
+    parser.add_argument("--board", default="10x10", help="board size as WIDTHxLENGTH")
+    parser.add_argument("--fleet", default="5:1,4:1,3:1", help="fleet as LENGTH:AMOUNT,...")
+    parser.add_argument("--workers", type=int, default=1, help="amount of processes (0 - all cores)")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the first game")
+    parser.add_argument("--time-budget", type=float,
+                        help="seconds AI may think about one move (levels 5 and 6), no limit by default; "
+                             "with a limit results depend on speed of the machine and do not repeat")
+    parser.add_argument("--max-nodes", type=int, default=20000,
+                        help="states (level 6) or sampled layouts (level 5) AI may evaluate for one move")
+    parser.add_argument("--summary", action="store_true", help="print statistics to the standard error")
+    parser.add_argument("--record", metavar="PATH", help="append records of the games to a file (see GameRecord)")
+    parser.add_argument("--archive", metavar="PATH",
+                        help="append the games to a replay archive of this board and fleet (see ReplayArchive)")
+    options = parser.parse_args(arguments)
+
+    try:
+        (level1, level2) = [int(level) for level in options.levels.split(",")]
+        (width, length) = [int(size) for size in options.board.lower().split("x")]
+        list_of_ships = [tuple(int(value) for value in ship.split(":")) for ship in options.fleet.split(",")]
+    except ValueError:
+        parser.error("levels, board or fleet has wrong format")
+    if width < 1 or length < 1:
+        parser.error("board sizes have to be positive")
+    for ship in list_of_ships:
+        if len(ship) != 2:
+            parser.error("fleet has wrong format, ships are given as LENGTH:AMOUNT")
+        if ship[0] < 1 or ship[1] < 1:
+            parser.error("lengths and amounts of ships have to be positive")
+    for level in (level1, level2):
+        if level not in LEVELS.values():
+            parser.error("unknown level %d, levels are %s" % (level, ", ".join(map(str, sorted(LEVELS.values())))))
+    if options.time_budget is not None and options.time_budget <= 0:
+        parser.error("time budget has to be positive")
+    if options.max_nodes < 1:
+        parser.error("max nodes has to be positive")
+    # the same check as in the dialog window, a fleet that does not fit would fail in every game
+    (fits, _) = FleetPlacer(width, length).check_fleet(list_of_ships, seconds=5)
+    if fits is False:
+        parser.error("fleet does not fit on %dx%d board" % (width, length))
+
+    archive = None
+    if options.archive:
+        from battleship.classes.replay_archive import ReplayArchive
+        try:
+            archive = ReplayArchive(options.archive, width, length, list_of_ships)
+        except OSError as error:
+            parser.error("cannot open %s: %s" % (options.archive, error.strerror))
+        except Exception as error:
+            parser.error("%s: %s" % (options.archive, error))
+    records = None
+    if options.record:
+        try:
+            records = open(options.record, "ab")
+        except OSError as error:
+            parser.error("cannot open %s: %s" % (options.record, error.strerror))
+
+    tournament = Tournament(level1, level2, length, width, list_of_ships, options.seed, options.time_budget,
+                            options.max_nodes, records is not None or archive is not None)
+    start = time()
+    out = sys.stdout
+    games = []
+    try:
+        for game in tournament.iter_games(options.games, options.workers or None):
+            (seed, winner, shots, s_u1, s_u2) = game[:5]
+            out.write(json.dumps({"seed": seed, "levels": [level1, level2], "winner": winner, "shots": shots,
+                                  "points": [round(s_u1, 2), round(s_u2, 2)]}) + "\n")
+            out.flush()
+            if records is not None:
+                records.write(game[5].to_bytes())
+            if archive is not None:
+                archive.append(game[5])
+            if options.summary:
+                games.append((seed, winner, shots, s_u1, s_u2))
+    finally:
+        if records is not None:
+            records.close()
+    if options.summary:
+        from battleship.classes.tournament import TournamentResult
+        sys.stderr.write("%s\n" % TournamentResult(level1, level2, sorted(games), time() - start,
+                                                    options.workers or os.cpu_count() or 1))
+
+
+def analyse(arguments):
+    """
+    Prints statistics of games in a replay archive (filled by "simulate --archive") as JSON lines
+
+    :param arguments: command line arguments after "analyse"
+    """
+    import argparse
+    import json
+
+    from battleship.classes import archive_analytics
+    from battleship.classes.replay_archive import ReplayArchive
+
+    parser = argparse.ArgumentParser(prog="start.py analyse", description="Prints statistics of archived games")
+    parser.add_argument("archive", help="path of the replay archive")
+    parser.add_argument("--bins", type=int, default=10, help="amount of bins of hit ratio histograms")
+    options = parser.parse_args(arguments)
+    if options.bins < 1:
+        parser.error("amount of bins has to be positive")
+    if not os.path.exists(options.archive):
+        parser.error("%s does not exist" % options.archive)
+    try:
+        archive = ReplayArchive(options.archive)
+    except Exception as error:
+        parser.error("%s: %s" % (options.archive, error))
+
+    (shots, ratios) = archive_analytics.analyse(archive, [archive_analytics.ShotHeatmap(archive.width, archive.length),
+                                                          archive_analytics.HitRatioDistribution(options.bins)])
+    for level in shots.get_levels():
+        sys.stdout.write(json.dumps({"level": level, "hit_ratio": ratios.get_histogram(level),
+                                     "shots": shots.get_heatmap(level)}) + "\n")
+
+
+def play():
+    """Starts the game with GUI"""
+    from PySide.QtGui import QApplication
+
+    from battleship.ui import DialogWindow
 
-if __name__ == '__main__':
     app = QApplication(sys.argv)
 
     dialog = DialogWindow()
     dialog.show()
 
-    app.exec_()
\ No newline at end of file
+    app.exec_()
+
+
+if __name__ == '__main__':
+    if len(sys.argv) > 1 and sys.argv[1] == "simulate":
+        simulate(sys.argv[2:])
+    elif len(sys.argv) > 1 and sys.argv[1] == "analyse":
+        analyse(sys.argv[2:])
+    else:
+        play()
@@ -0,0 +1,109 @@
+import unittest
+
+from battleship.classes.bit_board import BitBoard
+from battleship.classes.board_snapshot import BoardSnapshot
+from battleship.classes.game_engine import GameEngine
+from battleship.classes.user import User
+from battleship.classes.zobrist import MISS, HIT, SUNK
+
+FLEET = [(3, 1), (2, 1)]
+
+
+def placed_board():
+    """Returns 6x6 board with a 3-ship at (1, 1)-(3, 1) and a 2-ship at (5, 5)-(5, 4)"""
+    engine = GameEngine(BitBoard(User(1, "computer"), 6, 6), BitBoard(User(2, "computer"), 6, 6), FLEET, seed=0)
+    assert engine.place_ship(2, 3, 1, 1, "horizontal")
+    assert engine.place_ship(2, 2, 5, 5, "vertical")
+    return engine.b2
+
+
+class BoardSnapshotTest(unittest.TestCase):
+
+    def test_shots_fork_and_leave_the_parent_alone(self):
+        root = BoardSnapshot.from_board(placed_board())
+        child = root.fire(0, 0)
+        self.assertIsNot(root, child)
+        self.assertTrue(root.can_fire(0, 0))
+        self.assertFalse(child.can_fire(0, 0))
+        self.assertEqual(0, root.get_shot_mask())
+        self.assertIs(root, child.get_parent())
+        self.assertIs(child, child.fire(0, 0))
+        self.assertIs(child, child.fire(6, 0))
+
+    def test_results_of_shots(self):
+        snapshot = BoardSnapshot.from_board(placed_board())
+        for (x, y, result) in ((0, 0, MISS), (1, 1, HIT), (2, 1, HIT), (5, 5, HIT), (3, 1, SUNK)):
+            snapshot = snapshot.fire(x, y)
+            self.assertEqual((x, y, result), snapshot.get_move())
+        self.assertEqual((2,), snapshot.get_afloat())
+        self.assertEqual(1 << (5 * 6 + 5), snapshot.get_open_hits())
+        self.assertFalse(snapshot.is_fleet_destroyed())
+        snapshot = snapshot.fire(5, 4)
+        self.assertEqual((5, 4, SUNK), snapshot.get_move())
+        self.assertTrue(snapshot.is_fleet_destroyed())
+        self.assertEqual(0, snapshot.get_open_hits())
+
+    def test_undo_goes_back_to_the_same_state(self):
+        root = BoardSnapshot.from_board(placed_board())
+        snapshot = root
+        states = []
+        for (x, y) in ((0, 0), (1, 1), (2, 1), (3, 1), (4, 4)):
+            states.append((snapshot.get_hash(), snapshot.get_shot_mask(), snapshot.get_hit_mask(),
+                           snapshot.get_sunk_mask(), snapshot.get_afloat()))
+            snapshot = snapshot.fire(x, y)
+        self.assertEqual(5, snapshot.get_depth())
+        self.assertEqual([(0, 0, MISS), (1, 1, HIT), (2, 1, HIT), (3, 1, SUNK), (4, 4, MISS)], snapshot.get_moves())
+        while states:
+            snapshot = snapshot.undo()
+            self.assertEqual(states.pop(), (snapshot.get_hash(), snapshot.get_shot_mask(), snapshot.get_hit_mask(),
+                                            snapshot.get_sunk_mask(), snapshot.get_afloat()))
+        self.assertIs(root, snapshot)
+        self.assertEqual(0, snapshot.get_depth())
+        with self.assertRaises(Exception):
+            snapshot.undo()
+
+    def test_siblings_share_their_parent(self):
+        root = BoardSnapshot.from_board(placed_board()).fire(1, 1)
+        left = root.fire(0, 1)
+        right = root.fire(2, 1)
+        self.assertEqual((0, 1, MISS), left.get_move())
+        self.assertEqual((2, 1, HIT), right.get_move())
+        self.assertIs(left.undo(), right.undo())
+
+    def test_recorded_results_agree_with_known_layout(self):
+        board = placed_board()
+        known = BoardSnapshot.from_board(board)
+        hidden = BoardSnapshot.observed(board, FLEET)
+        self.assertTrue(hidden.is_hidden())
+        for (x, y) in ((0, 0), (1, 1), (2, 1), (3, 1), (5, 4), (5, 5)):
+            known = known.fire(x, y)
+            (_, _, result) = known.get_move()
+            sunk_fields = None
+            if result == SUNK:
+                sunk_fields = [(fx, fy) for fx in range(6) for fy in range(6)
+                               if known.get_sunk_mask() >> (fy * 6 + fx) & 1 and
+                               not known.get_parent().get_sunk_mask() >> (fy * 6 + fx) & 1]
+            hidden = hidden.record(x, y, result != MISS, sunk_fields)
+            self.assertEqual(known.get_move(), hidden.get_move())
+            self.assertEqual(known.get_hash(), hidden.get_hash())
+            self.assertEqual(known.get_afloat(), hidden.get_afloat())
+
+    def test_hidden_layout(self):
+        hidden = BoardSnapshot.observed(placed_board(), FLEET)
+        with self.assertRaises(Exception):
+            hidden.fire(0, 0)
+        with self.assertRaises(Exception):
+            hidden.has_ship_on(0, 0)
+
+    def test_snapshot_does_not_follow_the_board(self):
+        board = placed_board()
+        snapshot = BoardSnapshot.from_board(board)
+        board.fire(1, 1)
+        self.assertTrue(snapshot.can_fire(1, 1))
+        self.assertTrue(snapshot.has_ship_on(1, 1))
+        self.assertFalse(snapshot.has_ship_on(0, 0))
+        self.assertNotEqual(board.get_hash(), snapshot.get_hash())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,91 @@
+import random
+import unittest
+from time import perf_counter
+
+from battleship.classes.board import Board
+from battleship.classes.expectimax_ai import ExpectimaxAI
+from battleship.classes.game_engine import GameEngine
+from battleship.classes.state_cache import StateCache
+from battleship.classes.user import User
+
+FLEET = [(5, 1), (4, 1), (3, 2), (2, 1)]
+# slow machines get a little more than the scheduling noise
+MARGIN = 0.05
+
+
+def engine_with_fleet(size, fleet, seed, level=1, time_budget=1.0):
+    """Returns engine with fleet of player 2 placed randomly, player 1 fires at it"""
+    engine = GameEngine(Board(User(1, "computer", level, time_budget), size, size),
+                        Board(User(2, "computer"), size, size), fleet, seed=seed, cache=StateCache())
+    engine.apply_ai_layout(2, engine.ai_layout(2, rng=random.Random(seed)))
+    return engine
+
+
+def fire_randomly(engine, amount, rng):
+    """Fires given amount of random shots of player 1"""
+    for _ in range(amount):
+        field = engine.b2.random_untried_field(rng)
+        if field is not None:
+            engine.fire(1, *field)
+
+
+class ExpectimaxAITest(unittest.TestCase):
+
+    def test_move_stays_within_time_budget(self):
+        for (size, fleet) in ((10, FLEET), (40, FLEET * 6)):
+            engine = engine_with_fleet(size, fleet, 1)
+            ai = ExpectimaxAI(engine.b2, fleet, random.Random(2), time_budget=0.1, max_nodes=10 ** 9)
+            rng = random.Random(3)
+            for _ in range(5):
+                fire_randomly(engine, 5, rng)
+                start = perf_counter()
+                field = ai.select_field()
+                self.assertLess(perf_counter() - start, 0.1 + MARGIN, size)
+                self.assertTrue(engine.b2.can_fire(*field))
+
+    def test_ai_turn_stays_within_time_budget(self):
+        engine = engine_with_fleet(30, FLEET * 4, 4, level=6, time_budget=0.1)
+        rng = random.Random(5)
+        for _ in range(5):
+            fire_randomly(engine, 5, rng)
+            shots = engine.b2.get_total_hit()
+            start = perf_counter()
+            engine.ai_turn(1)
+            self.assertLess(perf_counter() - start, 0.1 + MARGIN)
+            self.assertEqual(shots + 1, engine.b2.get_total_hit())
+
+    def test_moves_without_time_budget_depend_on_seed_only(self):
+        moves = []
+        for _ in range(2):
+            engine = engine_with_fleet(8, [(3, 1), (2, 2)], 6)
+            ai = ExpectimaxAI(engine.b2, [(3, 1), (2, 2)], random.Random(7), time_budget=None, max_nodes=100,
+                              samples=50)
+            played = []
+            for _ in range(8):
+                field = ai.select_field()
+                engine.fire(1, *field)
+                played.append(field)
+            moves.append(played)
+        self.assertEqual(moves[0], moves[1])
+
+    def test_finishes_a_hit_ship(self):
+        engine = GameEngine(Board(User(1, "computer"), 8, 8), Board(User(2, "computer"), 8, 8), [(3, 1)], seed=0)
+        engine.place_ship(2, 3, 2, 4, "horizontal")
+        engine.fire(1, 3, 4)
+        ai = ExpectimaxAI(engine.b2, [(3, 1)], random.Random(1), time_budget=None, max_nodes=500)
+        self.assertIn(ai.select_field(), {(2, 4), (4, 4), (3, 3), (3, 5)})
+        engine.fire(1, 4, 4)
+        self.assertIn(ai.select_field(), {(2, 4), (5, 4)})
+
+    def test_destroyed_fleet(self):
+        engine = GameEngine(Board(User(1, "computer"), 6, 6), Board(User(2, "computer"), 6, 6), [(2, 1)], seed=0)
+        engine.place_ship(2, 2, 0, 0, "horizontal")
+        engine.fire(1, 0, 0)
+        engine.fire(1, 1, 0)
+        ai = ExpectimaxAI(engine.b2, [(2, 1)], random.Random(1), time_budget=None)
+        self.assertEqual([], ai.best_fields())
+        self.assertTrue(engine.b2.can_fire(*ai.select_field()))
+
+
+if __name__ == "__main__":
+    unittest.main()
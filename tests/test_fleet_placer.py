@@ -0,0 +1,95 @@
+import random
+import unittest
+from time import perf_counter
+
+from battleship.classes.fleet_placer import FleetPlacer, diagonal_colouring_fits
+
+
+def ship_fields(ship_length, x, y, orientation):
+    """Returns fields of a ship, the same way `Board.place_ship` lays it out"""
+    if orientation == "horizontal":
+        return [(x + i, y) for i in range(ship_length)]
+    return [(x, y - i) for i in range(ship_length)]
+
+
+class FleetTestCase(unittest.TestCase):
+
+    def assertLegal(self, width, length, list_of_ships, layout):
+        """Checks that layout places exactly the fleet, on the board and without overlapping ships"""
+        self.assertEqual(sorted(ship_length for (ship_length, amount) in list_of_ships for _ in range(amount)),
+                         sorted(ship[0] for ship in layout))
+        taken = set()
+        for ship in layout:
+            for (x, y) in ship_fields(*ship):
+                self.assertTrue(0 <= x < width and 0 <= y < length, ship)
+                self.assertNotIn((x, y), taken, ship)
+                taken.add((x, y))
+
+
+class FleetPlacerTest(FleetTestCase):
+
+    def test_places_the_fleet(self):
+        fleet = [(5, 1), (4, 1), (3, 2), (2, 1)]
+        for seed in range(10):
+            (fits, layout) = FleetPlacer(10, 8, random.Random(seed)).place(fleet)
+            self.assertIs(True, fits)
+            self.assertLegal(10, 8, fleet, layout)
+
+    def test_seeded_layouts_repeat(self):
+        fleet = [(4, 2), (3, 3), (2, 4)]
+        layouts = [FleetPlacer(7, 7, random.Random(3)).place(fleet)[1] for _ in range(2)]
+        self.assertEqual(layouts[0], layouts[1])
+        self.assertNotEqual(layouts[0], FleetPlacer(7, 7, random.Random(4)).place(fleet)[1])
+
+    def test_crowded_boards(self):
+        for (width, length, fleet) in ((5, 5, [(5, 5)]), (6, 6, [(3, 12)]), (5, 5, [(3, 8)]),
+                                       (7, 5, [(4, 5), (3, 5)])):
+            (fits, layout) = FleetPlacer(width, length, random.Random(1)).place(fleet)
+            self.assertIs(True, fits, fleet)
+            self.assertLegal(width, length, fleet, layout)
+
+    def test_fleet_that_does_not_fit(self):
+        for (width, length, fleet) in ((5, 5, [(5, 3), (4, 3)]), (5, 5, [(6, 1)]), (5, 5, [(5, 3), (3, 3)])):
+            self.assertEqual((False, None), FleetPlacer(width, length, random.Random(1)).place(fleet), fleet)
+
+    def test_undecided_fleet(self):
+        placer = FleetPlacer(5, 5, random.Random(1))
+        self.assertEqual((None, None), placer.place([(5, 5)], max_nodes=1, random_nodes=0))
+
+
+class CheckFleetTest(FleetTestCase):
+
+    def test_fleet_that_fits(self):
+        for (width, length, fleet) in ((10, 10, [(5, 1), (4, 1), (3, 2), (2, 1)]), (5, 5, [(3, 8)]),
+                                       (5, 5, [(4, 6)]), (100, 100, [(5, 10), (4, 20), (3, 25), (2, 25)])):
+            (fits, layout) = FleetPlacer(width, length).check_fleet(fleet, 5000, seconds=1)
+            self.assertIs(True, fits, fleet)
+            self.assertLegal(width, length, fleet, layout)
+
+    def test_fleet_that_does_not_fit(self):
+        for (width, length, fleet) in ((5, 5, [(5, 3), (4, 3)]), (5, 5, [(5, 3), (3, 3)]), (5, 5, [(5, 4), (2, 3)])):
+            self.assertEqual((False, None), FleetPlacer(width, length).check_fleet(fleet), fleet)
+
+    def test_colouring_bound_refuses_tilings_at_once(self):
+        # neither of them is decided by the search within the limits of the dialog and the server
+        for (width, length, fleet) in ((6, 6, [(4, 9)]), (10, 10, [(4, 25)]), (6, 10, [(4, 15)])):
+            start = perf_counter()
+            self.assertEqual((False, None), FleetPlacer(width, length).check_fleet(fleet, 5000, seconds=0.05))
+            self.assertLess(perf_counter() - start, 0.01)
+
+    def test_colouring_bound_agrees_with_search(self):
+        for width in range(2, 7):
+            for length in range(2, 7):
+                for ship_length in range(2, 6):
+                    for amount in range(1, width * length // ship_length + 1):
+                        if not diagonal_colouring_fits(width, length, [ship_length] * amount):
+                            fleet = [(ship_length, amount)]
+                            self.assertEqual((False, None), FleetPlacer(width, length).check_fleet(fleet),
+                                             (width, length, fleet))
+
+    def test_undecided_fleet(self):
+        self.assertEqual((None, None), FleetPlacer(8, 8).check_fleet([(3, 21)], 50))
+
+
+if __name__ == "__main__":
+    unittest.main()
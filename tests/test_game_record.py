@@ -0,0 +1,88 @@
+import io
+import unittest
+
+from battleship.classes.game_record import GameRecord, write_varint, read_varint, iter_records
+from battleship.classes.tournament import play_game
+
+
+def recorded_game(seed):
+    """Returns `GameRecord` of a short AI vs AI game"""
+    return play_game(2, 1, 6, 6, [(3, 1), (2, 2)], seed, record=True)[5]
+
+
+class VarintTest(unittest.TestCase):
+
+    def test_round_trip(self):
+        values = [0, 1, 127, 128, 255, 300, 16383, 16384, 2 ** 32, 2 ** 63 - 1, 2 ** 64]
+        buffer = bytearray()
+        for value in values:
+            write_varint(buffer, value)
+        position = 0
+        for value in values:
+            (read, position) = read_varint(buffer, position)
+            self.assertEqual(value, read)
+        self.assertEqual(len(buffer), position)
+
+    def test_small_values_take_one_byte(self):
+        buffer = bytearray()
+        write_varint(buffer, 127)
+        self.assertEqual(1, len(buffer))
+        write_varint(buffer, 128)
+        self.assertEqual(3, len(buffer))
+
+
+class GameRecordTest(unittest.TestCase):
+
+    def test_bytes_round_trip(self):
+        record = recorded_game(3)
+        (read, end) = GameRecord.from_bytes(record.to_bytes())
+        self.assertEqual(len(record.to_bytes()), end)
+        for name in ("width", "length", "list_of_ships", "seed", "levels", "placements", "moves", "winner",
+                     "scores"):
+            self.assertEqual(getattr(record, name), getattr(read, name), name)
+
+    def test_replay_reaches_the_recorded_end(self):
+        record = recorded_game(4)
+        engine = record.replay()
+        self.assertTrue(engine.game_over)
+        self.assertEqual(record.winner, engine.winner)
+        self.assertEqual(record.moves, engine.moves)
+
+    def test_rejects_other_data(self):
+        data = bytearray(recorded_game(5).to_bytes())
+        data[0:3] = b"XYZ"
+        with self.assertRaises(Exception):
+            GameRecord.from_bytes(bytes(data))
+
+    def test_rejects_corrupted_length(self):
+        data = bytearray(recorded_game(5).to_bytes())
+        data.append(0)
+        data[4] += 1
+        with self.assertRaises(Exception):
+            GameRecord.from_bytes(bytes(data))
+
+
+class IterRecordsTest(unittest.TestCase):
+
+    def test_streams_concatenated_records(self):
+        records = [recorded_game(seed) for seed in range(4)]
+        stream = io.BytesIO(b"".join(record.to_bytes() for record in records))
+        # records span many chunks
+        read = list(iter_records(stream, chunk_size=7))
+        self.assertEqual([record.seed for record in records], [record.seed for record in read])
+        self.assertEqual([record.moves for record in records], [record.moves for record in read])
+
+    def test_truncated_record_raises(self):
+        data = recorded_game(1).to_bytes() + recorded_game(2).to_bytes()
+        for cut in (1, 4, 10, len(recorded_game(2).to_bytes()) - 1):
+            records = iter_records(io.BytesIO(data[:len(data) - cut]), chunk_size=16)
+            self.assertEqual(1, next(records).seed)
+            with self.assertRaises(Exception):
+                next(records)
+
+    def test_empty_stream(self):
+        self.assertEqual([], list(iter_records(io.BytesIO(b""))))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,150 @@
+import asyncio
+import unittest
+
+from battleship.classes import net_protocol as protocol
+from battleship.classes.game_server import GameServer
+
+# (width, length, amount of fleet entries, (ship length, amount)...)
+SMALL_GAME = (5, 5, 2, 3, 1, 2, 1)
+
+
+class Client:
+    """Test client speaking the protocol of the game server"""
+
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+        self.decoder = protocol.FrameDecoder()
+        self.messages = []
+
+    @classmethod
+    async def connect(cls, port):
+        (reader, writer) = await asyncio.open_connection("127.0.0.1", port)
+        return cls(reader, writer)
+
+    def send(self, *values):
+        self.writer.write(protocol.encode(*values))
+
+    async def receive(self):
+        """Returns next message from the server"""
+        while not self.messages:
+            data = await asyncio.wait_for(self.reader.read(4096), 5)
+            if not data:
+                raise ConnectionError("server closed connection")
+            self.messages += self.decoder.feed(data)
+        return self.messages.pop(0)
+
+    async def close(self):
+        self.writer.close()
+        await self.writer.wait_closed()
+
+
+class GameServerTest(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.server = GameServer()
+        listening = await self.server.start(port=0)
+        self.port = listening.sockets[0].getsockname()[1]
+        self.clients = []
+
+    async def asyncTearDown(self):
+        for client in self.clients:
+            await client.close()
+        self.server.server.close()
+        await self.server.server.wait_closed()
+
+    async def client(self):
+        client = await Client.connect(self.port)
+        self.clients.append(client)
+        return client
+
+    async def matched_pair(self, game=SMALL_GAME):
+        first = await self.client()
+        first.send(protocol.JOIN, *game)
+        self.assertEqual([protocol.WAITING], await first.receive())
+        second = await self.client()
+        second.send(protocol.JOIN, *game)
+        self.assertEqual([protocol.MATCHED, 2], await second.receive())
+        self.assertEqual([protocol.MATCHED, 1], await first.receive())
+        return first, second
+
+    async def test_players_with_the_same_game_are_paired(self):
+        await self.matched_pair()
+        self.assertEqual(1, self.server.matches)
+        self.assertEqual({}, self.server.lobby)
+
+    async def test_invalid_join_is_rejected(self):
+        client = await self.client()
+        for game in ((5, 5, 1, 6, 1), (4, 4, 1, 2, 1), (5, 5, 2, 3, 1), (5, 5, 1, 5, 6)):
+            client.send(protocol.JOIN, *game)
+            self.assertEqual([protocol.REJECTED, protocol.BAD_MESSAGE], await client.receive(), game)
+
+    async def test_fleet_proven_not_to_fit_is_rejected_once_checked(self):
+        client = await self.client()
+        game = (5, 5, 2, 5, 3, 3, 3)
+        client.send(protocol.JOIN, *game)
+        self.assertEqual([protocol.REJECTED, protocol.BAD_MESSAGE], await client.receive())
+        self.assertIs(False, self.server.verdicts.get((5, 5, ((5, 3), (3, 3)))))
+        # the verdict is reused, the answer comes right away
+        client.send(protocol.JOIN, *game)
+        self.assertEqual({}, self.server.checks)
+        self.assertEqual([protocol.REJECTED, protocol.BAD_MESSAGE], await client.receive())
+
+    async def test_join_twice(self):
+        client = await self.client()
+        client.send(protocol.JOIN, *SMALL_GAME)
+        client.send(protocol.JOIN, *SMALL_GAME)
+        self.assertEqual([protocol.REJECTED, protocol.NOT_NOW], await client.receive())
+        self.assertEqual([protocol.WAITING], await client.receive())
+
+    async def test_moves_before_the_match(self):
+        client = await self.client()
+        client.send(protocol.FIRE, 0)
+        self.assertEqual([protocol.REJECTED, protocol.NOT_NOW], await client.receive())
+        client.send(99)
+        self.assertEqual([protocol.REJECTED, protocol.BAD_MESSAGE], await client.receive())
+
+    async def test_whole_game(self):
+        (first, second) = await self.matched_pair()
+        placements = [(3, protocol.encode_placement(5, 0, 0, "horizontal")),
+                      (2, protocol.encode_placement(5, 0, 4, "horizontal"))]
+        for client in (first, second):
+            for (length, placement) in placements:
+                client.send(protocol.PLACE, length, placement)
+                self.assertEqual([protocol.PLACED, length, placement], await client.receive())
+        for client in (first, second):
+            self.assertEqual([protocol.BATTLE, 1], await client.receive())
+
+        # not the turn of the second player
+        second.send(protocol.FIRE, 0)
+        self.assertEqual([protocol.REJECTED, protocol.ILLEGAL_MOVE], await second.receive())
+        first.send(protocol.FIRE, 12)
+        for client in (first, second):
+            self.assertEqual([protocol.SHOT, 1, 12, protocol.MISS], await client.receive())
+
+        # the first player sinks the whole fleet, the second one misses
+        cells = [0, 1, 2, 20, 21]
+        for (i, cell) in enumerate(cells):
+            second.send(protocol.FIRE, 13 + i)
+            for client in (first, second):
+                self.assertEqual(protocol.SHOT, (await client.receive())[0])
+            first.send(protocol.FIRE, cell)
+            expected = [protocol.SHOT, 1, cell, protocol.HIT]
+            if cell == 2:
+                expected = [protocol.SHOT, 1, cell, protocol.SUNK, 3, placements[0][1]]
+            elif cell == 21:
+                expected = [protocol.SHOT, 1, cell, protocol.SUNK, 2, placements[1][1]]
+            for client in (first, second):
+                self.assertEqual(expected, await client.receive())
+        for client in (first, second):
+            self.assertEqual([protocol.OVER, 1], (await client.receive())[:2])
+
+    async def test_opponent_leaving(self):
+        (first, second) = await self.matched_pair()
+        await first.close()
+        self.clients.remove(first)
+        self.assertEqual([protocol.LEFT], await second.receive())
+
+
+if __name__ == "__main__":
+    unittest.main()
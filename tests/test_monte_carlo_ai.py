@@ -0,0 +1,104 @@
+import random
+import unittest
+from time import monotonic
+
+from battleship.classes.bit_board import BitBoard
+from battleship.classes.game_engine import GameEngine
+from battleship.classes.monte_carlo_ai import MonteCarloAI, sample_counts
+from battleship.classes.user import User
+
+FLEET = [(3, 1), (2, 1)]
+# time the measured calls may overrun their budget by on a loaded machine
+MARGIN = 0.05
+
+
+def placed_engine(width=6, length=6):
+    """Returns engine whose second board has a 3-ship at (1, 1)-(3, 1) and a 2-ship at (5, 5)-(5, 4)"""
+    engine = GameEngine(BitBoard(User(1, "computer"), length, width), BitBoard(User(2, "computer"), length, width),
+                        FLEET, seed=0)
+    assert engine.place_ship(2, 3, 1, 1, "horizontal")
+    assert engine.place_ship(2, 2, 5, 5, "vertical")
+    return engine
+
+
+class SampleCountsTest(unittest.TestCase):
+
+    def test_counts_respect_shots(self):
+        # misses on the whole first row, one hit at (2, 2) of the 3-ship
+        blocked = (1 << 6) - 1
+        hits = 1 << (2 * 6 + 2)
+        (samples, counts) = sample_counts(6, 6, blocked, hits, [3, 2], None, seed=1, max_samples=200)
+        self.assertEqual(200, samples)
+        self.assertEqual([0] * 6, list(counts[:6]))
+        # every layout covers the hit and both ships
+        self.assertEqual(samples, counts[2 * 6 + 2])
+        self.assertEqual(5 * samples, sum(counts))
+
+    def test_seed_decides_result(self):
+        first = sample_counts(10, 10, 0, 0, [4, 3, 3, 2], None, seed=7, max_samples=100)
+        second = sample_counts(10, 10, 0, 0, [4, 3, 3, 2], None, seed=7, max_samples=100)
+        self.assertEqual(first, second)
+
+    def test_impossible_layout(self):
+        # the only free row is too short for the ship, attempts are limited
+        blocked = (1 << 25) - 1 ^ 0b1111
+        self.assertEqual(0, sample_counts(5, 5, blocked, 0, [5], None, seed=1, max_samples=10)[0])
+
+
+class MonteCarloAITest(unittest.TestCase):
+
+    def test_budget_or_samples_required(self):
+        with self.assertRaises(Exception):
+            MonteCarloAI(placed_engine().b2, FLEET, time_budget=None, max_samples=None)
+
+    def test_seeded_moves_without_time_budget(self):
+        moves = []
+        for _ in range(2):
+            engine = placed_engine()
+            ai = MonteCarloAI(engine.b2, FLEET, rng=random.Random(3), time_budget=None, max_samples=100)
+            shots = []
+            for _ in range(8):
+                (x, y) = ai.select_field()
+                engine.b2.fire(x, y)
+                ai.observe(x, y)
+                shots.append((x, y))
+            moves.append(shots)
+        self.assertEqual(moves[0], moves[1])
+
+    def test_targets_around_hit(self):
+        engine = placed_engine()
+        board = engine.b2
+        for (x, y) in ((0, 1), (2, 1)):
+            board.fire(x, y)
+        ai = MonteCarloAI(board, FLEET, rng=random.Random(1), time_budget=None, max_samples=300)
+        fields = ai.best_fields()
+        self.assertEqual(300, ai.get_samples())
+        self.assertTrue(fields)
+        for (x, y) in fields:
+            self.assertTrue(board.can_fire(x, y))
+            self.assertIn((x, y), [(1, 1), (3, 1), (2, 0), (2, 2)])
+
+    def test_sinks_fleet(self):
+        engine = placed_engine()
+        board = engine.b2
+        ai = MonteCarloAI(board, FLEET, rng=random.Random(5), time_budget=None, max_samples=100)
+        for _ in range(36):
+            if len(board.get_sunk_ships()) == 2:
+                break
+            (x, y) = ai.select_field()
+            self.assertTrue(board.can_fire(x, y))
+            board.fire(x, y)
+            ai.observe(x, y)
+        self.assertEqual(2, len(board.get_sunk_ships()))
+
+    def test_time_budget(self):
+        engine = placed_engine(30, 30)
+        ai = MonteCarloAI(engine.b2, FLEET, rng=random.Random(1), time_budget=0.05)
+        start = monotonic()
+        self.assertTrue(ai.best_fields())
+        self.assertLess(monotonic() - start, 0.05 + MARGIN)
+        self.assertGreater(ai.get_samples(), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
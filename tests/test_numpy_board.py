@@ -0,0 +1,84 @@
+import importlib.util
+import random
+import unittest
+
+from battleship.classes.game_engine import GameEngine
+from battleship.classes.user import User
+
+if importlib.util.find_spec("numpy") is not None:
+    from battleship.classes.numpy_board import NumpyBoard
+
+FLEET = [(4, 1), (3, 1), (2, 2)]
+LAYOUT = [(4, 0, 0, "horizontal"), (3, 6, 2, "vertical"), (2, 2, 4, "horizontal"), (2, 0, 8, "vertical")]
+
+
+def board_with_layout():
+    """Returns 10x10 `NumpyBoard` of player 2 with ships placed according to LAYOUT"""
+    engine = GameEngine(NumpyBoard(User(1, "computer"), 10, 10), NumpyBoard(User(2, "computer"), 10, 10),
+                        FLEET, seed=0)
+    for (length, x, y, orientation) in LAYOUT:
+        assert engine.place_ship(2, length, x, y, orientation)
+    return engine.b2
+
+
+def state(board):
+    """Everything fire and fire_many are expected to agree on; pools hold the same fields in other order"""
+    return (board.get_hash(), sorted(board.untried.fields), sorted(board.ship_fields_left.fields),
+            board.get_total_hit(), board.get_hit_ship_field(), list(board.get_hit_ship_fields()),
+            [ship.get_length() for ship in board.get_sunk_ships()], board.get_frontier().next_target(board),
+            [ship.fields_destroyed for ship in board.ships_by_id])
+
+
+@unittest.skipIf(importlib.util.find_spec("numpy") is None, "numpy is not installed")
+class FireManyTest(unittest.TestCase):
+
+    def test_salvos_match_single_shots(self):
+        for seed in range(5):
+            rng = random.Random(seed)
+            shots = [(rng.randrange(-1, 11), rng.randrange(-1, 11)) for _ in range(150)]
+            one_by_one, salvos = board_with_layout(), board_with_layout()
+            for (x, y) in shots:
+                one_by_one.fire(x, y)
+            for start in range(0, len(shots), 17):
+                salvos.fire_many(shots[start:start + 17])
+            self.assertEqual(state(one_by_one), state(salvos), seed)
+            for board in (one_by_one, salvos):
+                for (cell, position) in enumerate(board.untried.positions):
+                    self.assertEqual(position != -1, board.can_fire(cell % 10, cell // 10))
+                    if position != -1:
+                        self.assertEqual(cell, board.untried.fields[position])
+            self.assertTrue(salvos.can_fire(*salvos.random_untried_field(random.Random(7))))
+
+    def test_hit_mask_and_sunk_ships(self):
+        board = board_with_layout()
+        hit_mask, sunk = board.fire_many([(0, 0), (5, 5), (1, 0), (2, 0), (3, 0), (0, 0)])
+        self.assertEqual([True, False, True, True, True, False], hit_mask.tolist())
+        self.assertEqual([4], [ship.get_length() for ship in sunk])
+        hit_mask, sunk = board.fire_many([(3, 0), (2, 4), (3, 4)])
+        self.assertEqual([False, True, True], hit_mask.tolist())
+        self.assertEqual([2], [ship.get_length() for ship in sunk])
+
+    def test_ships_sunk_in_one_salvo_in_order_of_sinking(self):
+        board = board_with_layout()
+        hit_mask, sunk = board.fire_many([(2, 4), (0, 0), (1, 0), (2, 0), (3, 0), (3, 4), (6, 2)])
+        self.assertEqual([4, 2], [ship.get_length() for ship in sunk])
+        self.assertEqual([(3, 0), (3, 4)], [ship.get_fields()[-1] for ship in sunk])
+        self.assertEqual([(6, 2)], [(x, y) for (x, y) in board.get_frontier().open_hits])
+        board.fire_many([(x, y) for x in range(10) for y in range(10)])
+        self.assertFalse(board.has_ship_fields_left())
+        self.assertEqual(4, len(board.get_sunk_ships()))
+
+    def test_ignored_shots(self):
+        board = board_with_layout()
+        board.fire(4, 4)
+        before = state(board)
+        hit_mask, sunk = board.fire_many([(-1, 0), (10, 3), (4, 4), (2, 10)])
+        self.assertEqual([False] * 4, hit_mask.tolist())
+        self.assertEqual([], sunk)
+        self.assertEqual(before, state(board))
+        hit_mask, sunk = board.fire_many([])
+        self.assertEqual(0, len(hit_mask))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,105 @@
+import importlib.util
+import random
+import unittest
+
+from battleship.classes.board import Board
+from battleship.classes.game_engine import GameEngine
+from battleship.classes.state_cache import StateCache
+from battleship.classes.user import User
+
+if importlib.util.find_spec("numpy") is not None:
+    from battleship.classes.probability_ai import ProbabilityAI
+
+
+def counted_heatmap(width, length, remaining, blocked):
+    """Counts placements of remaining ships covering each field one by one, [x][y]"""
+    heatmap = [[0] * length for _ in range(width)]
+    for (ship_length, amount) in remaining:
+        for x in range(width):
+            for y in range(length):
+                for (dx, dy) in ((1, 0), (0, 1)):
+                    fields = [(x + i * dx, y + i * dy) for i in range(ship_length)]
+                    if all(fx < width and fy < length and (fx, fy) not in blocked for (fx, fy) in fields):
+                        for (fx, fy) in fields:
+                            heatmap[fx][fy] += amount
+    return heatmap
+
+
+def engine_with_layout(width, length, fleet, layout, level=1):
+    """Returns engine with ships of player 2 placed according to layout of (length, x, y, orientation)"""
+    engine = GameEngine(Board(User(1, "computer", level), length, width), Board(User(2, "computer"), length, width),
+                        fleet, seed=0, cache=StateCache())
+    for (ship_length, x, y, orientation) in layout:
+        assert engine.place_ship(2, ship_length, x, y, orientation)
+    return engine
+
+
+@unittest.skipIf(importlib.util.find_spec("numpy") is None, "numpy is not installed")
+class ProbabilityAITest(unittest.TestCase):
+
+    def test_heatmap_counts_placements(self):
+        fleet = [(7, 1), (3, 2), (2, 1)]
+        engine = engine_with_layout(9, 6, fleet, [(3, 0, 0, "horizontal"), (3, 4, 5, "vertical"),
+                                                  (2, 7, 5, "horizontal"), (7, 1, 2, "horizontal")])
+        ai = ProbabilityAI(engine.b2, fleet, random.Random(1))
+        # the 7-ship is longer than a column, it lies in rows only
+        self.assertEqual(counted_heatmap(9, 6, fleet, set()), ai.get_heatmap().tolist())
+        misses = set()
+        for (x, y) in ((5, 4), (8, 0), (0, 5), (2, 1), (6, 0)):
+            engine.fire(1, x, y)
+            ai.observe(x, y)
+            misses.add((x, y))
+        self.assertEqual(counted_heatmap(9, 6, fleet, misses), ai.get_heatmap().tolist())
+
+    def test_sunk_ship_leaves_the_heatmap(self):
+        fleet = [(3, 1), (2, 1)]
+        engine = engine_with_layout(6, 6, fleet, [(3, 0, 0, "horizontal"), (2, 4, 4, "vertical")])
+        ai = ProbabilityAI(engine.b2, fleet, random.Random(1))
+        for (x, y) in ((0, 0), (1, 0), (2, 0)):
+            engine.fire(1, x, y)
+            ai.observe(x, y)
+        blocked = {(0, 0), (1, 0), (2, 0)}
+        heatmap = ai.get_heatmap().tolist()
+        expected = counted_heatmap(6, 6, [(2, 1)], blocked)
+        for (x, y) in blocked:
+            expected[x][y] = heatmap[x][y]
+        self.assertEqual(expected, heatmap)
+
+    def test_targets_hit_ship(self):
+        fleet = [(3, 1)]
+        engine = engine_with_layout(8, 8, fleet, [(3, 2, 4, "horizontal")])
+        ai = ProbabilityAI(engine.b2, fleet, random.Random(1))
+        engine.fire(1, 3, 4)
+        ai.observe(3, 4)
+        self.assertEqual({(2, 4), (4, 4), (3, 3), (3, 5)}, set(ai.best_fields()))
+        engine.fire(1, 4, 4)
+        ai.observe(4, 4)
+        self.assertEqual({(2, 4), (5, 4)}, set(ai.best_fields()))
+
+    def test_whole_games(self):
+        fleet = [(5, 1), (4, 1), (3, 2), (2, 1)]
+        for seed in range(5):
+            engine = GameEngine(Board(User(1, "computer", 4), 10, 10), Board(User(2, "computer"), 10, 10), fleet,
+                                seed=seed, cache=StateCache())
+            engine.apply_ai_layout(2, engine.ai_layout(2, rng=random.Random(seed)))
+            while engine.b2.has_ship_fields_left():
+                shots = engine.b2.get_total_hit()
+                engine.ai_turn(1)
+                self.assertEqual(shots + 1, engine.b2.get_total_hit(), seed)
+            # much better than random shots, which need about 95 of 100 fields
+            self.assertLess(engine.b2.get_total_hit(), 80, seed)
+
+    def test_nothing_left(self):
+        fleet = [(2, 1)]
+        engine = engine_with_layout(5, 5, fleet, [(2, 0, 0, "horizontal")])
+        ai = ProbabilityAI(engine.b2, fleet, random.Random(1))
+        for x in range(5):
+            for y in range(5):
+                engine.fire(1, x, y)
+                ai.observe(x, y)
+        self.assertEqual([], ai.best_fields())
+        self.assertIsNone(ai.select_field())
+
+
+if __name__ == "__main__":
+    unittest.main()
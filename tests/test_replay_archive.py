@@ -0,0 +1,90 @@
+import os
+import tempfile
+import unittest
+
+from battleship.classes.archive_analytics import analyse, ShotHeatmap, HitRatioDistribution
+from battleship.classes.replay_archive import ReplayArchive
+from battleship.classes.tournament import play_game
+
+FLEET = [(3, 1), (2, 2)]
+
+
+def recorded_game(seed, level1=2, level2=1):
+    """Returns `GameRecord` of a short AI vs AI game on 6x6 board"""
+    return play_game(level1, level2, 6, 6, FLEET, seed, record=True)[5]
+
+
+class ReplayArchiveTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "games.bsa")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_iterates_appended_games(self):
+        archive = ReplayArchive(self.path, 6, 6, FLEET)
+        records = [recorded_game(seed) for seed in range(5)]
+        for record in records:
+            archive.append(record)
+        self.assertEqual(5, len(ReplayArchive(self.path)))
+        for (record, game) in zip(records, archive):
+            self.assertEqual(record.seed, game.get_seed())
+            self.assertEqual(record.levels, game.get_levels())
+            self.assertEqual(record.winner, game.get_winner())
+            self.assertEqual(record.moves, list(game.get_shots()))
+            for player in (1, 2):
+                self.assertEqual(record.placements[player], game.get_placements(player))
+
+    def test_game_outlives_its_iterator(self):
+        archive = ReplayArchive(self.path, 6, 6, FLEET)
+        record = recorded_game(7)
+        archive.append(record)
+        copy = next(iter(archive)).to_record()
+        self.assertEqual(record.moves, copy.moves)
+        games = list(archive)
+        self.assertEqual(record.seed, games[0].get_seed())
+        self.assertEqual(record.winner, copy.replay().winner)
+
+    def test_torn_record_is_ignored_and_overwritten(self):
+        archive = ReplayArchive(self.path, 6, 6, FLEET)
+        archive.append(recorded_game(1))
+        with open(self.path, "ab") as f:
+            f.write(b"\x01" * (archive.record_size // 2))
+        self.assertEqual(1, len(archive))
+        archive.append(recorded_game(2))
+        self.assertEqual(2, len(archive))
+        self.assertEqual(ReplayArchive(self.path).header_size + 2 * archive.record_size, os.path.getsize(self.path))
+        self.assertEqual([1, 2], [game.get_seed() for game in archive])
+
+    def test_rejects_other_board_or_fleet(self):
+        ReplayArchive(self.path, 6, 6, FLEET)
+        with self.assertRaises(Exception):
+            ReplayArchive(self.path, 7, 6, FLEET)
+        with self.assertRaises(Exception):
+            ReplayArchive(self.path, 6, 6, [(3, 2)])
+        archive = ReplayArchive(self.path)
+        with self.assertRaises(Exception):
+            archive.append(play_game(2, 1, 6, 6, [(3, 2)], 0, record=True)[5])
+
+    def test_empty_archive(self):
+        archive = ReplayArchive(self.path, 6, 6, FLEET)
+        self.assertEqual(0, len(archive))
+        self.assertEqual([], list(archive))
+
+    def test_analytics_count_every_shot(self):
+        archive = ReplayArchive(self.path, 6, 6, FLEET)
+        records = [recorded_game(seed, 2, 1) for seed in range(4)]
+        for record in records:
+            archive.append(record)
+        (shots, ratios) = analyse(archive, [ShotHeatmap(6, 6), HitRatioDistribution(4)])
+        self.assertEqual([1, 2], shots.get_levels())
+        for (player, level) in ((1, 2), (2, 1)):
+            fired = sum(1 for record in records for move in record.moves if move[0] == player)
+            self.assertEqual(fired, sum(map(sum, shots.get_heatmap(level))))
+            self.assertEqual(len(records), sum(amount for (_, amount) in ratios.get_histogram(level)))
+
+
+if __name__ == "__main__":
+    unittest.main()
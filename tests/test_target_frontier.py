@@ -0,0 +1,86 @@
+import random
+import unittest
+
+from battleship.classes.board import Board
+from battleship.classes.game_engine import GameEngine
+from battleship.classes.user import User
+
+
+def engine_with_layout(width, length, layout):
+    """Returns engine with ships of player 2 placed according to layout of (length, x, y, orientation)"""
+    fleet = [(ship_length, 1) for (ship_length, _, _, _) in layout]
+    engine = GameEngine(Board(User(1, "computer", 2), width, length), Board(User(2, "computer"), width, length),
+                        fleet, seed=0)
+    for (ship_length, x, y, orientation) in layout:
+        assert engine.place_ship(2, ship_length, x, y, orientation)
+    return engine
+
+
+def hunt(engine, limit):
+    """Fires at targets of the frontier of player 2's board, returns the fields fired at"""
+    board = engine.b2
+    fired = []
+    while len(fired) < limit:
+        target = board.get_frontier().next_target(board)
+        if target is None:
+            break
+        engine.fire(1, *target)
+        fired.append(target)
+    return fired
+
+
+class TargetFrontierTest(unittest.TestCase):
+
+    def test_neighbours_of_a_single_hit(self):
+        engine = engine_with_layout(10, 10, [(3, 4, 6, "vertical")])
+        engine.fire(1, 4, 5)
+        frontier = engine.b2.get_frontier()
+        self.assertEqual({(3, 5), (5, 5), (4, 4), (4, 6)}, {(x, y) for (x, y, _) in frontier.queue})
+
+    def test_line_ends_go_first(self):
+        engine = engine_with_layout(10, 10, [(4, 2, 5, "horizontal")])
+        engine.fire(1, 3, 5)
+        engine.fire(1, 4, 5)
+        board = engine.b2
+        self.assertIn(board.get_frontier().next_target(board), {(2, 5), (5, 5)})
+
+    def test_sinks_a_ship_it_has_hit(self):
+        engine = engine_with_layout(10, 10, [(3, 4, 6, "vertical")])
+        engine.fire(1, 4, 5)
+        hunt(engine, 10)
+        self.assertEqual(1, len(engine.b2.get_sunk_ships()))
+        self.assertEqual(set(), engine.b2.get_frontier().open_hits)
+
+    def test_adjacent_parallel_ships(self):
+        engine = engine_with_layout(10, 10, [(3, 4, 6, "vertical"), (3, 5, 6, "vertical")])
+        engine.fire(1, 4, 5)
+        engine.fire(1, 5, 5)
+        hunt(engine, 30)
+        self.assertEqual(2, len(engine.b2.get_sunk_ships()))
+        self.assertEqual(set(), engine.b2.get_frontier().open_hits)
+
+    def test_ships_in_a_row(self):
+        engine = engine_with_layout(10, 10, [(2, 2, 5, "horizontal"), (3, 4, 5, "horizontal"),
+                                             (2, 3, 7, "vertical")])
+        engine.fire(1, 3, 5)
+        engine.fire(1, 4, 5)
+        engine.fire(1, 3, 6)
+        hunt(engine, 40)
+        self.assertEqual(3, len(engine.b2.get_sunk_ships()))
+
+    def test_medium_ai_never_leaves_hit_ships(self):
+        for seed in range(20):
+            rng = random.Random(seed)
+            engine = GameEngine(Board(User(1, "computer", 2), 8, 8), Board(User(2, "computer"), 8, 8),
+                                [(4, 1), (3, 2), (2, 3)], seed=seed)
+            engine.apply_ai_layout(2, engine.ai_layout(2, rng=rng))
+            board = engine.b2
+            while board.has_ship_fields_left():
+                frontier = board.get_frontier()
+                if frontier.next_target(board) is None:
+                    self.assertEqual(set(), frontier.open_hits, seed)
+                engine.fire(1, *engine.medium_select_field(board, rng))
+
+
+if __name__ == "__main__":
+    unittest.main()
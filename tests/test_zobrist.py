@@ -0,0 +1,150 @@
+import importlib.util
+import random
+import unittest
+
+from battleship.classes.bit_board import BitBoard
+from battleship.classes.board import Board
+from battleship.classes.board_snapshot import BoardSnapshot
+from battleship.classes.game_engine import GameEngine
+from battleship.classes.state_cache import StateCache
+from battleship.classes.user import User
+from battleship.classes.zobrist import zobrist_hash
+
+BOARD_CLASSES = [Board, BitBoard]
+if importlib.util.find_spec("numpy") is not None:
+    from battleship.classes.numpy_board import NumpyBoard
+    BOARD_CLASSES.append(NumpyBoard)
+
+FLEET = [(4, 1), (2, 2)]
+# the 4-ship and two 2-ships swap places: sinking the top row sinks different ships
+LAYOUT_A = [(4, 0, 0, "horizontal"), (2, 0, 5, "horizontal"), (2, 5, 5, "horizontal")]
+LAYOUT_B = [(2, 0, 0, "horizontal"), (2, 2, 0, "horizontal"), (4, 0, 5, "horizontal")]
+TOP_ROW = [(x, 0) for x in range(4)]
+
+
+def engine_with_layout(board_class, layout, level=1, cache=None):
+    """Returns engine on 8x8 boards with ships of player 2 placed according to layout"""
+    engine = GameEngine(board_class(User(1, "computer", level), 8, 8), board_class(User(2, "computer"), 8, 8),
+                        FLEET, seed=0, cache=cache)
+    for (length, x, y, orientation) in layout:
+        assert engine.place_ship(2, length, x, y, orientation)
+    engine.placement = False
+    engine.real_game = True
+    return engine
+
+
+def random_shots(seed, amount=40):
+    rng = random.Random(seed)
+    fields = [(x, y) for x in range(8) for y in range(8)]
+    rng.shuffle(fields)
+    return TOP_ROW + fields[:amount]
+
+
+class FixedAI:
+    """AI always proposing the same fields, counts how often it was asked"""
+
+    def __init__(self, fields):
+        self.fields = fields
+        self.calls = 0
+
+    def best_fields(self, task=None):
+        self.calls += 1
+        return self.fields
+
+
+class ZobristTest(unittest.TestCase):
+
+    def test_boards_agree_on_hash(self):
+        for seed in range(5):
+            shots = random_shots(seed)
+            hashes = set()
+            for board_class in BOARD_CLASSES:
+                board = engine_with_layout(board_class, LAYOUT_A).b2
+                for (x, y) in shots:
+                    board.fire(x, y)
+                hashes.add(board.get_hash())
+            self.assertEqual(1, len(hashes), seed)
+
+    def test_hash_matches_hash_computed_from_scratch(self):
+        for board_class in BOARD_CLASSES:
+            board = engine_with_layout(board_class, LAYOUT_A).b2
+            for (x, y) in random_shots(1):
+                board.fire(x, y)
+                snapshot = BoardSnapshot.from_board(board)
+                self.assertEqual(zobrist_hash(8, 8, snapshot.get_shot_mask(), snapshot.get_hit_mask(),
+                                              snapshot.get_sunk_mask()), board.get_hash())
+
+    def test_snapshot_forks_agree_with_board(self):
+        shots = random_shots(2)
+        board = engine_with_layout(BitBoard, LAYOUT_A).b2
+        snapshot = BoardSnapshot.from_board(board)
+        for (x, y) in shots:
+            board.fire(x, y)
+            snapshot = snapshot.fire(x, y)
+            self.assertEqual(board.get_hash(), snapshot.get_hash())
+        # the same shots in other order reach the same state
+        reordered = BoardSnapshot.from_board(engine_with_layout(BitBoard, LAYOUT_A).b2)
+        for (x, y) in reversed(shots):
+            reordered = reordered.fire(x, y)
+        self.assertEqual(snapshot.get_hash(), reordered.get_hash())
+        while snapshot.get_parent() is not None:
+            snapshot = snapshot.undo()
+        self.assertEqual(0, snapshot.get_hash())
+
+    def test_observed_snapshot_agrees_with_board(self):
+        board = engine_with_layout(Board, LAYOUT_A).b2
+        for (x, y) in random_shots(3):
+            board.fire(x, y)
+        self.assertEqual(board.get_hash(), BoardSnapshot.observed(board, FLEET).get_hash())
+
+
+class CachedMovesTest(unittest.TestCase):
+
+    def test_sunk_fields_do_not_tell_which_ships_sank(self):
+        engines = [engine_with_layout(BitBoard, layout, 4, StateCache()) for layout in (LAYOUT_A, LAYOUT_B)]
+        for engine in engines:
+            for (x, y) in TOP_ROW:
+                engine.fire(1, x, y)
+        self.assertEqual(engines[0].b2.get_hash(), engines[1].b2.get_hash())
+        self.assertNotEqual(len(engines[0].b2.get_sunk_ships()), len(engines[1].b2.get_sunk_ships()))
+
+    def test_cached_move_is_not_reused_for_other_remaining_fleet(self):
+        cache = StateCache()
+        results = []
+        for (layout, field) in ((LAYOUT_A, (7, 7)), (LAYOUT_B, (6, 6))):
+            engine = engine_with_layout(BitBoard, layout, 4, cache)
+            for (x, y) in TOP_ROW:
+                engine.fire(1, x, y)
+            ai = FixedAI([field])
+            results.append((engine.cached_select_field(1, ai), ai.calls))
+        self.assertEqual([((7, 7), 1), ((6, 6), 1)], results)
+        self.assertEqual(2, len(cache))
+
+    def test_cached_move_is_reused_for_the_same_state(self):
+        cache = StateCache()
+        calls = []
+        for _ in range(2):
+            engine = engine_with_layout(BitBoard, LAYOUT_A, 4, cache)
+            engine.fire(1, 7, 7)
+            ai = FixedAI([(3, 3)])
+            self.assertEqual((3, 3), engine.cached_select_field(1, ai))
+            calls.append(ai.calls)
+        self.assertEqual([1, 0], calls)
+
+
+class StateCacheTest(unittest.TestCase):
+
+    def test_least_recently_used_entry_is_dropped(self):
+        cache = StateCache(2)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        self.assertEqual(1, cache.get("a"))
+        cache.put("c", 3)
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(1, cache.get("a"))
+        self.assertEqual(3, cache.get("c"))
+        self.assertEqual(2, len(cache))
+
+
+if __name__ == "__main__":
+    unittest.main()